@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AlertsConfig(AppConfig):
     name = 'apps.alerts'
+
+    def ready(self):
+        # Registra los signals que encolan las notificaciones de alertas
+        import apps.alerts.signals
@@ -0,0 +1,97 @@
+from django.utils import timezone
+
+from .models import Alert
+from .signals import alerts_opened, alerts_updated
+
+
+# Campos que cambian al extender o cerrar una incidencia abierta
+INCIDENT_UPDATE_FIELDS = ("occurrences", "last_seen_at", "peak_value", "closed_at", "updated_at")
+
+
+def track_incidents(readings):
+    """
+    Fold newly stored ``readings`` into their sensors' incidents.
+
+    Readings are applied in timestamp order. A HIGH/LOW reading extends the
+    open incident of its sensor and type, or opens one; any reading at or
+    after an open incident's ``last_seen_at`` that is not of its type closes
+    it. A late reading (older than ``last_seen_at``) still counts towards
+    an incident of its type but never closes one.
+
+    Issues one query for the open incidents of the batch's sensors, plus a
+    bulk insert and a bulk update. Must run inside the ingest transaction.
+    Sends ``alerts_opened`` with the incidents it opened and
+    ``alerts_updated`` with the open ones it extended or closed.
+    Returns a list aligned with ``readings``: the incident each out-of-range
+    reading opened or extended, else ``None``.
+    """
+    incidents = [None] * len(readings)
+    if not readings:
+        return incidents
+
+    open_incidents = {
+        (incident.sensor_id, incident.alert_type): incident
+        for incident in Alert.objects.filter(
+            sensor_id__in={reading.sensor_id for reading in readings},
+            closed_at__isnull=True,
+        ).order_by()
+    }
+
+    opened = []
+    changed = {}
+    for index in sorted(range(len(readings)), key=lambda i: readings[i].timestamp):
+        reading = readings[index]
+        for alert_type in Alert.AlertType.values:
+            key = (reading.sensor_id, alert_type)
+            incident = open_incidents.get(key)
+
+            if reading.validation_status == alert_type:
+                if incident is None:
+                    incident = _open_incident(reading)
+                    open_incidents[key] = incident
+                    opened.append(incident)
+                else:
+                    _extend_incident(incident, reading)
+                    changed[id(incident)] = incident
+                incidents[index] = incident
+
+            elif incident is not None and reading.timestamp >= incident.last_seen_at:
+                incident.closed_at = reading.timestamp
+                del open_incidents[key]
+                changed[id(incident)] = incident
+
+    # Las nuevas aún no tienen pk. Se cierran antes de insertar: una
+    # incidencia reabierta no puede coincidir con la anterior aún abierta
+    updated = [incident for incident in changed.values() if incident.pk is not None]
+    if updated:
+        now = timezone.now()
+        for incident in updated:
+            incident.updated_at = now
+        Alert.objects.bulk_update(updated, fields=INCIDENT_UPDATE_FIELDS)
+        alerts_updated.send(sender=Alert, alerts=updated)
+    Alert.objects.bulk_create(opened)
+    if opened:
+        alerts_opened.send(sender=Alert, alerts=opened)
+    return incidents
+
+
+def _open_incident(reading):
+    return Alert(
+        sensor_id=reading.sensor_id,
+        node_id=reading.node_id,
+        reading=reading,
+        alert_type=reading.validation_status,  # 'high' o 'low'
+        detected_value=reading.value,
+        peak_value=reading.value,
+        last_seen_at=reading.timestamp,
+        status=Alert.AlertStatus.PENDING,
+    )
+
+
+def _extend_incident(incident, reading):
+    incident.occurrences += 1
+    incident.last_seen_at = max(incident.last_seen_at, reading.timestamp)
+    if incident.alert_type == Alert.AlertType.HIGH:
+        incident.peak_value = max(incident.peak_value, reading.value)
+    else:
+        incident.peak_value = min(incident.peak_value, reading.value)
@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-17 19:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0002_initial'),
+        ('nodes', '0002_initial'),
+        ('readings', '0003_remove_reading_updated_at'),
+        ('sensors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='alert',
+            name='node',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='nodes.node', verbose_name='Node'),
+        ),
+        migrations.AlterField(
+            model_name='alert',
+            name='sensor',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='sensors.sensor', verbose_name='Sensor'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['node', 'status', '-created_at'], name='alert_node_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['sensor', '-created_at'], name='alert_sensor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['-created_at'], name='alert_created_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 6.0 on 2026-10-17 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0003_alert_filter_indexes'),
+        ('nodes', '0002_initial'),
+        ('readings', '0004_reading_time_series_indexes'),
+        ('sensors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='alert',
+            name='alert_node_status_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='alert',
+            name='alert_sensor_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='alert',
+            name='alert_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['node', 'status', '-created_at', '-id'], name='alert_node_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['sensor', '-created_at', '-id'], name='alert_sensor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['-created_at', '-id'], name='alert_created_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-17 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0004_alert_keyset_indexes'),
+        ('nodes', '0002_initial'),
+        ('readings', '0007_reading_sensor_ts_uniq'),
+        ('sensors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['node', '-created_at', '-id'], name='alert_node_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='alert_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['status', 'alert_type', 'node'], name='alert_counts_idx'),
+        ),
+    ]
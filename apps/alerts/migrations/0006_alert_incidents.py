@@ -0,0 +1,63 @@
+# Generated by Django 6.0 on 2026-10-17 22:10
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def backfill_incidents(apps, schema_editor):
+    Alert = apps.get_model('alerts', 'Alert')
+    Reading = apps.get_model('readings', 'Reading')
+
+    # Las alertas anteriores eran una por lectura: cada una queda como una
+    # incidencia de una ocurrencia, ya cerrada
+    Alert.objects.update(
+        peak_value=F('detected_value'),
+        last_seen_at=Subquery(Reading.objects.filter(id=OuterRef('reading_id')).values('timestamp')[:1]),
+        closed_at=F('updated_at'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0005_alert_filter_pagination_indexes'),
+        ('readings', '0007_reading_sensor_ts_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alert',
+            name='occurrences',
+            field=models.PositiveIntegerField(default=1, verbose_name='Occurrences'),
+        ),
+        migrations.AddField(
+            model_name='alert',
+            name='peak_value',
+            field=models.FloatField(null=True, verbose_name='Peak value'),
+        ),
+        migrations.AddField(
+            model_name='alert',
+            name='last_seen_at',
+            field=models.DateTimeField(null=True, verbose_name='Last out-of-range reading'),
+        ),
+        migrations.AddField(
+            model_name='alert',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Closed at'),
+        ),
+        migrations.RunPython(backfill_incidents, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='alert',
+            name='peak_value',
+            field=models.FloatField(verbose_name='Peak value'),
+        ),
+        migrations.AlterField(
+            model_name='alert',
+            name='last_seen_at',
+            field=models.DateTimeField(verbose_name='Last out-of-range reading'),
+        ),
+        migrations.AddConstraint(
+            model_name='alert',
+            constraint=models.UniqueConstraint(condition=models.Q(('closed_at__isnull', True)), fields=('sensor', 'alert_type'), name='alert_open_incident_uniq'),
+        ),
+    ]
@@ -7,6 +7,12 @@ from apps.nodes.models import Node
 class Alert(models.Model):
     """
     Represents an alert triggered when a reading exceeds a critical threshold.
+
+    Ingested readings are tracked as incidents: the first out-of-range
+    reading of a sensor opens one per (sensor, alert type), later ones bump
+    ``occurrences``, ``last_seen_at`` and ``peak_value`` in place, and a
+    reading back in range closes it (``closed_at``). ``reading`` and
+    ``detected_value`` are those of the reading that opened it.
     """
 
     class AlertStatus(models.TextChoices):
@@ -27,14 +33,16 @@ class Alert(models.Model):
         Sensor,
         on_delete=models.CASCADE,
         related_name="alerts",
-        verbose_name="Sensor"
+        verbose_name="Sensor",
+        db_index=False,  # cubierto por alert_sensor_created_idx
     )
 
     node = models.ForeignKey(
         Node,
         on_delete=models.CASCADE,
         related_name="alerts",
-        verbose_name="Node"
+        verbose_name="Node",
+        db_index=False,  # cubierto por alert_node_status_created_idx
     )
 
     reading = models.ForeignKey(
@@ -53,6 +61,23 @@ class Alert(models.Model):
         verbose_name="Alert status"
     )
 
+    occurrences = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Occurrences"
+    )
+
+    # Valor más extremo: máximo en alertas HIGH, mínimo en LOW
+    peak_value = models.FloatField(verbose_name="Peak value")
+
+    # Tiempos de las lecturas (no del servidor)
+    last_seen_at = models.DateTimeField(verbose_name="Last out-of-range reading")
+
+    closed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Closed at"
+    )
+
     created_at = models.DateTimeField(
         auto_now_add=True,
         editable=False,
@@ -68,6 +93,36 @@ class Alert(models.Model):
         verbose_name = "Alert"
         verbose_name_plural = "Alerts"
         ordering = ["-created_at"]
+        # Índices para alert_filter (paginado por -created_at, -id), el
+        # listado ordenado por fecha y el GROUP BY del modo counts
+        indexes = [
+            models.Index(fields=["node", "status", "-created_at", "-id"], name="alert_node_status_created_idx"),
+            models.Index(fields=["node", "-created_at", "-id"], name="alert_node_created_idx"),
+            models.Index(fields=["sensor", "-created_at", "-id"], name="alert_sensor_created_idx"),
+            models.Index(fields=["status", "-created_at", "-id"], name="alert_status_created_idx"),
+            models.Index(fields=["-created_at", "-id"], name="alert_created_idx"),
+            models.Index(fields=["status", "alert_type", "node"], name="alert_counts_idx"),
+        ]
+        constraints = [
+            # Como mucho una incidencia abierta por sensor y tipo
+            models.UniqueConstraint(
+                fields=["sensor", "alert_type"],
+                condition=models.Q(closed_at__isnull=True),
+                name="alert_open_incident_uniq",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Alta manual (API, admin): la incidencia empieza en su lectura
+        if self.peak_value is None:
+            self.peak_value = self.detected_value
+        if self.last_seen_at is None:
+            self.last_seen_at = self.reading.timestamp
+        super().save(*args, **kwargs)
+
+    @property
+    def is_open(self):
+        return self.closed_at is None
 
     def __str__(self):
         return f"Alert {self.alert_type} @ {self.node.name}: {self.detected_value}"
@@ -0,0 +1,94 @@
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+
+from .models import Alert
+from infrastructure.notifications import DigestNotifier
+
+
+# -----------------------------
+# Digest por dueño del nodo
+# -----------------------------
+
+def alert_digest_messages(alert_ids):
+    """
+    One e-mail per node owner listing the alerts in ``alert_ids``, read
+    with a single query. Owners without an e-mail address are skipped.
+    """
+    alerts = (
+        Alert.objects.filter(id__in=set(alert_ids))
+        .order_by("node__user__email", "created_at", "id")
+        .values_list(
+            "node__user__email", "node__name", "sensor__name", "sensor__unit",
+            "alert_type", "detected_value", "last_seen_at",
+        )
+    )
+    lines = defaultdict(list)
+    for email, node_name, sensor_name, unit, alert_type, value, seen_at in alerts:
+        if email:
+            lines[email].append(
+                f"- {node_name} / {sensor_name}: {alert_type.upper()} {value:g} {unit} ({seen_at:%Y-%m-%d %H:%M:%S} UTC)"
+            )
+
+    return [
+        EmailMessage(
+            subject=_digest_subject(len(entries)),
+            body="Nuevas alertas en tus nodos:\n\n" + "\n".join(entries) + "\n",
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email],
+        )
+        for email, entries in lines.items()
+    ]
+
+
+def _digest_subject(count):
+    if count == 1:
+        return "[NodosIoT] Nueva alerta"
+    return f"[NodosIoT] {count} nuevas alertas"
+
+
+def notify_alerts(alerts):
+    """
+    Queue notifications for newly opened ``alerts``; returns immediately.
+    No-op unless ALERT_NOTIFICATIONS_ENABLED.
+    """
+    if not settings.ALERT_NOTIFICATIONS_ENABLED:
+        return
+    notifier = get_notifier()
+    for alert in alerts:
+        notifier.notify(alert.id)
+
+
+# -----------------------------
+# Notificador del proceso
+# -----------------------------
+_lock = threading.Lock()
+_notifier = None
+
+
+def get_notifier():
+    global _notifier
+    with _lock:
+        if _notifier is None:
+            _notifier = DigestNotifier(
+                alert_digest_messages,
+                window=settings.ALERT_NOTIFICATIONS_WINDOW,
+                max_retries=settings.ALERT_NOTIFICATIONS_MAX_RETRIES,
+                backoff=settings.ALERT_NOTIFICATIONS_BACKOFF,
+                name="alert-notifier",
+            )
+        return _notifier
+
+
+def stop_notifier():
+    """
+    Send pending digests and stop the process notifier; the next use starts
+    a new one.
+    """
+    global _notifier
+    with _lock:
+        notifier, _notifier = _notifier, None
+    if notifier is not None:
+        notifier.stop()
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Alert
+from apps.core.rows import RowEncoder
 
 
 class AlertSerializer(serializers.ModelSerializer):
@@ -13,11 +14,38 @@ class AlertSerializer(serializers.ModelSerializer):
             "alert_type",
             "detected_value",
             "status",
+            "occurrences",
+            "peak_value",
+            "last_seen_at",
+            "closed_at",
             "created_at",
             "updated_at",
         )
         read_only_fields = (
             "id",
+            "occurrences",
+            "peak_value",
+            "last_seen_at",
+            "closed_at",
             "created_at",
             "updated_at",
         )
+        # El validador automático de alert_open_incident_uniq falla en PATCH
+        # (closed_at es de solo lectura): se valida en validate()
+        validators = []
+
+    def validate(self, attrs):
+        instance = self.instance
+        sensor = attrs.get("sensor", getattr(instance, "sensor", None))
+        alert_type = attrs.get("alert_type", getattr(instance, "alert_type", None))
+        if instance is None or instance.is_open:
+            open_incidents = Alert.objects.filter(sensor=sensor, alert_type=alert_type, closed_at__isnull=True)
+            if instance is not None:
+                open_incidents = open_incidents.exclude(pk=instance.pk)
+            if open_incidents.exists():
+                raise serializers.ValidationError("This sensor already has an open alert of this type.")
+        return attrs
+
+
+# Listados de alertas: misma salida que AlertSerializer(many=True)
+ALERT_ROWS = RowEncoder(AlertSerializer)
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import Signal, receiver
+
+from .models import Alert
+from .notifications import notify_alerts
+from .stream import ALERT_CREATED, ALERT_UPDATED, publish_alerts
+
+
+# Incidencias abiertas por el ingest (bulk_create no envía post_save).
+# Argumento: alerts, la lista de Alert ya insertadas
+alerts_opened = Signal()
+
+# Incidencias abiertas que el ingest extendió o cerró (bulk_update).
+# Argumento: alerts, la lista de Alert ya actualizadas
+alerts_updated = Signal()
+
+
+# Las notificaciones salen sólo si la transacción se confirma, y nunca
+# bloquean al ingest: notify_alerts sólo encola
+
+@receiver(alerts_opened)
+def notify_opened_alerts(sender, alerts, **kwargs):
+    transaction.on_commit(lambda: notify_alerts(alerts))
+
+
+@receiver(post_save, sender=Alert)
+def notify_created_alert(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: notify_alerts([instance]))
+
+
+# Stream de alertas (SSE): también al confirmar, con el estado guardado
+
+@receiver(alerts_opened)
+def publish_opened_alerts(sender, alerts, **kwargs):
+    transaction.on_commit(lambda: publish_alerts(alerts, ALERT_CREATED))
+
+
+@receiver(alerts_updated)
+def publish_updated_alerts(sender, alerts, **kwargs):
+    transaction.on_commit(lambda: publish_alerts(alerts, ALERT_UPDATED))
+
+
+@receiver(post_save, sender=Alert)
+def publish_saved_alert(sender, instance, created, **kwargs):
+    event_type = ALERT_CREATED if created else ALERT_UPDATED
+    transaction.on_commit(lambda: publish_alerts([instance], event_type))
@@ -0,0 +1,22 @@
+from apps.core.sse import stream_broker
+from .serializers import ALERT_ROWS
+
+
+ALERT_CREATED = "alert.created"
+ALERT_UPDATED = "alert.updated"
+
+STREAM_NAME = "alerts"
+
+
+def alert_broker():
+    return stream_broker(STREAM_NAME)
+
+
+def publish_alerts(alerts, event_type):
+    """
+    Publish ``alerts`` (saved instances) to the alert stream, encoded like
+    the alert listings, without querying them again.
+    """
+    broker = alert_broker()
+    for data in ALERT_ROWS.encode_objects(alerts):
+        broker.publish(event_type, data)
@@ -0,0 +1,114 @@
+# apps/alerts/tests/test_incidents.py
+# py .\manage.py test apps.alerts.tests.test_incidents
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.utils import timezone
+from datetime import timedelta
+
+from apps.users.models import User
+from apps.nodes.models import Node
+from apps.sensors.models import Sensor
+from apps.readings.models import Reading
+from apps.readings.services import ingest_readings
+from apps.alerts.models import Alert
+
+
+class AlertIncidentTests(TestCase):
+    """Tests para la agrupación de alertas en incidencias abiertas"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass",
+            role=User.Roles.ADMIN
+        )
+        self.node = Node.objects.create(name="Node", location="Lab", user=self.admin)
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+        self.base = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+
+    def build_data(self, value, seconds, validation_status=Reading.ValidationStatus.VALID):
+        return {
+            "sensor_id": self.sensor.id,
+            "node_id": self.node.id,
+            "value": value,
+            "timestamp": self.base + timedelta(seconds=seconds),
+            "validation_status": validation_status,
+        }
+
+    def test_1_sustained_excursion_updates_one_incident(self):
+        """1. Una excursión sostenida abre una incidencia y la actualiza en sitio"""
+        ingest_readings([self.build_data(50.0, 0, 'high'), self.build_data(55.0, 1, 'high')])
+        with CaptureQueriesContext(connection) as queries:
+            results = ingest_readings([self.build_data(52.0, s, 'high') for s in range(2, 5)])
+
+        # Sobre alerts_alert: una consulta de abiertas y un UPDATE, sin INSERT
+        alert_queries = [q['sql'].split()[0] for q in queries.captured_queries if 'alerts_alert' in q['sql']]
+        self.assertEqual(alert_queries, ['SELECT', 'UPDATE'])
+
+        incident = Alert.objects.get()
+        self.assertEqual({alert.id for _, alert, _ in results}, {incident.id})
+        self.assertTrue(incident.is_open)
+        self.assertEqual(incident.occurrences, 5)
+        self.assertEqual(incident.detected_value, 50.0)
+        self.assertEqual(incident.peak_value, 55.0)
+        self.assertEqual(incident.last_seen_at, self.base + timedelta(seconds=4))
+        self.assertEqual(Reading.objects.count(), 5)
+
+    def test_2_normal_reading_closes_and_next_excursion_reopens(self):
+        """2. Una lectura normal cierra la incidencia y la siguiente excursión abre otra"""
+        ingest_readings([
+            self.build_data(-5.0, 0, 'low'),
+            self.build_data(-7.0, 1, 'low'),
+            self.build_data(20.0, 2),
+            self.build_data(-4.0, 3, 'low'),
+        ])
+
+        closed, reopened = Alert.objects.order_by('id')
+        self.assertEqual(closed.occurrences, 2)
+        self.assertEqual(closed.peak_value, -7.0)
+        self.assertEqual(closed.closed_at, self.base + timedelta(seconds=2))
+        self.assertTrue(reopened.is_open)
+        self.assertEqual(reopened.occurrences, 1)
+
+        # Cambiar de LOW a HIGH cierra la LOW
+        ingest_readings([self.build_data(60.0, 4, 'high')])
+        self.assertFalse(Alert.objects.get(id=reopened.id).is_open)
+        self.assertEqual(Alert.objects.get(closed_at__isnull=True).alert_type, 'high')
+
+    def test_3_late_reading_does_not_close_incident(self):
+        """3. Una lectura normal atrasada no cierra la incidencia"""
+        ingest_readings([self.build_data(50.0, 10, 'high')])
+        ingest_readings([self.build_data(20.0, 5)])
+        self.assertTrue(Alert.objects.get().is_open)
+
+        ingest_readings([self.build_data(20.0, 11)])
+        self.assertFalse(Alert.objects.get().is_open)
+
+    def test_4_ingest_response_reports_the_incident(self):
+        """4. El POST devuelve la misma incidencia para cada lectura de la excursión"""
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        payload = [
+            {"sensor": self.sensor.id, "node": self.node.id, "value": 50.0 + n,
+             "timestamp": (self.base + timedelta(seconds=n)).isoformat(), "validation_status": "high"}
+            for n in range(3)
+        ]
+        response = client.post(reverse('reading-list-create'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        alerts = [result['alert'] for result in response.data['results']]
+        self.assertEqual(len({alert['id'] for alert in alerts}), 1)
+        self.assertEqual(alerts[-1]['occurrences'], 3)
+        self.assertEqual(alerts[-1]['peak_value'], 52.0)
+        self.assertEqual(Alert.objects.count(), 1)
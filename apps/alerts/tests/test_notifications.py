@@ -0,0 +1,152 @@
+# apps/alerts/tests/test_notifications.py
+# py .\manage.py test apps.alerts.tests.test_notifications
+
+from django.core.mail import EmailMessage
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from datetime import timedelta
+
+from apps.users.models import User
+from apps.nodes.models import Node
+from apps.sensors.models import Sensor
+from apps.readings.models import Reading
+from apps.readings.services import ingest_readings
+from apps.alerts.notifications import get_notifier, stop_notifier
+from infrastructure.notifications import DigestNotifier
+from infrastructure.testing import LocalSMTPServer
+
+
+class NotificationTestMixin:
+    """Servidor SMTP local con el backend SMTP de Django apuntando a él"""
+
+    def setUp(self):
+        self.smtp = LocalSMTPServer().start()
+        self.addCleanup(self.smtp.stop)
+        smtp_settings = override_settings(**self.smtp.settings())
+        smtp_settings.enable()
+        self.addCleanup(smtp_settings.disable)
+
+    def start_notifier(self, build_messages, **options):
+        notifier = DigestNotifier(build_messages, **options)
+        self.addCleanup(notifier.stop)
+        return notifier
+
+
+class DigestNotifierTests(NotificationTestMixin, TransactionTestCase):
+    """Tests para el envío agrupado de notificaciones"""
+
+    def digest(self, events):
+        # events: (destinatario, línea)
+        lines = {}
+        for recipient, line in events:
+            lines.setdefault(recipient, []).append(line)
+        return [
+            EmailMessage(f"{len(entries)} avisos", "\n".join(entries), "noreply@test.com", [recipient])
+            for recipient, entries in lines.items()
+        ]
+
+    def test_1_events_are_grouped_per_recipient_on_one_connection(self):
+        """1. Los eventos de la ventana salen como un digest por destinatario por una conexión"""
+        notifier = self.start_notifier(self.digest, window=60)
+        for n in range(3):
+            notifier.notify(("a@test.com", f"evento {n}"))
+        notifier.notify(("b@test.com", "evento 3"))
+        self.assertEqual(self.smtp.messages, [])
+
+        notifier.flush()
+        self.assertEqual(self.smtp.connections, 1)
+        received = {m.recipients[0]: m.message for m in self.smtp.messages}
+        self.assertEqual(set(received), {"a@test.com", "b@test.com"})
+        self.assertEqual(received["a@test.com"]["Subject"], "3 avisos")
+        self.assertIn("evento 2", received["a@test.com"].get_content())
+
+    def test_2_failed_messages_are_retried_without_duplicates(self):
+        """2. Un fallo temporal se reintenta con backoff sin reenviar lo ya entregado"""
+        notifier = self.start_notifier(self.digest, window=60, backoff=0.01)
+        notifier.notify(("a@test.com", "uno"))
+        notifier.notify(("b@test.com", "dos"))
+        self.smtp.fail_next(1)
+
+        with self.assertLogs('infrastructure.notifications', level='WARNING'):
+            notifier.flush()
+        self.assertEqual(sorted(m.recipients[0] for m in self.smtp.messages), ["a@test.com", "b@test.com"])
+        self.assertEqual(self.smtp.connections, 2)
+
+    def test_3_gives_up_after_max_retries(self):
+        """3. Tras agotar los reintentos el digest se descarta y el worker sigue vivo"""
+        notifier = self.start_notifier(self.digest, window=60, max_retries=2, backoff=0.01)
+        self.smtp.fail_next(3)
+        notifier.notify(("a@test.com", "perdido"))
+        with self.assertLogs('infrastructure.notifications', level='ERROR'):
+            notifier.flush()
+        self.assertEqual(self.smtp.messages, [])
+        self.assertEqual(self.smtp.connections, 3)
+
+        notifier.notify(("a@test.com", "siguiente"))
+        notifier.flush()
+        self.assertEqual(len(self.smtp.messages), 1)
+
+
+@override_settings(ALERT_NOTIFICATIONS_ENABLED=True, ALERT_NOTIFICATIONS_WINDOW=60)
+class AlertNotificationTests(NotificationTestMixin, TransactionTestCase):
+    """Tests para las notificaciones de alertas nuevas"""
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(stop_notifier)
+        self.base = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+
+        self.sensors = []
+        for email in ("owner1@test.com", "owner2@test.com"):
+            owner = User.objects.create_user(email=email, password="pass", role=User.Roles.RESEARCHER)
+            node = Node.objects.create(name=f"Node {email}", location="Lab", user=owner)
+            self.sensors.append(Sensor.objects.create(
+                node=node,
+                name="Temperature Sensor",
+                sensor_type=Sensor.SensorTypes.TEMPERATURE,
+                model="DHT22",
+                unit="°C"
+            ))
+
+    def build_data(self, sensor, value, seconds, validation_status):
+        return {
+            "sensor_id": sensor.id,
+            "node_id": sensor.node_id,
+            "value": value,
+            "timestamp": self.base + timedelta(seconds=seconds),
+            "validation_status": validation_status,
+        }
+
+    def test_1_opened_incidents_are_sent_as_owner_digests(self):
+        """1. Las incidencias abiertas se envían como un digest por dueño, sin tocar el ingest"""
+        first, second = self.sensors
+        ingest_readings([
+            self.build_data(first, 50.0, 0, Reading.ValidationStatus.HIGH),
+            self.build_data(first, 51.0, 1, Reading.ValidationStatus.HIGH),
+            self.build_data(first, 20.0, 2, Reading.ValidationStatus.VALID),
+            self.build_data(first, -5.0, 3, Reading.ValidationStatus.LOW),
+            self.build_data(second, 60.0, 0, Reading.ValidationStatus.HIGH),
+        ])
+        # El ingest sólo encola: aún no se ha enviado nada
+        self.assertEqual(self.smtp.messages, [])
+
+        get_notifier().flush()
+        self.assertEqual(self.smtp.connections, 1)
+        received = {m.recipients[0]: m.message for m in self.smtp.messages}
+        self.assertEqual(set(received), {"owner1@test.com", "owner2@test.com"})
+        self.assertEqual(received["owner1@test.com"]["Subject"], "[NodosIoT] 2 nuevas alertas")
+        body = received["owner1@test.com"].get_content()
+        self.assertIn("HIGH 50", body)
+        self.assertIn("LOW -5", body)
+        self.assertEqual(received["owner2@test.com"]["Subject"], "[NodosIoT] Nueva alerta")
+
+    def test_2_extending_an_incident_does_not_notify(self):
+        """2. Las lecturas que extienden una incidencia abierta no generan avisos"""
+        sensor = self.sensors[0]
+        ingest_readings([self.build_data(sensor, 50.0, 0, Reading.ValidationStatus.HIGH)])
+        get_notifier().flush()
+        self.assertEqual(len(self.smtp.messages), 1)
+
+        ingest_readings([self.build_data(sensor, 52.0, s, Reading.ValidationStatus.HIGH) for s in range(1, 20)])
+        get_notifier().flush()
+        self.assertEqual(len(self.smtp.messages), 1)
@@ -0,0 +1,59 @@
+# apps/alerts/tests/test_query_plans.py
+# py .\manage.py test apps.alerts.tests.test_query_plans
+
+from django.utils import timezone
+from datetime import timedelta
+
+from apps.alerts.models import Alert
+from apps.alerts.views import _count_rows
+from apps.readings.tests.test_query_plans import QueryPlanTestCase
+
+
+class AlertQueryPlanTests(QueryPlanTestCase):
+    """Las consultas de alert_filter usan índices compuestos"""
+
+    def setUp(self):
+        self.since = timezone.now() - timedelta(days=1)
+
+    def test_1_filter_by_node_status_and_date(self):
+        """1. Filtro por nodo, estado y fecha usa (node, status, created_at)"""
+        qs = Alert.objects.filter(node_id=1, status='pending', created_at__gte=self.since)
+        self.assertUsesIndex(qs, 'alert_node_status_created_idx')
+        self.assertNotIn('TEMP B-TREE', qs.explain())
+
+    def test_2_filter_by_sensor(self):
+        """2. Filtro por sensor usa (sensor, created_at) sin ordenar en memoria"""
+        qs = Alert.objects.filter(sensor_id=1, created_at__gte=self.since)
+        self.assertUsesIndex(qs, 'alert_sensor_created_idx')
+        self.assertNotIn('TEMP B-TREE', qs.explain())
+
+    def test_3_unfiltered_listing(self):
+        """3. El listado ordenado por fecha recorre el índice de created_at"""
+        qs = Alert.objects.all()
+        self.assertUsesIndex(qs, 'alert_created_idx')
+        self.assertNoFullScan(qs, 'alerts_alert')
+
+    def test_4_paginated_filter_by_node(self):
+        """4. Una página del filtro por nodo recorre (node, created_at, id) sin ordenar"""
+        qs = Alert.objects.filter(node_id=1).order_by('-created_at', '-id')[:51]
+        self.assertUsesIndex(qs, 'alert_node_created_idx')
+        self.assertNotIn('TEMP B-TREE', qs.explain())
+
+    def test_5_paginated_filter_by_status(self):
+        """5. Una página del filtro por estado recorre (status, created_at, id)"""
+        qs = Alert.objects.filter(status='pending').order_by('-created_at', '-id')[:51]
+        self.assertUsesIndex(qs, 'alert_status_created_idx')
+        self.assertNotIn('TEMP B-TREE', qs.explain())
+
+    def test_6_counts_group_by(self):
+        """6. El GROUP BY de counts se resuelve con el índice cubriente, sin ordenar"""
+        qs = _count_rows(Alert.objects.all())
+        self.assertUsesIndex(qs, 'alert_counts_idx')
+        self.assertNotIn('TEMP B-TREE', qs.explain())
+
+    def test_7_open_incidents_lookup(self):
+        """7. El ingest busca las incidencias abiertas por índice de sensor, sin full scan ni ordenar"""
+        qs = Alert.objects.filter(sensor_id__in=[1, 2], closed_at__isnull=True).order_by()
+        self.assertRegex(qs.explain(), r'USING INDEX (alert_open_incident_uniq|alert_sensor_created_idx)')
+        self.assertNoFullScan(qs, 'alerts_alert')
+        self.assertNotIn('TEMP B-TREE', qs.explain())
@@ -0,0 +1,268 @@
+# apps/alerts/tests/test_stream.py
+# py .\manage.py test apps.alerts.tests.test_stream
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import timedelta
+
+from apps.users.models import User
+from apps.nodes.models import Node
+from apps.sensors.models import Sensor
+from apps.readings.models import Reading
+from apps.readings.services import ingest_readings
+from apps.alerts.stream import alert_broker
+from infrastructure.broker import Broker, reset_brokers
+
+
+class BrokerTests(SimpleTestCase):
+    """Tests para el broker en proceso: reanudación y clientes lentos"""
+
+    async def test_1_replays_buffered_events_after_last_id(self):
+        """1. Se reenvían los eventos posteriores al último id si siguen en el buffer"""
+        broker = Broker(buffer_size=3)
+        events = [broker.publish("tick", {"n": n}) for n in range(5)]
+
+        subscription, backlog, resumed = broker.subscribe(events[2].id)
+        self.assertTrue(resumed)
+        self.assertEqual([event.data["n"] for event in backlog], [3, 4])
+        subscription.close()
+
+        subscription, backlog, resumed = broker.subscribe(events[1].id, predicate=lambda data: data["n"] != 3)
+        self.assertTrue(resumed)
+        self.assertEqual([event.data["n"] for event in backlog], [2, 4])
+
+        broker.publish("tick", {"n": 3})
+        broker.publish("tick", {"n": 5})
+        self.assertEqual((await subscription.get(timeout=1)).data, {"n": 5})
+        subscription.close()
+        self.assertEqual(broker.subscriber_count, 0)
+
+    async def test_2_unknown_or_expired_ids_cannot_resume(self):
+        """2. Ids fuera del buffer, de otra época o inválidos no se reanudan"""
+        broker = Broker(buffer_size=2)
+        for _ in range(3):
+            broker.publish("tick", {})
+
+        # El evento 1 ya salió del buffer: no se puede reanudar desde el 0
+        for last_event_id in (f"{broker.epoch}-0", Broker().last_event_id, f"{broker.epoch}-99", "garbage"):
+            subscription, backlog, resumed = broker.subscribe(last_event_id)
+            subscription.close()
+            self.assertEqual((backlog, resumed), ([], False), last_event_id)
+
+    async def test_3_slow_subscribers_are_dropped(self):
+        """3. Un suscriptor que se queda atrás se cierra y queda marcado"""
+        broker = Broker(max_pending=2)
+        subscription, _, _ = broker.subscribe()
+        for n in range(3):
+            broker.publish("tick", {"n": n})
+
+        received = []
+        while (event := await subscription.get(timeout=1)) is not None:
+            received.append(event.data["n"])
+        self.assertEqual(received, [0, 1])
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(broker.subscriber_count, 0)
+
+
+@override_settings(EVENT_STREAM_TIMEOUT=5, EVENT_STREAM_KEEPALIVE=5)
+class AlertStreamTests(TestCase):
+    """Tests para el stream SSE de alertas"""
+
+    def setUp(self):
+        reset_brokers()
+        self.addCleanup(reset_brokers)
+
+        self.owner = User.objects.create_user(email="owner@test.com", password="pass", role=User.Roles.RESEARCHER)
+        self.node = Node.objects.create(name="Node A", location="Lab", user=self.owner)
+        self.other_node = Node.objects.create(name="Node B", location="Lab", user=self.owner)
+        self.sensor = self.create_sensor(self.node)
+        self.other_sensor = self.create_sensor(self.other_node)
+
+        self.url = reverse('alert-stream')
+        self.token = str(RefreshToken.for_user(self.owner).access_token)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.base = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+
+    def create_sensor(self, node):
+        return Sensor.objects.create(node=node, name=f"Sensor {node.name}", sensor_type=Sensor.SensorTypes.TEMPERATURE,
+                                     model="DHT22", unit="°C")
+
+    # -----------------------------
+    # Escrituras (síncronas, confirmando los on_commit)
+    # -----------------------------
+
+    def ingest(self, sensor, *statuses, offset=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_readings([
+                {"sensor_id": sensor.id, "node_id": sensor.node_id, "value": 50.0 if s == 'high' else 20.0,
+                 "timestamp": self.base + timedelta(seconds=offset + n), "validation_status": s}
+                for n, s in enumerate(statuses)
+            ])
+
+    def create_alert(self, sensor):
+        # Antes de las lecturas del ingest, sin repetir timestamp
+        timestamp = self.base - timedelta(minutes=Reading.objects.filter(sensor=sensor).count() + 1)
+        reading = Reading.objects.create(sensor=sensor, node_id=sensor.node_id, value=-5.0,
+                                         timestamp=timestamp, validation_status=Reading.ValidationStatus.LOW)
+        payload = {"sensor": sensor.id, "node": sensor.node_id, "reading": reading.id,
+                   "alert_type": "low", "detected_value": -5.0, "status": "pending"}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('alert-list-create'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+
+    def patch_alert(self, alert_id, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('alert-detail', args=[alert_id]), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    # -----------------------------
+    # Lectura del stream
+    # -----------------------------
+
+    async def open_stream(self, query="", **headers):
+        response = await self.async_client.get(
+            f"{self.url}{query}", headers={"Authorization": f"Bearer {self.token}", **headers}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        # El primer bloque (retry) ya implica la suscripción
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        return stream
+
+    async def next_event(self, stream):
+        while True:
+            chunk = (await asyncio.wait_for(anext(stream), timeout=5)).decode()
+            if chunk.startswith(":"):
+                continue
+            fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+            fields["data"] = json.loads(fields["data"])
+            return fields
+
+    async def test_1_ingest_and_api_writes_are_streamed(self):
+        """1. Las alertas del ingest y de la API (alta y PATCH) llegan al stream"""
+        stream = await self.open_stream()
+
+        await sync_to_async(self.ingest)(self.sensor, 'high')
+        opened = await self.next_event(stream)
+        self.assertEqual(opened["event"], "alert.created")
+        self.assertEqual((opened["data"]["sensor"], opened["data"]["occurrences"]), (self.sensor.id, 1))
+
+        # Extendida y cerrada en el mismo lote: un único evento con el estado final
+        await sync_to_async(self.ingest)(self.sensor, 'high', 'valid', offset=1)
+        updated = await self.next_event(stream)
+        self.assertEqual(updated["event"], "alert.updated")
+        self.assertEqual(updated["data"]["id"], opened["data"]["id"])
+        self.assertEqual(updated["data"]["occurrences"], 2)
+        self.assertIsNotNone(updated["data"]["closed_at"])
+
+        alert_id = await sync_to_async(self.create_alert)(self.sensor)
+        event = await self.next_event(stream)
+        self.assertEqual((event["event"], event["data"]["id"]), ("alert.created", alert_id))
+
+        await sync_to_async(self.patch_alert)(alert_id, status="attended")
+        event = await self.next_event(stream)
+        self.assertEqual((event["event"], event["data"]["status"]), ("alert.updated", "attended"))
+        self.assertEqual(event["data"], await sync_to_async(self.serialized)(alert_id))
+
+    def serialized(self, alert_id):
+        return json.loads(json.dumps(self.client.get(reverse('alert-detail', args=[alert_id])).json()))
+
+    async def test_2_filters_by_node_sensor_and_status(self):
+        """2. Los filtros node_id, sensor_id y status se aplican a cada evento"""
+        stream = await self.open_stream(f"?node_id={self.other_node.id}&status=pending")
+
+        alert_id = await sync_to_async(self.create_alert)(self.sensor)
+        other_id = await sync_to_async(self.create_alert)(self.other_sensor)
+        await sync_to_async(self.patch_alert)(other_id, status="attended")
+        await sync_to_async(self.ingest)(self.other_sensor, 'high')
+
+        first = await self.next_event(stream)
+        second = await self.next_event(stream)
+        self.assertEqual((first["data"]["id"], first["data"]["status"]), (other_id, "pending"))
+        self.assertEqual((second["data"]["node"], second["data"]["alert_type"]), (self.other_node.id, "high"))
+        self.assertNotEqual(second["data"]["id"], alert_id)
+
+        # Reanudando desde el principio del buffer, sólo lo del otro sensor
+        epoch = first["id"].split("-")[0]
+        stream = await self.open_stream(f"?sensor_id={self.sensor.id}&last_event_id={epoch}-0")
+        self.assertEqual((await self.next_event(stream))["data"]["id"], alert_id)
+
+        for query in ("?node_id=abc", "?sensor_id=-1", "?status=closed"):
+            response = await self.async_client.get(
+                f"{self.url}{query}", headers={"Authorization": f"Bearer {self.token}"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_3_resumes_from_last_event_id_or_resets(self):
+        """3. Last-Event-ID reanuda desde el buffer; si no se puede, llega un reset"""
+        await sync_to_async(self.ingest)(self.sensor, 'high')
+        await sync_to_async(self.ingest)(self.other_sensor, 'high')
+        first_id = alert_broker().last_event_id.replace("-2", "-1")
+
+        stream = await self.open_stream(**{"Last-Event-ID": first_id})
+        event = await self.next_event(stream)
+        self.assertEqual((event["event"], event["data"]["sensor"]), ("alert.created", self.other_sensor.id))
+
+        stream = await self.open_stream(**{"Last-Event-ID": "old-7"})
+        reset = await self.next_event(stream)
+        self.assertEqual((reset["event"], reset["id"], reset["data"]), ("reset", alert_broker().last_event_id, {}))
+
+    @override_settings(EVENT_STREAM_TIMEOUT=0.2, EVENT_STREAM_KEEPALIVE=0.05)
+    async def test_4_keepalives_and_timeout_end_the_stream(self):
+        """4. Sin eventos se envían keepalives y el stream termina al vencer el plazo"""
+        stream = await self.open_stream()
+        chunks = [chunk async for chunk in stream]
+        self.assertGreaterEqual(len(chunks), 2)
+        self.assertEqual(set(chunks), {b": keepalive\n\n"})
+        self.assertEqual(alert_broker().subscriber_count, 0)
+
+
+class AlertStreamASGITests(TransactionTestCase):
+    """Tests para el stream SSE servido por la aplicación ASGI del proyecto"""
+
+    def setUp(self):
+        reset_brokers()
+        self.addCleanup(reset_brokers)
+        # El handler ASGI consulta la base de datos desde otro hilo
+        owner = User.objects.create_user(email="owner@test.com", password="pass", role=User.Roles.RESEARCHER)
+        self.token = str(RefreshToken.for_user(owner).access_token)
+        self.url = reverse('alert-stream')
+
+    async def test_1_asgi_disconnect_releases_the_subscription(self):
+        """1. Cabeceras SSE y limpieza de la suscripción al desconectar el cliente"""
+        from nodosiot.asgi import application
+
+        communicator = ApplicationCommunicator(application, {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": self.url, "raw_path": self.url.encode(), "query_string": b"",
+            "root_path": "", "server": ("testserver", 80), "client": ("127.0.0.1", 5000),
+            "headers": [(b"authorization", f"Bearer {self.token}".encode()), (b"host", b"testserver")],
+        })
+        await communicator.send_input({"type": "http.request", "body": b"", "more_body": False})
+
+        start = await communicator.receive_output(timeout=5)
+        headers = dict(start["headers"])
+        self.assertEqual(start["status"], 200)
+        self.assertEqual(headers[b"Content-Type"], b"text/event-stream")
+        self.assertEqual(headers[b"Cache-Control"], b"no-cache")
+        self.assertEqual((await communicator.receive_output(timeout=5))["body"], b"retry: 3000\n\n")
+        self.assertEqual(alert_broker().subscriber_count, 1)
+
+        await communicator.send_input({"type": "http.disconnect"})
+        await communicator.wait(timeout=5)
+        self.assertEqual(alert_broker().subscriber_count, 0)
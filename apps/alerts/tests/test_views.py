@@ -5,8 +5,10 @@ from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.utils import timezone
 from datetime import timedelta
+from urllib.parse import urlsplit
 
 from apps.users.models import User
 from apps.nodes.models import Node
@@ -111,6 +113,14 @@ class AlertEssentialTests(TestCase):
         # Cliente API
         self.client = APIClient()
     
+    @staticmethod
+    def without_link_paths(body):
+        """Helper: los enlaces de paginación apuntan a cada vista; se compara solo su query"""
+        for key in ('next', 'previous'):
+            if body.get(key):
+                body[key] = urlsplit(body[key]).query
+        return body
+
     def get_detail_url(self, alert_id):
         """Helper para obtener URL de detalle"""
         return reverse('alert-detail', kwargs={'pk': alert_id})
@@ -134,7 +144,7 @@ class AlertEssentialTests(TestCase):
         
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # Ambas alertas
+        self.assertEqual(len(response.data['results']), 2)  # Ambas alertas
     
     def test_3_researcher_can_create_alert(self):
         """3. Researcher puede crear alertas (POST)"""
@@ -144,16 +154,25 @@ class AlertEssentialTests(TestCase):
             "sensor": self.sensor1.id,
             "node": self.node1.id,
             "reading": self.reading1.id,
-            "alert_type": Alert.AlertType.HIGH,
-            "detected_value": 60.0,
+            "alert_type": Alert.AlertType.LOW,
+            "detected_value": -6.0,
             "status": Alert.AlertStatus.PENDING
         }
         
         response = self.client.post(self.list_url, data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Alert.objects.count(), 3)
-        self.assertEqual(response.data['alert_type'], 'high')
-        self.assertEqual(response.data['detected_value'], 60.0)
+        self.assertEqual(response.data['alert_type'], 'low')
+        self.assertEqual(response.data['detected_value'], -6.0)
+        self.assertEqual(response.data['peak_value'], -6.0)
+        self.assertEqual(response.data['occurrences'], 1)
+        self.assertIsNone(response.data['closed_at'])
+
+        # Ya hay una incidencia HIGH abierta para sensor1
+        data.update(alert_type=Alert.AlertType.HIGH, detected_value=60.0)
+        response = self.client.post(self.list_url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Alert.objects.count(), 3)
     
     # ------------------------------------------------------------
     # TESTS DE DETALLE (GET, PATCH, DELETE)
@@ -247,9 +266,10 @@ class AlertEssentialTests(TestCase):
         response = self.client.get(self.filter_url, params)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['node'], self.node1.id)
-        self.assertEqual(response.data[0]['alert_type'], 'high')
+        results = response.data['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['node'], self.node1.id)
+        self.assertEqual(results[0]['alert_type'], 'high')
     
     def test_10_filter_alerts_multiple_criteria(self):
         """10. Filtrar alertas con múltiples criterios"""
@@ -262,7 +282,8 @@ class AlertEssentialTests(TestCase):
             reading=self.reading1,
             alert_type=Alert.AlertType.HIGH,
             detected_value=55.0,
-            status=Alert.AlertStatus.PENDING
+            status=Alert.AlertStatus.PENDING,
+            closed_at=timezone.now()  # solo una incidencia abierta por sensor y tipo
         )
         
         # Filtrar: alertas HIGH y PENDING del node1
@@ -275,11 +296,105 @@ class AlertEssentialTests(TestCase):
         response = self.client.get(self.filter_url, params)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
-        # Debería encontrar 2 alertas (alert1 y alert3)
-        self.assertEqual(len(response.data), 2)
+        # Debería encontrar 2 alertas (alert3 y alert1, la más reciente primero)
+        results = response.data['results']
+        self.assertEqual([a['id'] for a in results], [alert3.id, self.alert1.id])
         
         # Verificar que cumplen todos los criterios
-        for alert_data in response.data:
+        for alert_data in results:
             self.assertEqual(alert_data['node'], self.node1.id)
             self.assertEqual(alert_data['alert_type'], 'high')
-            self.assertEqual(alert_data['status'], 'pending')
\ No newline at end of file
+            self.assertEqual(alert_data['status'], 'pending')
+
+    def test_11_async_filter_matches_sync_filter(self):
+        """11. El filtro asíncrono devuelve lo mismo que el síncrono"""
+        token = RefreshToken.for_user(self.researcher).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        for params in (
+            {'node_id': self.node1.id, 'alert_type': 'high'},
+            {'page_size': 1},
+            {'counts': 'true'},
+        ):
+            sync_response = self.client.get(self.filter_url, params)
+            async_response = self.client.get(reverse('alert-filter-async'), params)
+
+            self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+            self.assertEqual(self.without_link_paths(async_response.json()),
+                             self.without_link_paths(sync_response.json()))
+
+        # Paginación async: el cursor de la primera página lleva a la segunda
+        first = self.client.get(reverse('alert-filter-async'), {'page_size': 1}).json()
+        second = self.client.get(first['next']).json()
+        self.assertEqual([a['id'] for a in first['results'] + second['results']],
+                         [self.alert2.id, self.alert1.id])
+        self.assertEqual(self.client.get(reverse('alert-filter-async'), {'cursor': 'x'}).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    def test_12_async_filter_requires_valid_token(self):
+        """12. El filtro asíncrono exige un JWT válido"""
+        url = reverse('alert-filter-async')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_13_filter_is_cursor_paginated(self):
+        """13. El filtro pagina por cursor en orden (-created_at, -id) sin duplicados"""
+        self.client.force_authenticate(user=self.researcher)
+        extra = [
+            Alert.objects.create(sensor=self.sensor1, node=self.node1, reading=self.reading1,
+                                 alert_type=Alert.AlertType.HIGH, detected_value=50.0 + i,
+                                 closed_at=timezone.now())
+            for i in range(3)
+        ]
+        # Mismo created_at: el orden lo decide el id
+        Alert.objects.filter(id__in=[a.id for a in extra]).update(created_at=self.alert1.created_at)
+
+        ids = []
+        url = self.filter_url + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            ids += [a['id'] for a in response.data['results']]
+            url = response.data['next']
+
+        expected = list(Alert.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(ids), 5)
+
+    def test_14_filter_counts_mode(self):
+        """14. counts=true devuelve totales por estado, tipo y nodo en una sola consulta"""
+        self.client.force_authenticate(user=self.researcher)
+        Alert.objects.create(sensor=self.sensor1, node=self.node1, reading=self.reading1,
+                             alert_type=Alert.AlertType.LOW, detected_value=-5.0)
+
+        # force_authenticate no consulta: la única consulta es el GROUP BY
+        with self.assertNumQueries(1):
+            response = self.client.get(self.filter_url, {'counts': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'total': 3,
+            'by_status': {'pending': 2, 'attended': 1},
+            'by_type': {'high': 1, 'low': 2},
+            'by_node': [
+                {'node': self.node1.id, 'count': 2},
+                {'node': self.node2.id, 'count': 1},
+            ],
+        })
+
+        # Los filtros se aplican antes de agrupar
+        response = self.client.get(self.filter_url, {'counts': 'true', 'status': 'attended'})
+        self.assertEqual(response.data['total'], 1)
+        self.assertEqual(response.data['by_status'], {'pending': 0, 'attended': 1})
+        self.assertEqual(response.data['by_node'], [{'node': self.node2.id, 'count': 1}])
+
+    def test_15_filter_rejects_non_integer_ids(self):
+        """15. Un id no numérico devuelve 400 en vez de un error de servidor"""
+        self.client.force_authenticate(user=self.researcher)
+        response = self.client.get(self.filter_url, {'node_id': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('node_id', response.data['error'])
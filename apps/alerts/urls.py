@@ -5,4 +5,6 @@ urlpatterns = [
     path('', views.alert_list_create, name='alert-list-create'),
     path('<int:pk>/', views.alert_detail, name='alert-detail'),
     path("filter/",views.alert_filter, name="alert-filter"),
+    path("async/filter/", views.alert_filter_async, name="alert-filter-async"),
+    path("stream/", views.alert_stream, name="alert-stream"),
 ]
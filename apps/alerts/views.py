@@ -1,13 +1,19 @@
 # apps/alerts/views.py
 
+from django.db.models import Count
 from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
+from apps.core.async_api import async_api_view, json_response
+from apps.core.pagination import KeysetPagination
+from apps.core.sse import event_stream_response
+from infrastructure.writer import run_write
 from .models import Alert
-from .serializers import AlertSerializer
+from .serializers import ALERT_ROWS, AlertSerializer
+from .stream import alert_broker
 
 
 # -----------------------------
@@ -18,18 +24,18 @@ from .serializers import AlertSerializer
 @permission_classes([IsAuthenticated])
 def alert_list_create(request):
     """
-    List all alerts or create a new alert.
+    List alerts (cursor-paginated) or create a new alert.
     """
     if request.method == 'GET':
-        # ELIMINAR: .filter(is_deleted=False) - usar todos
-        alerts = Alert.objects.all()  # <-- CAMBIADO
-        serializer = AlertSerializer(alerts, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination(ordering=('-created_at', '-id'))
+        rows = ALERT_ROWS.values_list(Alert.objects.all(), named=True)
+        alerts = paginator.paginate_queryset(rows, request)
+        return paginator.get_paginated_response(ALERT_ROWS.encode(alerts))
 
     if request.method == 'POST':
         serializer = AlertSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            run_write(serializer.save)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -79,41 +85,61 @@ def alert_detail(request, pk):
 # Alertas - Filtros avanzados
 # -----------------------------
 
+# Orden determinista del filtro: created_at desempatado por id
+ALERT_FILTER_ORDERING = ('-created_at', '-id')
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def alert_filter(request):
     """
-    Filter alerts by:
+    Filter alerts (cursor-paginated, newest first) by:
     - owner of the node
     - node
     - sensor
     - alert type (high / low)
     - status (pending / attended)
     - date range
+
+    With ``counts=true`` returns the totals of the matching alerts by
+    status, type and node instead of rows.
     """
-    alerts = Alert.objects.all()
+    alerts, error = _filter_alerts(request.query_params)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
 
-    owner_id = request.query_params.get('owner_id')
-    node_id = request.query_params.get('node_id')
-    sensor_id = request.query_params.get('sensor_id')
-    alert_type = request.query_params.get('alert_type')
-    status_param = request.query_params.get('status')
-    from_date = request.query_params.get('from_date')
-    to_date = request.query_params.get('to_date')
+    if _wants_counts(request.query_params):
+        return Response(_alert_counts(list(_count_rows(alerts))))
 
-    if owner_id:
-        alerts = alerts.filter(node__user_id=owner_id)
+    paginator = KeysetPagination(ordering=ALERT_FILTER_ORDERING)
+    rows = paginator.paginate_queryset(ALERT_ROWS.values_list(alerts, named=True), request)
+    return paginator.get_paginated_response(ALERT_ROWS.encode(rows))
+
+
+def _filter_alerts(params):
+    """
+    Returns ``(queryset, error)``; ``error`` is set when an id filter is not
+    an integer.
+    """
+    alerts = Alert.objects.all()
 
-    if node_id:
-        alerts = alerts.filter(node_id=node_id)
+    for param, lookup in (('owner_id', 'node__user_id'), ('node_id', 'node_id'), ('sensor_id', 'sensor_id')):
+        value = params.get(param)
+        if not value:
+            continue
+        if not value.isdigit():
+            return None, f"{param} must be an integer"
+        alerts = alerts.filter(**{lookup: int(value)})
 
-    if sensor_id:
-        alerts = alerts.filter(sensor_id=sensor_id)
+    alert_type = params.get('alert_type')
+    status_param = params.get('status')
+    from_date = params.get('from_date')
+    to_date = params.get('to_date')
 
-    if alert_type in ('high', 'low'):
+    if alert_type in Alert.AlertType.values:
         alerts = alerts.filter(alert_type=alert_type)
 
-    if status_param in ('pending', 'attended'):
+    if status_param in Alert.AlertStatus.values:
         alerts = alerts.filter(status=status_param)
 
     if from_date:
@@ -126,5 +152,110 @@ def alert_filter(request):
         if parsed_to:
             alerts = alerts.filter(created_at__lte=parsed_to)
 
-    serializer = AlertSerializer(alerts, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    return alerts, None
+
+
+# -----------------------------
+# Alertas - Totales agregados
+# -----------------------------
+
+def _wants_counts(params):
+    return params.get('counts', '').lower() in ('1', 'true', 'yes')
+
+
+def _count_rows(alerts):
+    # Un único GROUP BY; order_by() quita el orden por defecto del modelo,
+    # que si no se añadiría a la agrupación
+    return (
+        alerts.order_by()
+        .values_list('status', 'alert_type', 'node_id')
+        .annotate(count=Count('id'))
+    )
+
+
+def _alert_counts(rows):
+    """
+    Fold ``(status, alert_type, node_id, count)`` groups into the totals
+    per status, type and node. Every status and type is present, even at 0.
+    """
+    by_status = dict.fromkeys(Alert.AlertStatus.values, 0)
+    by_type = dict.fromkeys(Alert.AlertType.values, 0)
+    by_node = {}
+    total = 0
+    for status_value, alert_type, node_id, count in rows:
+        by_status[status_value] = by_status.get(status_value, 0) + count
+        by_type[alert_type] = by_type.get(alert_type, 0) + count
+        by_node[node_id] = by_node.get(node_id, 0) + count
+        total += count
+    return {
+        "total": total,
+        "by_status": by_status,
+        "by_type": by_type,
+        "by_node": [{"node": node_id, "count": count} for node_id, count in sorted(by_node.items())],
+    }
+
+
+# -----------------------------
+# Fast path asíncrono (ASGI)
+# -----------------------------
+
+@async_api_view(['GET'])
+async def alert_filter_async(request):
+    """
+    Native async counterpart of alert_filter, with the same filters,
+    pagination and ``counts`` mode.
+    """
+    alerts, error = _filter_alerts(request.GET)
+    if error:
+        return json_response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    if _wants_counts(request.GET):
+        return json_response(_alert_counts([row async for row in _count_rows(alerts)]))
+
+    paginator = KeysetPagination(ordering=ALERT_FILTER_ORDERING)
+    rows = await paginator.apaginate_queryset(ALERT_ROWS.values_list(alerts, named=True), request)
+    return json_response(paginator.get_paginated_data(ALERT_ROWS.encode(rows)))
+
+
+# -----------------------------
+# Alertas - Stream (SSE)
+# -----------------------------
+
+@async_api_view(['GET'])
+async def alert_stream(request):
+    """
+    Server-Sent Events stream of ``alert.created`` and ``alert.updated``
+    events (data: the alert as in the listings), optionally filtered by
+    ``node_id``, ``sensor_id`` and ``status``. Resumes after the
+    ``Last-Event-ID`` header (or ``last_event_id`` param) when the event is
+    still buffered, else starts with a ``reset`` event. Served under ASGI.
+    """
+    predicate, error = _stream_predicate(request.GET)
+    if error:
+        return json_response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+    return event_stream_response(request, alert_broker(), predicate)
+
+
+def _stream_predicate(params):
+    """
+    Returns ``(predicate, error)``: a test on the encoded alert for the
+    given filters, or the reason they are invalid.
+    """
+    expected = {}
+    for param, key in (('node_id', 'node'), ('sensor_id', 'sensor')):
+        value = params.get(param)
+        if not value:
+            continue
+        if not value.isdigit():
+            return None, f"{param} must be an integer"
+        expected[key] = int(value)
+
+    status_param = params.get('status')
+    if status_param:
+        if status_param not in Alert.AlertStatus.values:
+            return None, f"status must be one of: {', '.join(Alert.AlertStatus.values)}"
+        expected['status'] = status_param
+
+    if not expected:
+        return None, None
+    return (lambda alert: all(alert[key] == value for key, value in expected.items())), None
@@ -0,0 +1,68 @@
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of the ``threshold`` points of ``(x, y)`` that best
+    preserve the visual shape of the series. First and last points are
+    always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        # Promedio del siguiente bucket (el último usa el punto final)
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(max(int((i + 2) * every) + 1, avg_start + 1), n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        range_start = int(i * every) + 1
+        range_end = int((i + 1) * every) + 1
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[range_start:range_end] - y[a])
+            - (x[a] - x[range_start:range_end]) * (avg_y - y[a])
+        )
+        a = range_start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+
+def min_max(y, threshold):
+    """
+    Per-bucket min/max downsampling.
+
+    Splits the series into ``threshold // 2`` buckets and keeps the minimum
+    and maximum of each, in their original order, so spikes are never lost.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 2:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    bounds = np.linspace(0, n, threshold // 2 + 1).astype(np.int64)
+
+    indices = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if start == end:
+            continue
+        bucket = y[start:end]
+        low = start + int(np.argmin(bucket))
+        high = start + int(np.argmax(bucket))
+        indices.extend(sorted({low, high}))
+
+    return np.asarray(indices, dtype=np.int64)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.analytics.models import ReadingRollup
+from apps.analytics.rollups import rebuild_all_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild minute/hour/day reading rollups from raw readings."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_all_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {ReadingRollup.objects.count()} rollups"
+        ))
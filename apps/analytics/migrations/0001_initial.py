@@ -0,0 +1,68 @@
+# Generated by Django 6.0 on 2026-10-17 20:09
+
+from datetime import timezone as dt_timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import TruncDay, TruncHour, TruncMinute
+
+
+def backfill_rollups(apps, schema_editor):
+    Reading = apps.get_model('readings', 'Reading')
+    ReadingRollup = apps.get_model('analytics', 'ReadingRollup')
+
+    for granularity, trunc in (('minute', TruncMinute), ('hour', TruncHour), ('day', TruncDay)):
+        rows = (
+            Reading.objects
+            .order_by()
+            .annotate(bucket=trunc('timestamp', tzinfo=dt_timezone.utc))
+            .values('sensor_id', 'node_id', 'bucket')
+            .annotate(
+                count=Count('id'),
+                value_sum=Sum('value'),
+                value_min=Min('value'),
+                value_max=Max('value'),
+                value_sum_sq=Sum(F('value') * F('value')),
+            )
+        )
+        ReadingRollup.objects.bulk_create(
+            (ReadingRollup(granularity=granularity, **row) for row in rows.iterator()),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('nodes', '0002_initial'),
+        ('readings', '0006_latestreading'),
+        ('sensors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour'), ('day', 'Day')], max_length=10, verbose_name='Granularity')),
+                ('bucket', models.DateTimeField(verbose_name='Bucket start (UTC)')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Readings count')),
+                ('value_sum', models.FloatField(default=0, verbose_name='Sum of values')),
+                ('value_min', models.FloatField(verbose_name='Minimum value')),
+                ('value_max', models.FloatField(verbose_name='Maximum value')),
+                ('value_sum_sq', models.FloatField(default=0, verbose_name='Sum of squared values')),
+                ('node', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='nodes.node', verbose_name='Node')),
+                ('sensor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='sensors.sensor', verbose_name='Sensor')),
+            ],
+            options={
+                'verbose_name': 'Reading rollup',
+                'verbose_name_plural': 'Reading rollups',
+                'indexes': [models.Index(fields=['node', 'granularity', 'bucket'], name='rollup_node_bucket_idx'), models.Index(fields=['granularity', 'bucket'], name='rollup_bucket_idx')],
+                'constraints': [models.UniqueConstraint(fields=('sensor', 'granularity', 'bucket', 'node'), name='rollup_sensor_bucket_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,62 @@
 from django.db import models
+from apps.sensors.models import Sensor
+from apps.nodes.models import Node
 
-# Create your models here.
+
+class ReadingRollup(models.Model):
+    """
+    Pre-aggregated readings of a sensor over a minute, hour or day bucket.
+    Maintained incrementally on ingest so analytics never scan raw readings.
+    """
+
+    class Granularity(models.TextChoices):
+        MINUTE = "minute", "Minute"
+        HOUR = "hour", "Hour"
+        DAY = "day", "Day"
+
+    sensor = models.ForeignKey(
+        Sensor,
+        on_delete=models.CASCADE,
+        related_name="rollups",
+        verbose_name="Sensor",
+        db_index=False,  # cubierto por rollup_sensor_bucket_uniq
+    )
+
+    node = models.ForeignKey(
+        Node,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Node",
+        db_index=False,  # cubierto por rollup_node_bucket_idx
+    )
+
+    granularity = models.CharField(
+        max_length=10,
+        choices=Granularity.choices,
+        verbose_name="Granularity"
+    )
+
+    bucket = models.DateTimeField(verbose_name="Bucket start (UTC)")
+
+    count = models.PositiveIntegerField(default=0, verbose_name="Readings count")
+    value_sum = models.FloatField(default=0, verbose_name="Sum of values")
+    value_min = models.FloatField(verbose_name="Minimum value")
+    value_max = models.FloatField(verbose_name="Maximum value")
+    value_sum_sq = models.FloatField(default=0, verbose_name="Sum of squared values")
+
+    class Meta:
+        verbose_name = "Reading rollup"
+        verbose_name_plural = "Reading rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sensor", "granularity", "bucket", "node"],
+                name="rollup_sensor_bucket_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["node", "granularity", "bucket"], name="rollup_node_bucket_idx"),
+            models.Index(fields=["granularity", "bucket"], name="rollup_bucket_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.sensor_id} {self.granularity} @ {self.bucket}: {self.count}"
@@ -0,0 +1,315 @@
+import math
+from datetime import timedelta, timezone as dt_timezone
+from itertools import islice
+
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import TruncDay, TruncHour, TruncMinute
+
+from .models import ReadingRollup
+from apps.readings.models import Reading
+
+
+Granularity = ReadingRollup.Granularity
+
+# Granularidades de la más gruesa a la más fina
+LEVELS = (
+    (Granularity.DAY, timedelta(days=1)),
+    (Granularity.HOUR, timedelta(hours=1)),
+    (Granularity.MINUTE, timedelta(minutes=1)),
+)
+STEPS = dict(LEVELS)
+
+TRUNCATES = {
+    Granularity.DAY: TruncDay,
+    Granularity.HOUR: TruncHour,
+    Granularity.MINUTE: TruncMinute,
+}
+
+ROLLUP_VALUE_FIELDS = ["count", "value_sum", "value_min", "value_max", "value_sum_sq"]
+
+
+class Stats:
+    """
+    Mergeable count/sum/min/max/sum-of-squares accumulator.
+    """
+    __slots__ = ("count", "total", "minimum", "maximum", "sum_sq")
+
+    def __init__(self, count=0, total=0.0, minimum=None, maximum=None, sum_sq=0.0):
+        self.count = count or 0
+        self.total = total or 0.0
+        self.minimum = minimum
+        self.maximum = maximum
+        self.sum_sq = sum_sq or 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.sum_sq += value * value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def merge(self, other):
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.sum_sq += other.sum_sq
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+    @classmethod
+    def from_rollup(cls, row):
+        return cls(row.count, row.value_sum, row.value_min, row.value_max, row.value_sum_sq)
+
+    def apply_to(self, row):
+        row.count = self.count
+        row.value_sum = self.total
+        row.value_min = self.minimum
+        row.value_max = self.maximum
+        row.value_sum_sq = self.sum_sq
+        return row
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def stddev(self):
+        if not self.count:
+            return None
+        variance = self.sum_sq / self.count - self.mean ** 2
+        return math.sqrt(max(variance, 0.0))
+
+
+def bucket_start(timestamp, granularity):
+    timestamp = timestamp.astimezone(dt_timezone.utc)
+    if granularity == Granularity.DAY:
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == Granularity.HOUR:
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(second=0, microsecond=0)
+
+
+def bucket_ceil(timestamp, granularity):
+    start = bucket_start(timestamp, granularity)
+    return start if start == timestamp else start + STEPS[granularity]
+
+
+# -----------------------------
+# Mantenimiento incremental
+# -----------------------------
+
+def apply_readings(readings):
+    """
+    Add freshly inserted readings to their minute, hour and day buckets.
+    Works for late-arriving data too; must run inside the ingest transaction.
+    """
+    pending = {}
+    for reading in readings:
+        for granularity, _ in LEVELS:
+            key = (
+                reading.sensor_id,
+                reading.node_id,
+                granularity,
+                bucket_start(reading.timestamp, granularity),
+            )
+            pending.setdefault(key, Stats()).add(reading.value)
+
+    if not pending:
+        return
+
+    existing = {}
+    for granularity, _ in LEVELS:
+        keys = [key for key in pending if key[2] == granularity]
+        rows = ReadingRollup.objects.filter(
+            granularity=granularity,
+            sensor_id__in={key[0] for key in keys},
+            bucket__in={key[3] for key in keys},
+        )
+        for row in rows:
+            existing[(row.sensor_id, row.node_id, row.granularity, row.bucket)] = row
+
+    to_create = []
+    to_update = []
+    for key, stats in pending.items():
+        row = existing.get(key)
+        if row is None:
+            sensor_id, node_id, granularity, bucket = key
+            to_create.append(stats.apply_to(ReadingRollup(
+                sensor_id=sensor_id,
+                node_id=node_id,
+                granularity=granularity,
+                bucket=bucket,
+            )))
+        else:
+            merged = Stats.from_rollup(row)
+            merged.merge(stats)
+            to_update.append(merged.apply_to(row))
+
+    ReadingRollup.objects.bulk_create(to_create, batch_size=500)
+    ReadingRollup.objects.bulk_update(to_update, fields=ROLLUP_VALUE_FIELDS, batch_size=500)
+
+
+def rebuild_buckets(points):
+    """
+    Recompute the buckets containing ``points`` ((sensor_id, node_id, timestamp)
+    tuples) after readings were edited or deleted. Minutes are rebuilt from
+    raw readings, hours from minutes and days from hours.
+    """
+    minutes = {
+        (sensor_id, node_id, bucket_start(timestamp, Granularity.MINUTE))
+        for sensor_id, node_id, timestamp in points
+    }
+    for sensor_id, node_id, minute in minutes:
+        readings = Reading.objects.filter(
+            sensor_id=sensor_id,
+            node_id=node_id,
+            timestamp__gte=minute,
+            timestamp__lt=minute + STEPS[Granularity.MINUTE],
+        )
+        _store_bucket(sensor_id, node_id, Granularity.MINUTE, minute, raw_stats(readings))
+
+        for granularity, finer in ((Granularity.HOUR, Granularity.MINUTE), (Granularity.DAY, Granularity.HOUR)):
+            bucket = bucket_start(minute, granularity)
+            rows = ReadingRollup.objects.filter(
+                sensor_id=sensor_id,
+                node_id=node_id,
+                granularity=finer,
+                bucket__gte=bucket,
+                bucket__lt=bucket + STEPS[granularity],
+            )
+            _store_bucket(sensor_id, node_id, granularity, bucket, rollup_stats(rows))
+
+
+def _store_bucket(sensor_id, node_id, granularity, bucket, stats):
+    lookup = {
+        "sensor_id": sensor_id,
+        "node_id": node_id,
+        "granularity": granularity,
+        "bucket": bucket,
+    }
+    if not stats.count:
+        ReadingRollup.objects.filter(**lookup).delete()
+        return
+    ReadingRollup.objects.update_or_create(
+        **lookup,
+        defaults={
+            "count": stats.count,
+            "value_sum": stats.total,
+            "value_min": stats.minimum,
+            "value_max": stats.maximum,
+            "value_sum_sq": stats.sum_sq,
+        },
+    )
+
+
+def rebuild_all_rollups(batch_size=1000):
+    """
+    Rebuild every rollup from raw readings with one GROUP BY per granularity.
+    """
+    ReadingRollup.objects.all().delete()
+    for granularity, _ in LEVELS:
+        rows = (
+            Reading.objects
+            .order_by()
+            .annotate(bucket=TRUNCATES[granularity]("timestamp", tzinfo=dt_timezone.utc))
+            .values("sensor_id", "node_id", "bucket")
+            .annotate(
+                count=Count("id"),
+                value_sum=Sum("value"),
+                value_min=Min("value"),
+                value_max=Max("value"),
+                value_sum_sq=Sum(F("value") * F("value")),
+            )
+            .iterator(chunk_size=batch_size)
+        )
+        rollups = (ReadingRollup(granularity=granularity, **row) for row in rows)
+        while True:
+            chunk = list(islice(rollups, batch_size))
+            if not chunk:
+                break
+            ReadingRollup.objects.bulk_create(chunk)
+
+
+# -----------------------------
+# Consultas
+# -----------------------------
+
+def raw_stats(readings):
+    values = readings.aggregate(
+        count=Count("id"),
+        total=Sum("value"),
+        minimum=Min("value"),
+        maximum=Max("value"),
+        sum_sq=Sum(F("value") * F("value")),
+    )
+    return Stats(**values)
+
+
+def rollup_stats(rollups):
+    values = rollups.aggregate(
+        count=Sum("count"),
+        total=Sum("value_sum"),
+        minimum=Min("value_min"),
+        maximum=Max("value_max"),
+        sum_sq=Sum("value_sum_sq"),
+    )
+    return Stats(**values)
+
+
+def plan_ranges(start, end, level=0):
+    """
+    Split ``[start, end)`` into ``(granularity, start, end)`` pieces using the
+    coarsest buckets that fit entirely; ``granularity`` is ``None`` for the
+    sub-minute edges that must be read from raw readings. ``None`` bounds
+    are open.
+    """
+    if start is not None and end is not None and start >= end:
+        return []
+    if level == len(LEVELS):
+        return [(None, start, end)]
+
+    granularity, _ = LEVELS[level]
+    aligned_start = None if start is None else bucket_ceil(start, granularity)
+    aligned_end = None if end is None else bucket_start(end, granularity)
+
+    if aligned_start is not None and aligned_end is not None and aligned_start >= aligned_end:
+        return plan_ranges(start, end, level + 1)
+
+    ranges = [(granularity, aligned_start, aligned_end)]
+    if start is not None and start < aligned_start:
+        ranges += plan_ranges(start, aligned_start, level + 1)
+    if end is not None and aligned_end < end:
+        ranges += plan_ranges(aligned_end, end, level + 1)
+    return ranges
+
+
+def summarize(node_id=None, sensor_id=None, start=None, end=None):
+    """
+    Aggregate readings in ``[start, end)`` from the coarsest rollups that
+    cover the range, touching raw readings only for sub-minute edges.
+    """
+    filters = {}
+    if node_id:
+        filters["node_id"] = node_id
+    if sensor_id:
+        filters["sensor_id"] = sensor_id
+
+    stats = Stats()
+    for granularity, lower, upper in plan_ranges(start, end):
+        if granularity is None:
+            queryset = Reading.objects.filter(**filters)
+            field = "timestamp"
+        else:
+            queryset = ReadingRollup.objects.filter(granularity=granularity, **filters)
+            field = "bucket"
+        if lower is not None:
+            queryset = queryset.filter(**{f"{field}__gte": lower})
+        if upper is not None:
+            queryset = queryset.filter(**{f"{field}__lt": upper})
+
+        if granularity is None:
+            stats.merge(raw_stats(queryset))
+        else:
+            stats.merge(rollup_stats(queryset))
+    return stats
@@ -1,17 +1,27 @@
 # apps/analytics/tests/test_views.py
 # py .\manage.py test apps.analytics.tests.test_views
 
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Avg, Count, Max, Min
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+import numpy as np
 
 from apps.users.models import User
 from apps.nodes.models import Node
 from apps.sensors.models import Sensor
 from apps.readings.models import Reading
+from apps.analytics.models import ReadingRollup
+from apps.analytics.downsampling import lttb
+from apps.analytics.rollups import summarize
 
 
 class DailySummaryTests(TestCase):
@@ -201,4 +211,260 @@ class DailySummaryTests(TestCase):
         # Debe retornar None en todas las métricas cuando no hay resultados
         self.assertIsNone(response.data['avg_value'])
         self.assertIsNone(response.data['max_value'])
-        self.assertIsNone(response.data['min_value'])
\ No newline at end of file
+        self.assertIsNone(response.data['min_value'])
+
+class ReadingRollupTests(TestCase):
+    """Tests para los rollups incrementales minuto/hora/día"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass123",
+            role=User.Roles.ADMIN
+        )
+
+        self.node = Node.objects.create(
+            name="Test Node",
+            location="Test Location",
+            user=self.admin
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        self.base = datetime(2024, 3, 10, 12, 30, 15, tzinfo=dt_timezone.utc)
+        self.values = {
+            self.base: 20.0,
+            self.base + timedelta(seconds=20): 22.0,            # mismo minuto
+            self.base + timedelta(hours=2): 30.0,               # otra hora
+            self.base + timedelta(days=1): 10.0,                # otro día
+            self.base + timedelta(days=40, minutes=3): 40.0,    # otro mes
+        }
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.list_url = reverse('reading-list-create')
+        self.daily_summary_url = reverse('daily-summary')
+
+        payload = [
+            {
+                "sensor": self.sensor.id,
+                "node": self.node.id,
+                "value": value,
+                "timestamp": ts.isoformat(),
+            }
+            for ts, value in self.values.items()
+        ]
+        response = self.client.post(self.list_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def raw_summary(self, start=None, end=None):
+        readings = Reading.objects.filter(sensor=self.sensor)
+        if start:
+            readings = readings.filter(timestamp__gte=start)
+        if end:
+            readings = readings.filter(timestamp__lt=end)
+        return readings.aggregate(avg=Avg('value'), max=Max('value'), min=Min('value'), count=Count('id'))
+
+    def assertMatchesRaw(self, start=None, end=None):
+        stats = summarize(sensor_id=self.sensor.id, start=start, end=end)
+        raw = self.raw_summary(start, end)
+        self.assertEqual(stats.count, raw['count'])
+        self.assertEqual(stats.maximum, raw['max'])
+        self.assertEqual(stats.minimum, raw['min'])
+        if raw['avg'] is None:
+            self.assertIsNone(stats.mean)
+        else:
+            self.assertAlmostEqual(stats.mean, raw['avg'])
+
+    def test_1_ingest_updates_all_granularities(self):
+        """1. La ingesta batch crea/actualiza los buckets de minuto, hora y día"""
+        minute = ReadingRollup.objects.get(
+            sensor=self.sensor,
+            granularity=ReadingRollup.Granularity.MINUTE,
+            bucket=self.base.replace(second=0)
+        )
+        self.assertEqual(minute.count, 2)
+        self.assertEqual(minute.value_sum, 42.0)
+        self.assertEqual(minute.value_sum_sq, 20.0 ** 2 + 22.0 ** 2)
+
+        day = ReadingRollup.objects.get(
+            sensor=self.sensor,
+            granularity=ReadingRollup.Granularity.DAY,
+            bucket=self.base.replace(hour=0, minute=0, second=0)
+        )
+        self.assertEqual(day.count, 3)
+        self.assertEqual(day.value_min, 20.0)
+        self.assertEqual(day.value_max, 30.0)
+
+    def test_2_summary_matches_raw_for_unaligned_ranges(self):
+        """2. El resumen por rollups coincide con la agregación sobre crudo"""
+        ranges = [
+            (None, None),
+            (self.base, None),
+            (self.base + timedelta(seconds=10), self.base + timedelta(days=1, seconds=1)),
+            (self.base - timedelta(days=3), self.base + timedelta(hours=2)),
+            (self.base + timedelta(minutes=5), self.base + timedelta(minutes=6)),
+        ]
+        for start, end in ranges:
+            with self.subTest(start=start, end=end):
+                self.assertMatchesRaw(start, end)
+
+    def test_3_late_readings_patch_and_delete(self):
+        """3. Lecturas tardías, PATCH y DELETE mantienen los rollups correctos"""
+        late = self.base - timedelta(days=2)
+        response = self.client.post(self.list_url, {
+            "sensor": self.sensor.id,
+            "node": self.node.id,
+            "value": -5.0,
+            "timestamp": late.isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertMatchesRaw()
+
+        # El dueño del nodo edita la lectura máxima y borra otra
+        top = Reading.objects.get(value=40.0)
+        url = reverse('reading-detail', kwargs={'pk': top.id})
+        moved = late + timedelta(minutes=1)
+        response = self.client.patch(url, {"value": 35.0, "timestamp": moved.isoformat()}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        url = reverse('reading-detail', kwargs={'pk': Reading.objects.get(value=22.0).id})
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertMatchesRaw()
+        self.assertMatchesRaw(self.base, self.base + timedelta(days=60))
+        self.assertFalse(ReadingRollup.objects.filter(
+            granularity=ReadingRollup.Granularity.MINUTE,
+            bucket=(self.base + timedelta(days=40, minutes=3)).replace(second=0),
+        ).exists())
+
+    def test_4_query_count_is_independent_of_history(self):
+        """4. Un resumen de un año no escanea lecturas crudas"""
+        start = self.base - timedelta(days=365, seconds=7)
+        end = self.base + timedelta(days=1, minutes=1, seconds=3)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertMatchesRaw(start, end)
+        # 1 día + 2 horas + 2 minutos + 2 bordes crudos + la agregación de control
+        self.assertLessEqual(len(queries), 8)
+
+        response = self.client.get(self.daily_summary_url, {
+            'sensor_id': self.sensor.id,
+            'start_date': '2024-03-10',
+            'end_date': '2024-03-11',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)  # las del día 10; end_date = 11 a las 00:00
+
+    def test_5_rebuild_command_matches_incremental(self):
+        """5. rebuild_rollups reconstruye los mismos rollups que la ingesta"""
+        fields = ('sensor_id', 'node_id', 'granularity', 'bucket', 'count', 'value_sum', 'value_min', 'value_max')
+        incremental = set(ReadingRollup.objects.values_list(*fields))
+
+        call_command('rebuild_rollups', stdout=StringIO())
+        rebuilt = set(ReadingRollup.objects.values_list(*fields))
+        self.assertEqual(incremental, rebuilt)
+
+    def test_6_invalid_dates_return_400(self):
+        """6. Fechas inválidas devuelven 400"""
+        response = self.client.get(self.daily_summary_url, {'start_date': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReadingSeriesTests(TestCase):
+    """Tests para la serie reducida (LTTB / min-max)"""
+
+    def setUp(self):
+        self.researcher = User.objects.create_user(
+            email="researcher@test.com",
+            password="researcherpass123",
+            role=User.Roles.RESEARCHER
+        )
+
+        self.node = Node.objects.create(
+            name="Test Node",
+            location="Test Location",
+            user=self.researcher
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        # 1000 lecturas con un pico aislado
+        self.start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        readings = [
+            Reading(
+                sensor=self.sensor,
+                node=self.node,
+                value=500.0 if i == 637 else float(i % 50),
+                timestamp=self.start + timedelta(seconds=10 * i)
+            )
+            for i in range(1000)
+        ]
+        Reading.objects.bulk_create(readings)
+
+        self.series_url = reverse('reading-series')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.researcher)
+
+    def get_series(self, **params):
+        params.setdefault('sensor_id', self.sensor.id)
+        return self.client.get(self.series_url, params)
+
+    def test_1_lttb_is_bounded_and_keeps_edges_and_peaks(self):
+        """1. LTTB devuelve como mucho N puntos, conserva extremos y el pico"""
+        response = self.get_series(points=100)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['source_points'], 1000)
+        self.assertEqual(len(response.data['values']), 100)
+        self.assertEqual(len(response.data['timestamps']), 100)
+        self.assertEqual(response.data['timestamps'][0], '2024-01-01T00:00:00Z')
+        self.assertEqual(response.data['timestamps'][-1], '2024-01-01T02:46:30Z')
+        self.assertIn(500.0, response.data['values'])
+        self.assertEqual(response.data['timestamps'], sorted(response.data['timestamps']))
+
+    def test_2_minmax_keeps_bucket_extremes(self):
+        """2. min-max conserva mínimo y máximo de cada bucket"""
+        response = self.get_series(points=50, method='minmax')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(len(response.data['values']), 50)
+        self.assertIn(500.0, response.data['values'])
+        self.assertIn(0.0, response.data['values'])
+
+    def test_3_short_ranges_are_returned_as_is(self):
+        """3. Si el rango tiene menos puntos que el objetivo se devuelve completo"""
+        response = self.get_series(
+            points=300,
+            start='2024-01-01T00:00:00Z',
+            end='2024-01-01T00:01:00Z'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['values'], [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+
+    def test_4_invalid_params_return_400(self):
+        """4. Parámetros inválidos devuelven 400"""
+        self.assertEqual(self.client.get(self.series_url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_series(method='avg').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_series(points='many').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_series(start='soon').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_5_lttb_helper(self):
+        """5. lttb() selecciona índices crecientes dentro del rango"""
+        x = np.arange(10_000, dtype=np.float64)
+        y = np.sin(x / 100.0)
+        indices = lttb(x, y, 250)
+        self.assertEqual(len(indices), 250)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], 9_999)
+        self.assertTrue(np.all(np.diff(indices) > 0))
@@ -3,4 +3,5 @@ from . import views
 
 urlpatterns = [
     path('daily-summary/', views.daily_summary, name='daily-summary'),
+    path('series/', views.reading_series, name='reading-series'),
 ]
@@ -1,9 +1,39 @@
+import numpy as np
+from rest_framework import serializers, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Avg, Max, Min
-from apps.readings.models import Reading
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from apps.core.permissions import IsAdminOrReadOnly
-from datetime import datetime
+from apps.readings.models import Reading
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from .downsampling import lttb, min_max
+from .rollups import summarize
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+SERIES_DEFAULT_POINTS = 300
+SERIES_MAX_POINTS = 2000
+SERIES_METHODS = {'lttb', 'minmax'}
+
+
+def _parse_bound(value):
+    """
+    Parse a YYYY-MM-DD date or ISO datetime into an aware datetime.
+    Returns None when the value cannot be parsed.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
 
 # -----------------------------
 # Métricas y agregaciones
@@ -14,6 +44,7 @@ from datetime import datetime
 def daily_summary(request):
     """
     Devuelve resumen diario por sensor y nodo.
+    Se calcula desde los rollups (día/hora/minuto) que cubren el rango.
     Query params:
       - node_id
       - sensor_id
@@ -25,22 +56,100 @@ def daily_summary(request):
     start_date = request.query_params.get('start_date')
     end_date = request.query_params.get('end_date')
 
-    # CORREGIR: Eliminar .filter(is_deleted=False) ya que Reading no tiene ese campo
-    readings = Reading.objects.all()  # <-- CAMBIADO
-
-    if node_id:
-        readings = readings.filter(node_id=node_id)
-    if sensor_id:
-        readings = readings.filter(sensor_id=sensor_id)
-    if start_date:
-        readings = readings.filter(timestamp__gte=start_date)
-    if end_date:
-        readings = readings.filter(timestamp__lte=end_date)
-
-    summary = readings.aggregate(
-        avg_value=Avg('value'),
-        max_value=Max('value'),
-        min_value=Min('value')
-    )
-
-    return Response(summary)
\ No newline at end of file
+    start = end = None
+    try:
+        if start_date:
+            start = _parse_bound(start_date)
+            if start is None:
+                raise ValueError('start_date')
+        if end_date:
+            end = _parse_bound(end_date)
+            if end is None:
+                raise ValueError('end_date')
+    except ValueError as exc:
+        return Response(
+            {"error": f"Invalid {exc}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # end_date es inclusivo; los rollups trabajan con rangos semiabiertos
+    if end is not None:
+        end = end + timedelta(microseconds=1)
+
+    stats = summarize(node_id=node_id, sensor_id=sensor_id, start=start, end=end)
+
+    summary = {
+        'avg_value': stats.mean,
+        'max_value': stats.maximum,
+        'min_value': stats.minimum,
+        'stddev_value': stats.stddev,
+        'count': stats.count,
+    }
+
+    return Response(summary)
+
+
+# -----------------------------
+# Series reducidas para gráficas
+# -----------------------------
+
+@api_view(['GET'])
+@permission_classes([IsAdminOrReadOnly])
+def reading_series(request):
+    """
+    Devuelve la serie de un sensor reducida a un máximo de puntos.
+    Query params:
+      - sensor_id (obligatorio)
+      - start, end (YYYY-MM-DD o ISO 8601)
+      - points (por defecto 300, máximo 2000)
+      - method: lttb (por defecto) o minmax
+    """
+    sensor_id = request.query_params.get('sensor_id')
+    method = request.query_params.get('method', 'lttb')
+
+    if not sensor_id or not sensor_id.isdigit():
+        return Response({"error": "sensor_id is required"}, status=status.HTTP_400_BAD_REQUEST)
+    if method not in SERIES_METHODS:
+        return Response({"error": "method must be lttb or minmax"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        points = int(request.query_params.get('points', SERIES_DEFAULT_POINTS))
+    except ValueError:
+        return Response({"error": "points must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    points = max(3, min(points, SERIES_MAX_POINTS))
+
+    readings = Reading.objects.filter(sensor_id=sensor_id)
+    for param, lookup in (('start', 'timestamp__gte'), ('end', 'timestamp__lte')):
+        value = request.query_params.get(param)
+        if value:
+            bound = _parse_bound(value)
+            if bound is None:
+                return Response({"error": f"Invalid {param}"}, status=status.HTTP_400_BAD_REQUEST)
+            readings = readings.filter(**{lookup: bound})
+
+    # Solo tuplas (timestamp, valor): sin instancias de modelo
+    micros = []
+    values = []
+    rows = readings.order_by('timestamp', 'id').values_list('timestamp', 'value')
+    for timestamp, value in rows.iterator(chunk_size=5000):
+        micros.append((timestamp - EPOCH) // ONE_MICROSECOND)
+        values.append(value)
+
+    x = np.asarray(micros, dtype=np.int64)
+    y = np.asarray(values, dtype=np.float64)
+
+    if method == 'lttb':
+        indices = lttb(x, y, points)
+    else:
+        indices = min_max(y, points)
+
+    to_representation = serializers.DateTimeField().to_representation
+    return Response({
+        'sensor': int(sensor_id),
+        'method': method,
+        'source_points': len(x),
+        'timestamps': [
+            to_representation(EPOCH + timedelta(microseconds=int(x[i])))
+            for i in indices
+        ],
+        'values': y[indices].tolist(),
+    })
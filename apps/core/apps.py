@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'apps.core'
+
+    def ready(self):
+        # Configura cada conexión SQLite con los pragmas del entorno
+        import apps.core.signals
@@ -0,0 +1,112 @@
+from functools import wraps
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
+from django.utils.translation import gettext_lazy as _
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication for native async views: the token is validated in
+    process and the user is loaded with the async ORM.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token)
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            user = await self.user_model.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if jwt_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            jwt_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    # Mismo encoder que las respuestas de DRF (fechas, decimales, ErrorDetail)
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder)
+
+
+def async_api_view(methods, permission_classes=(IsAuthenticated,)):
+    """
+    ``@api_view`` counterpart for ``async def`` views: method check, JWT
+    authentication and DRF permission classes, without leaving the event
+    loop. The view receives a plain ``HttpRequest`` with ``user`` set and
+    must return an ``HttpResponse`` (see ``json_response``); ``APIException``
+    raised by the view is rendered like DRF does.
+    """
+    authenticator = AsyncJWTAuthentication()
+
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return json_response(
+                    {"detail": f'Method "{request.method}" not allowed.'},
+                    status=status.HTTP_405_METHOD_NOT_ALLOWED
+                )
+
+            try:
+                user = await authenticator.aauthenticate(request)
+            except AuthenticationFailed as exc:
+                return _unauthorized(authenticator, request, exc.detail)
+            request.user = user or AnonymousUser()
+
+            for permission_class in permission_classes:
+                if permission_class().has_permission(request, None):
+                    continue
+                if user is None:
+                    return _unauthorized(
+                        authenticator, request, "Authentication credentials were not provided."
+                    )
+                return json_response(
+                    {"detail": "You do not have permission to perform this action."},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+            try:
+                return await view(request, *args, **kwargs)
+            except APIException as exc:
+                detail = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+                return json_response(detail, status=exc.status_code)
+        return wrapper
+    return decorator
+
+
+def _unauthorized(authenticator, request, detail):
+    response = json_response({"detail": detail}, status=status.HTTP_401_UNAUTHORIZED)
+    response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+    return response
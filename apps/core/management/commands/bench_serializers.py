@@ -0,0 +1,123 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.alerts.models import Alert
+from apps.alerts.serializers import ALERT_ROWS, AlertSerializer
+from apps.nodes.models import Node
+from apps.readings.models import Reading
+from apps.readings.serializers import READING_ROWS, ReadingSerializer
+from apps.sensors.models import Sensor
+from apps.users.models import User
+
+
+# Modelo -> (serializer, encoder de filas)
+TARGETS = {
+    "readings": (Reading, ReadingSerializer, READING_ROWS),
+    "alerts": (Alert, AlertSerializer, ALERT_ROWS),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark list serialization: ModelSerializer(many=True) against the "
+        "values_list row encoders. Seeds synthetic rows inside a transaction "
+        "that is rolled back, so the database is left untouched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000, help="Rows per serialization.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the best is reported.")
+        parser.add_argument(
+            "--target",
+            action="append",
+            choices=sorted(TARGETS),
+            help="List to benchmark (repeatable, default: all).",
+        )
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows and --repeat must be positive")
+
+        self.stdout.write(f"{'target':<9} {'path':<16} {'rows':>8} {'rows/s':>12} {'speedup':>8}")
+        with transaction.atomic():
+            _seed(options["rows"])
+            for target in options["target"] or sorted(TARGETS):
+                self._bench(target, options)
+            transaction.set_rollback(True)
+
+    def _bench(self, target, options):
+        model, serializer_class, encoder = TARGETS[target]
+        queryset = model.objects.order_by("-id")[:options["rows"]]
+
+        paths = (
+            ("modelserializer", lambda: serializer_class(list(queryset), many=True).data),
+            ("rows", lambda: encoder.encode_queryset(queryset)),
+        )
+        outputs = {}
+        rates = {}
+        for path, serialize in paths:
+            best = None
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                outputs[path] = serialize()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            rates[path] = len(outputs[path]) / best
+
+        if [dict(row) for row in outputs["modelserializer"]] != outputs["rows"]:
+            raise CommandError(f"{target}: row encoder output differs from {serializer_class.__name__}")
+
+        for path, _ in paths:
+            speedup = rates[path] / rates["modelserializer"]
+            self.stdout.write(
+                f"{target:<9} {path:<16} {len(outputs[path]):>8} {rates[path]:>12.0f} {speedup:>7.1f}x"
+            )
+
+
+def _seed(rows):
+    user = User.objects.create_user(
+        email=f"bench-{time.time_ns()}@nodosiot.local",
+        password=None,
+        role=User.Roles.ADMIN,
+    )
+    node = Node.objects.create(name="Bench Node", location="Bench", user=user)
+    sensor = Sensor.objects.create(
+        node=node,
+        name="Bench Sensor",
+        sensor_type=Sensor.SensorTypes.TEMPERATURE,
+        model="Bench",
+        unit="°C",
+    )
+
+    start = timezone.now()
+    statuses = Reading.ValidationStatus.values
+    readings = Reading.objects.bulk_create(
+        Reading(
+            sensor=sensor,
+            node=node,
+            value=random.uniform(-10, 40),
+            timestamp=start + timedelta(seconds=i),
+            validation_status=random.choice(statuses),
+        )
+        for i in range(rows)
+    )
+    Alert.objects.bulk_create(
+        Alert(
+            sensor=sensor,
+            node=node,
+            reading=reading,
+            alert_type=Alert.AlertType.HIGH,
+            detected_value=reading.value,
+            peak_value=reading.value,
+            last_seen_at=reading.timestamp,
+            # Cerradas: solo puede haber una incidencia abierta por sensor y tipo
+            closed_at=reading.timestamp,
+            status=Alert.AlertStatus.PENDING,
+        )
+        for reading in readings
+    )
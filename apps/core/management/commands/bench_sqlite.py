@@ -0,0 +1,182 @@
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.sqlite import apply_pragmas
+
+
+# Perfiles comparados: valores por defecto de SQLite vs. settings.SQLITE_PRAGMAS
+PROFILES = ("default", "tuned")
+
+SENSORS = 50
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark SQLite under mixed load (concurrent ingest writers and "
+        "dashboard readers) with default settings and with SQLITE_PRAGMAS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per profile.")
+        parser.add_argument("--writers", type=int, default=1, help="Writer threads.")
+        parser.add_argument("--readers", type=int, default=4, help="Reader threads.")
+        parser.add_argument("--batch-size", type=int, default=100, help="Rows per write transaction.")
+        parser.add_argument("--seed-rows", type=int, default=50_000, help="Rows inserted before measuring.")
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=PROFILES,
+            help="Profile to run (repeatable, default: all).",
+        )
+
+    def handle(self, *args, **options):
+        if options["writers"] < 1 and options["readers"] < 1:
+            raise CommandError("At least one writer or reader thread is required")
+
+        self.stdout.write(
+            f"{options['writers']} writers x {options['batch_size']} rows, "
+            f"{options['readers']} readers, {options['duration']}s per profile"
+        )
+        self.stdout.write(f"{'profile':<8} {'role':<7} {'ops':>8} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+
+        for profile in options["profile"] or PROFILES:
+            pragmas = settings.SQLITE_PRAGMAS if profile == "tuned" else {}
+            with tempfile.TemporaryDirectory() as directory:
+                path = Path(directory) / "bench.sqlite3"
+                _create_database(path, options["seed_rows"])
+                results = _run(path, pragmas, options)
+
+            for role, (latencies, errors) in results.items():
+                self.stdout.write(_format_row(profile, role, latencies, errors, options["duration"]))
+
+
+def _connect(path, pragmas):
+    # Autocommit: las transacciones se abren explícitamente
+    connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    apply_pragmas(connection.cursor(), pragmas)
+    return connection
+
+
+def _create_database(path, seed_rows):
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.executescript(
+        """
+        CREATE TABLE reading (
+            id INTEGER PRIMARY KEY,
+            sensor_id INTEGER NOT NULL,
+            timestamp REAL NOT NULL,
+            value REAL NOT NULL
+        );
+        CREATE INDEX reading_sensor_ts_idx ON reading (sensor_id, timestamp);
+        """
+    )
+    now = time.time()
+    connection.execute("BEGIN")
+    connection.executemany(
+        "INSERT INTO reading (sensor_id, timestamp, value) VALUES (?, ?, ?)",
+        (
+            (i % SENSORS, now - (seed_rows - i), random.uniform(-10, 40))
+            for i in range(seed_rows)
+        ),
+    )
+    connection.execute("COMMIT")
+    connection.close()
+
+
+def _run(path, pragmas, options):
+    # El journal_mode es persistente: se fija una vez antes de medir
+    _connect(path, pragmas).close()
+
+    deadline_box = []
+    barrier = threading.Barrier(options["writers"] + options["readers"] + 1)
+    results = {
+        "write": ([], [0]),
+        "read": ([], [0]),
+    }
+    lock = threading.Lock()
+
+    def worker(role, operation):
+        connection = _connect(path, pragmas)
+        latencies = []
+        errors = 0
+        barrier.wait()
+        deadline = deadline_box[0]
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                operation(connection)
+            except sqlite3.OperationalError:
+                # "database is locked": el lock no se liberó a tiempo
+                errors += 1
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                continue
+            latencies.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            results[role][0].extend(latencies)
+            results[role][1][0] += errors
+
+    def write(connection):
+        now = time.time()
+        rows = [
+            (random.randrange(SENSORS), now, random.uniform(-10, 40))
+            for _ in range(options["batch_size"])
+        ]
+        connection.execute("BEGIN IMMEDIATE")
+        connection.executemany(
+            "INSERT INTO reading (sensor_id, timestamp, value) VALUES (?, ?, ?)", rows
+        )
+        connection.execute("COMMIT")
+
+    def read(connection):
+        # Consulta típica de dashboard: resumen de la última hora de un sensor
+        connection.execute(
+            "SELECT COUNT(*), AVG(value), MIN(value), MAX(value) FROM reading "
+            "WHERE sensor_id = ? AND timestamp >= ?",
+            (random.randrange(SENSORS), time.time() - 3600),
+        ).fetchone()
+
+    threads = [
+        threading.Thread(target=worker, args=("write", write))
+        for _ in range(options["writers"])
+    ] + [
+        threading.Thread(target=worker, args=("read", read))
+        for _ in range(options["readers"])
+    ]
+    for thread in threads:
+        thread.start()
+    deadline_box.append(time.perf_counter() + options["duration"])
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+
+    return {
+        role: (latencies, errors[0])
+        for role, (latencies, errors) in results.items()
+        if latencies or errors[0]
+    }
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def _format_row(profile, role, latencies, errors, duration):
+    latencies = sorted(latencies)
+    p50 = _percentile(latencies, 0.50) * 1000
+    p99 = _percentile(latencies, 0.99) * 1000
+    return (
+        f"{profile:<8} {role:<7} {len(latencies):>8} {len(latencies) / duration:>10.1f} "
+        f"{p50:>9.2f} {p99:>9.2f} {errors:>7}"
+    )
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.sensors.models import Sensor
+from apps.users.models import User
+
+
+# Escenario -> (vista síncrona, vista asíncrona)
+SCENARIOS = {
+    "latest": ("reading-latest", "reading-latest-async"),
+    "ingest": ("reading-list-create", "reading-ingest-async"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the sync DRF views against their native async counterparts "
+        "in process, through Django's ASGI request handling. Reports req/s and "
+        "latency per concurrency level. The ingest scenario writes readings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="latest")
+        parser.add_argument(
+            "--concurrency",
+            default="10,100,500",
+            help="Comma-separated numbers of concurrent connections.",
+        )
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run.")
+        parser.add_argument("--user", help="Email of the admin user to authenticate as.")
+        parser.add_argument("--sensor", type=int, help="Sensor id used by the ingest scenario.")
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options["concurrency"].split(",")]
+        except ValueError:
+            raise CommandError("--concurrency must be a comma-separated list of integers")
+
+        user = self._get_user(options["user"])
+        token = str(RefreshToken.for_user(user).access_token)
+        sensor = self._get_sensor(options["sensor"]) if options["scenario"] == "ingest" else None
+
+        self.stdout.write(f"{'path':<6} {'conns':>6} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for level in levels:
+            for path, url_name in zip(("sync", "async"), SCENARIOS[options["scenario"]]):
+                # async_to_sync: las vistas síncronas corren en este hilo, como bajo un servidor ASGI
+                latencies, errors = async_to_sync(_run)(
+                    reverse(url_name), options["scenario"], level, options["duration"], token, sensor
+                )
+                self.stdout.write(_format_row(path, level, latencies, errors, options["duration"]))
+
+    def _get_user(self, email):
+        users = User.objects.filter(role=User.Roles.ADMIN, is_active=True)
+        if email:
+            users = users.filter(email=email)
+        user = users.order_by("id").first()
+        if user is None:
+            raise CommandError("No active admin user found (use --user)")
+        return user
+
+    def _get_sensor(self, sensor_id):
+        sensors = Sensor.objects.filter(is_active=True, is_deleted=False)
+        if sensor_id:
+            sensors = sensors.filter(id=sensor_id)
+        sensor = sensors.order_by("id").first()
+        if sensor is None:
+            raise CommandError("No active sensor found (use --sensor)")
+        return sensor
+
+
+async def _run(url, scenario, connections, duration, token, sensor):
+    client = AsyncClient()
+    headers = {"Authorization": f"Bearer {token}"}
+    deadline = time.perf_counter() + duration
+    latencies = []
+    errors = 0
+    sequence = iter(range(10 ** 12))
+
+    async def request():
+        if scenario == "latest":
+            return await client.get(url, {"interval": 5}, headers=headers)
+        # Cada lectura con su propio timestamp para no chocar con la clave única
+        timestamp = timezone.now() - timedelta(microseconds=next(sequence))
+        return await client.post(url, {
+            "sensor": sensor.id,
+            "node": sensor.node_id,
+            "value": 21.5,
+            "timestamp": timestamp.isoformat(),
+        }, content_type="application/json", headers=headers)
+
+    async def connection():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await request()
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    return latencies, errors
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _format_row(path, connections, latencies, errors, duration):
+    latencies = sorted(latencies)
+    return (
+        f"{path:<6} {connections:>6} {len(latencies):>9} {len(latencies) / duration:>9.1f} "
+        f"{_percentile(latencies, 0.50) * 1000:>9.1f} {_percentile(latencies, 0.99) * 1000:>9.1f} {errors:>7}"
+    )
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-17 23:10
+
+import apps.core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionVersion',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Collection')),
+                ('token', models.CharField(default=apps.core.models._new_token, editable=False, max_length=32, verbose_name='Token')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Version')),
+            ],
+        ),
+    ]
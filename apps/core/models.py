@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.utils import timezone
 
@@ -50,3 +52,34 @@ class BaseModel(
     """
     class Meta:
         abstract = True
+
+
+def _new_token():
+    return uuid.uuid4().hex
+
+
+class CollectionVersion(models.Model):
+    """
+    Change counter of the rows of a model (``name`` is its label, e.g.
+    ``nodes.node``), bumped in the same transaction as every save or
+    delete of one of them. ``token`` is random per row, so versions from
+    another database never match. See ``apps.core.versions``.
+    """
+    name = models.CharField(
+        max_length=100,
+        primary_key=True,
+        verbose_name="Collection"
+    )
+    token = models.CharField(
+        max_length=32,
+        default=_new_token,
+        editable=False,
+        verbose_name="Token"
+    )
+    version = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Version"
+    )
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
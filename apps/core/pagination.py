@@ -0,0 +1,180 @@
+# apps/core/pagination.py
+import base64
+import binascii
+import json
+from functools import reduce
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque cursor pagination over a unique composite key.
+
+    ``ordering`` must end with a unique field (usually ``id``), e.g.
+    ``("-timestamp", "-id")``. Each page is fetched with a range condition
+    on the key instead of an OFFSET, so the cost of a page does not depend
+    on how deep the client has paged.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+        self.keys = [
+            (field.lstrip('-'), field.startswith('-'))
+            for field in self.ordering
+        ]
+
+    def get_page_size(self, request):
+        page_size = settings.API_PAGE_SIZE
+        raw = _query_params(request).get(self.page_size_query_param)
+        if raw:
+            try:
+                page_size = int(raw)
+            except ValueError:
+                pass
+        return max(1, min(page_size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        ``paginate_queryset`` for native async views (``request`` may be a
+        plain ``HttpRequest``); the page is fetched with the async ORM.
+        """
+        queryset = self.page_queryset(queryset, request)
+        return self.set_page([row async for row in queryset])
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link('n', self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.build_link('p', self.page[0])
+
+    # -----------------------------
+    # Helpers
+    # -----------------------------
+
+    def page_queryset(self, queryset, request):
+        """
+        ``queryset`` restricted to the requested page plus one row (to know
+        whether there is a next page), in the order it must be fetched.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request, queryset.model)
+        self.reverse = cursor is not None and cursor[0] == 'p'
+        self.has_cursor = cursor is not None
+
+        if cursor is not None:
+            queryset = queryset.filter(self.build_position_filter(cursor[1], self.reverse))
+
+        ordering = self.reversed_ordering() if self.reverse else self.ordering
+        return queryset.order_by(*ordering)[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = self.has_cursor, has_more
+
+        self.page = results
+        return results
+
+    def reversed_ordering(self):
+        return tuple(
+            field.lstrip('-') if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        )
+
+    def build_position_filter(self, position, reverse):
+        """
+        Rows strictly after ``position`` in page order (before it when
+        ``reverse``). The leading ``<=``/``>=`` bound lets the database
+        range-scan the index; the OR chain breaks ties on the next keys.
+        """
+        def lookup(descending, strict):
+            after = descending != reverse
+            if strict:
+                return 'lt' if after else 'gt'
+            return 'lte' if after else 'gte'
+
+        first_field, first_desc = self.keys[0]
+        bound = Q(**{f'{first_field}__{lookup(first_desc, strict=False)}': position[0]})
+
+        branches = []
+        for i, (field, descending) in enumerate(self.keys):
+            equal = {self.keys[j][0]: position[j] for j in range(i)}
+            equal[f'{field}__{lookup(descending, strict=True)}'] = position[i]
+            branches.append(Q(**equal))
+
+        return bound & reduce(lambda a, b: a | b, branches)
+
+    def build_link(self, direction, obj):
+        position = [
+            self.encode_value(getattr(obj, field))
+            for field, _ in self.keys
+        ]
+        payload = json.dumps({'d': direction, 'p': position}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        token = _query_params(request).get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction, raw_position = payload['d'], payload['p']
+            if direction not in ('n', 'p') or len(raw_position) != len(self.keys):
+                raise ValueError
+            position = [
+                model._meta.get_field(field).to_python(value)
+                for (field, _), value in zip(self.keys, raw_position)
+            ]
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return direction, position
+
+    @staticmethod
+    def encode_value(value):
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
+
+
+def _query_params(request):
+    # Request de DRF o HttpRequest plano (vistas async)
+    return getattr(request, 'query_params', request.GET)
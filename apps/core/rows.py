@@ -0,0 +1,157 @@
+from functools import cached_property
+from operator import attrgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+class RowEncoder:
+    """
+    Read-only fast path for a ``ModelSerializer``'s output.
+
+    The serializer's fields are compiled once into ``values_list`` lookups
+    plus a converter per column, and rows are encoded straight from the
+    query's tuples: no model instances and no per-field DRF dispatch. The
+    output is the same JSON as ``serializer_class(objs, many=True).data``.
+
+    Only plain model fields and primary-key relations are supported; a
+    serializer with nested, method or other relational fields raises
+    ``ImproperlyConfigured``.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    def values_list(self, queryset, named=False):
+        """
+        ``queryset`` reduced to the columns the encoder needs. ``named=True``
+        yields rows with attribute access (e.g. for ``KeysetPagination``).
+        """
+        return queryset.values_list(*self._plan[1], named=named)
+
+    def encode(self, rows):
+        """
+        Encode ``values_list`` rows (tuples in ``values_list`` order) into
+        the serializer's representation.
+        """
+        names, _, factories = self._plan
+        converters = [(index, factory()) for index, factory in factories]
+
+        data = []
+        for row in rows:
+            values = list(row)
+            for index, convert in converters:
+                value = values[index]
+                if value is not None:
+                    values[index] = convert(value)
+            data.append(dict(zip(names, values)))
+        return data
+
+    def encode_queryset(self, queryset):
+        return self.encode(self.values_list(queryset))
+
+    def encode_objects(self, objs):
+        """
+        Encode model instances already in memory (e.g. just saved), reading
+        the same columns as attributes instead of querying them.
+        """
+        getters = [attrgetter(lookup.replace("__", ".")) for lookup in self._plan[1]]
+        return self.encode(tuple(get(obj) for get in getters) for obj in objs)
+
+    # -----------------------------
+    # Compilación
+    # -----------------------------
+
+    @cached_property
+    def _plan(self):
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+
+        names, lookups, factories = [], [], []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            names.append(name)
+            lookups.append(_lookup(model, field))
+            factory = _converter_factory(field)
+            if factory is not None:
+                factories.append((len(names) - 1, factory))
+        return tuple(names), tuple(lookups), tuple(factories)
+
+
+# Campos escalares cuya representación se puede calcular desde el valor
+_SCALAR_FIELDS = (
+    serializers.IntegerField,
+    serializers.FloatField,
+    serializers.DecimalField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.DateTimeField,
+    serializers.DateField,
+    serializers.TimeField,
+    serializers.DurationField,
+    serializers.UUIDField,
+    serializers.JSONField,
+)
+
+
+def _lookup(model, field):
+    if field.source == "*" or not isinstance(
+        field,
+        (serializers.PrimaryKeyRelatedField, serializers.ReadOnlyField)
+        + _SCALAR_FIELDS,
+    ):
+        raise ImproperlyConfigured(f"RowEncoder cannot encode field {field.field_name!r} ({type(field).__name__})")
+
+    source = field.source_attrs
+    if len(source) == 1:
+        model_field = model._meta.get_field(source[0])
+        if model_field.many_to_many or model_field.one_to_many:
+            raise ImproperlyConfigured(f"RowEncoder cannot encode to-many field {field.field_name!r}")
+        # FK: se lee la columna (sensor_id), no el objeto relacionado
+        return model_field.attname
+    return "__".join(source)
+
+
+def _converter_factory(field):
+    """
+    ``None`` when the database value is already the representation, else a
+    callable returning the converter for one ``encode`` call (so request
+    state like the active timezone is read once per call, not per row).
+    """
+    if isinstance(field, (serializers.IntegerField, serializers.BooleanField, serializers.ReadOnlyField)):
+        return None
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return None if field.pk_field is None else lambda: field.pk_field.to_representation
+    if isinstance(field, serializers.ChoiceField):
+        identity = all(key == value for key, value in field.choice_strings_to_values.items())
+        return None if identity else lambda: field.to_representation
+    if isinstance(field, serializers.CharField):
+        return None
+    if isinstance(field, serializers.FloatField):
+        return lambda: float
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter_factory(field)
+    return lambda: field.to_representation
+
+
+def _datetime_converter_factory(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601 or hasattr(field, "timezone"):
+        return lambda: field.to_representation
+
+    def factory():
+        # Igual que DateTimeField.to_representation con la zona activa
+        field_timezone = field.default_timezone()
+        if field_timezone is None:
+            return field.to_representation
+
+        def convert(value):
+            value = value.astimezone(field_timezone).isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+        return convert
+    return factory
@@ -0,0 +1,36 @@
+import re
+
+
+# Pragmas admitidos y cómo validar su valor
+PRAGMA_VALUES = {
+    "journal_mode": re.compile(r"^(delete|truncate|persist|memory|wal|off)$", re.I),
+    "synchronous": re.compile(r"^(off|normal|full|extra|[0-3])$", re.I),
+    "cache_size": re.compile(r"^-?\d+$"),
+    "mmap_size": re.compile(r"^\d+$"),
+    "busy_timeout": re.compile(r"^\d+$"),
+    "temp_store": re.compile(r"^(default|file|memory|[0-2])$", re.I),
+    "foreign_keys": re.compile(r"^(on|off|[01])$", re.I),
+    "wal_autocheckpoint": re.compile(r"^\d+$"),
+}
+
+
+def pragma_statements(pragmas):
+    """
+    ``PRAGMA`` statements for a ``{name: value}`` mapping, e.g.
+    ``settings.SQLITE_PRAGMAS``. Names and values are validated since
+    pragmas cannot be parameterized.
+    """
+    statements = []
+    for name, value in pragmas.items():
+        pattern = PRAGMA_VALUES.get(name)
+        if pattern is None:
+            raise ValueError(f"Unsupported SQLite pragma: {name!r}")
+        if not pattern.match(str(value)):
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def apply_pragmas(cursor, pragmas):
+    for statement in pragma_statements(pragmas):
+        cursor.execute(statement)
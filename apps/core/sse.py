@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from infrastructure.broker import get_broker
+
+
+# Evento que pide al cliente recargar su estado: no se pudo reanudar desde
+# su Last-Event-ID (id desconocido, de otro proceso o fuera del buffer)
+RESET_EVENT = "reset"
+
+# Comentario SSE: mantiene viva la conexión a través de proxies
+KEEPALIVE = ": keepalive\n\n"
+
+
+def stream_broker(name):
+    """
+    The process broker of stream ``name``, sized from EVENT_STREAM_*.
+    """
+    return get_broker(
+        name,
+        buffer_size=settings.EVENT_STREAM_BUFFER,
+        max_pending=settings.EVENT_STREAM_MAX_PENDING,
+    )
+
+
+def format_event(data, event_type=None, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event_type is not None:
+        lines.append(f"event: {event_type}")
+    # JSON compacto: nunca contiene saltos de línea
+    lines.append(f"data: {json.dumps(data, cls=JSONEncoder, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def event_stream_response(request, broker, predicate=None):
+    """
+    ``text/event-stream`` response for an async view: replays the events
+    after ``Last-Event-ID`` (header, or ``last_event_id`` query param) and
+    then streams new ones matching ``predicate(data)``.
+
+    A ``reset`` event is sent first when the replay is incomplete. A
+    comment is sent every EVENT_STREAM_KEEPALIVE seconds without events,
+    and the stream ends after EVENT_STREAM_TIMEOUT seconds (or when the
+    client falls too far behind); ``EventSource`` reconnects on its own
+    with the last id it received.
+    """
+    return sse_response(_stream(broker, request_last_event_id(request), predicate))
+
+
+def sse_response(stream):
+    """
+    ``text/event-stream`` response over an async iterator of formatted
+    events (see ``format_event``).
+    """
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # nginx: no acumular el stream en el buffer del proxy
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def request_last_event_id(request):
+    # EventSource lo envía como cabecera al reconectar; el parámetro permite
+    # reanudar al abrir un stream nuevo
+    return request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+
+
+def retry_field():
+    return f"retry: {settings.EVENT_STREAM_RETRY_MS}\n\n"
+
+
+async def live_events(subscription):
+    """
+    Yield the subscription's events as they arrive, and ``None`` after
+    every EVENT_STREAM_KEEPALIVE seconds without one (send a keepalive).
+    Ends at EVENT_STREAM_TIMEOUT or when the subscription closes.
+    """
+    keepalive = settings.EVENT_STREAM_KEEPALIVE
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.EVENT_STREAM_TIMEOUT
+
+    while (remaining := deadline - loop.time()) > 0:
+        try:
+            event = await subscription.get(timeout=min(keepalive, remaining))
+        except asyncio.TimeoutError:
+            yield None
+            continue
+        if event is None:
+            return
+        yield event
+
+
+async def _stream(broker, last_event_id, predicate):
+    subscription, backlog, resumed = broker.subscribe(last_event_id, predicate)
+    try:
+        yield retry_field()
+        if not resumed:
+            yield format_event({}, RESET_EVENT, broker.last_event_id)
+        for event in backlog:
+            yield format_event(event.data, event.type, event.id)
+
+        async for event in live_events(subscription):
+            yield KEEPALIVE if event is None else format_event(event.data, event.type, event.id)
+    finally:
+        subscription.close()
@@ -0,0 +1,113 @@
+# apps/core/tests/test_rows.py
+# py .\manage.py test apps.core.tests.test_rows
+
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import serializers
+from datetime import timedelta
+
+from apps.core.rows import RowEncoder
+from apps.users.models import User
+from apps.nodes.models import Node
+from apps.sensors.models import Sensor
+from apps.readings.models import Reading
+from apps.readings.serializers import READING_ROWS, ReadingSerializer
+from apps.alerts.models import Alert
+from apps.alerts.serializers import ALERT_ROWS, AlertSerializer
+
+
+class RowEncoderTests(TestCase):
+    """Tests para los encoders de filas de los listados"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass",
+            role=User.Roles.ADMIN
+        )
+
+        self.node = Node.objects.create(
+            name="Gateway Node",
+            location="Test Location",
+            user=self.admin
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        base = timezone.now()
+        self.readings = [
+            Reading.objects.create(
+                sensor=self.sensor,
+                node=self.node,
+                value=value,
+                timestamp=base - timedelta(minutes=n),
+                validation_status=validation_status
+            )
+            for n, (value, validation_status) in enumerate([(21.5, 'valid'), (50, 'high'), (-3.25, 'low')])
+        ]
+        Alert.objects.create(
+            sensor=self.sensor, node=self.node, reading=self.readings[1],
+            alert_type='high', detected_value=50, status='pending'
+        )
+        Alert.objects.create(
+            sensor=self.sensor, node=self.node, reading=self.readings[2],
+            alert_type='low', detected_value=-3.25, status='attended'
+        )
+
+    def assertSameOutput(self, encoder, serializer_class, queryset):
+        expected = [dict(row) for row in serializer_class(queryset, many=True).data]
+        self.assertEqual(encoder.encode_queryset(queryset), expected)
+
+    def test_1_matches_model_serializer_output(self):
+        """1. Lecturas y alertas se codifican igual que con el ModelSerializer"""
+        self.assertSameOutput(READING_ROWS, ReadingSerializer, Reading.objects.order_by('id'))
+        self.assertSameOutput(ALERT_ROWS, AlertSerializer, Alert.objects.order_by('id'))
+
+    def test_2_uses_the_active_timezone(self):
+        """2. Las fechas siguen la zona horaria activa, como DateTimeField"""
+        with timezone.override('America/Havana'):
+            self.assertSameOutput(READING_ROWS, ReadingSerializer, Reading.objects.order_by('id'))
+            self.assertNotIn('Z', READING_ROWS.encode_queryset(Reading.objects.all())[0]['timestamp'])
+
+    def test_3_rejects_fields_it_cannot_encode(self):
+        """3. Campos calculados o anidados no se pueden codificar desde filas"""
+        class SensorWithNameSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Sensor
+                fields = ("id", "label")
+
+            def get_label(self, obj):
+                return str(obj)
+
+        with self.assertRaises(ImproperlyConfigured):
+            RowEncoder(SensorWithNameSerializer).encode_queryset(Sensor.objects.all())
+
+    def test_4_benchmark_compares_both_paths(self):
+        """4. bench_serializers mide ambos caminos sin dejar datos"""
+        out = StringIO()
+        call_command('bench_serializers', '--rows', '50', '--repeat', '1', stdout=out)
+        rows = [line.split()[:2] for line in out.getvalue().splitlines()[1:]]
+        self.assertEqual(rows, [
+            ['alerts', 'modelserializer'], ['alerts', 'rows'],
+            ['readings', 'modelserializer'], ['readings', 'rows'],
+        ])
+        self.assertEqual(Reading.objects.count(), 3)
+
+    def test_5_encodes_instances_without_queries(self):
+        """5. Instancias ya cargadas se codifican igual y sin consultas"""
+        alerts = list(Alert.objects.order_by('id'))
+        with self.assertNumQueries(0):
+            data = ALERT_ROWS.encode_objects(alerts)
+        self.assertEqual(data, [dict(row) for row in AlertSerializer(alerts, many=True).data])
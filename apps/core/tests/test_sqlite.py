@@ -0,0 +1,59 @@
+# apps/core/tests/test_sqlite.py
+# py .\manage.py test apps.core.tests.test_sqlite
+
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from apps.core.sqlite import pragma_statements
+
+
+class PragmaStatementTests(SimpleTestCase):
+    """Tests para la generación de pragmas"""
+
+    def test_1_builds_statements(self):
+        """1. Genera un PRAGMA por entrada"""
+        self.assertEqual(
+            pragma_statements({'journal_mode': 'wal', 'cache_size': -64000}),
+            ['PRAGMA journal_mode = wal', 'PRAGMA cache_size = -64000']
+        )
+
+    def test_2_rejects_unknown_or_invalid_values(self):
+        """2. Rechaza pragmas desconocidos y valores inválidos"""
+        with self.assertRaises(ValueError):
+            pragma_statements({'writable_schema': 'on'})
+        with self.assertRaises(ValueError):
+            pragma_statements({'synchronous': 'normal; DROP TABLE users_user'})
+
+
+@skipUnless(connection.vendor == 'sqlite', "Pragmas específicos de SQLite")
+class SQLiteConnectionTests(TestCase):
+    """Las conexiones SQLite se abren con SQLITE_PRAGMAS"""
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_1_connection_uses_configured_pragmas(self):
+        """1. La conexión aplica busy_timeout, cache_size, temp_store y synchronous"""
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('cache_size'), -64000)
+        self.assertEqual(self.pragma('temp_store'), 2)  # memory
+        self.assertEqual(self.pragma('synchronous'), 1)  # normal
+
+    def test_2_benchmark_reports_both_profiles(self):
+        """2. bench_sqlite mide lecturas y escrituras de ambos perfiles"""
+        out = StringIO()
+        call_command(
+            'bench_sqlite', '--duration', '0.2', '--seed-rows', '500',
+            '--readers', '2', stdout=out
+        )
+        rows = [line.split()[:2] for line in out.getvalue().splitlines()[2:]]
+        self.assertEqual(rows, [
+            ['default', 'write'], ['default', 'read'],
+            ['tuned', 'write'], ['tuned', 'read'],
+        ])
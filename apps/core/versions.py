@@ -0,0 +1,83 @@
+from django.db.models import F
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import CollectionVersion
+
+
+# -----------------------------
+# Versiones por colección
+# -----------------------------
+
+def collection_name(model):
+    return model._meta.label_lower
+
+
+def bump_version(model):
+    """
+    Advance the version of ``model``'s collection. Call it inside the
+    transaction of the write (the model's signals do), so the new version
+    commits or rolls back with the rows. Queryset ``update()`` and
+    ``bulk_*`` bypass the signals and must bump it themselves.
+    """
+    name = collection_name(model)
+    if not CollectionVersion.objects.filter(name=name).update(version=F("version") + 1):
+        CollectionVersion.objects.get_or_create(name=name)
+        CollectionVersion.objects.filter(name=name).update(version=F("version") + 1)
+
+
+def get_version(model):
+    """
+    ``(token, version)`` of ``model``'s collection: one primary-key lookup.
+    """
+    version, _ = CollectionVersion.objects.get_or_create(name=collection_name(model))
+    return version.token, version.version
+
+
+def get_versions(*models):
+    """
+    ``{label: "token.version"}`` for several collections in one query,
+    without creating missing rows (``"-.0"`` until the first write).
+    """
+    names = [collection_name(model) for model in models]
+    versions = dict.fromkeys(names, "-.0")
+    for name, token, version in CollectionVersion.objects.filter(name__in=names).values_list(
+        "name", "token", "version"
+    ):
+        versions[name] = f"{token}.{version}"
+    return versions
+
+
+# -----------------------------
+# GET condicional (ETag / If-None-Match)
+# -----------------------------
+
+def collection_etag(request, model):
+    """
+    Strong ETag for a GET whose response only depends on the rows of
+    ``model`` (and on the URL): the collection's version plus the
+    negotiated format. Read it before the rows: a write in between then
+    yields fresh data under the old tag, which the next request refreshes.
+    """
+    token, version = get_version(model)
+    return quote_etag(f"{collection_name(model)}.{token[:12]}.{version}.{request.accepted_renderer.format}")
+
+
+def not_modified(request, etag):
+    """
+    A 304 ``Response`` if ``If-None-Match`` matches ``etag``, else ``None``.
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return None
+    etags = parse_etags(header)
+    # Comparación débil (RFC 9110, 13.1.2): W/"x" coincide con "x"
+    if "*" in etags or etag in (tag.removeprefix("W/") for tag in etags):
+        return with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+    return None
+
+
+def with_etag(response, etag):
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import ExportJob
+from .services import (
+    ALERT_CSV_HEADER,
+    READING_CSV_HEADER,
+    alert_rows,
+    iter_csv_chunks,
+    reading_rows,
+)
+from .reports import ReadingReport
+
+
+logger = logging.getLogger(__name__)
+
+# Tipo de export -> (filas, extensión, content type)
+EXPORT_FORMATS = {
+    ExportJob.Kind.READINGS_CSV: (reading_rows, "csv", "text/csv"),
+    ExportJob.Kind.ALERTS_CSV: (alert_rows, "csv", "text/csv"),
+    ExportJob.Kind.READINGS_PDF: (reading_rows, "pdf", "application/pdf"),
+}
+
+# Estados en los que un job se puede reutilizar en vez de recalcularlo
+REUSABLE_STATUSES = (ExportJob.Status.PENDING, ExportJob.Status.RUNNING, ExportJob.Status.DONE)
+
+
+def filters_hash(filters):
+    payload = json.dumps(filters, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def artifact_path(job):
+    return Path(settings.EXPORTS_DIR) / job.file_name
+
+
+def submit_export(kind, filters, user=None):
+    """
+    Queue an export of ``kind`` with canonical ``filters`` (see
+    ``parse_export_filters``). A job with the same kind and filters created
+    within EXPORTS_REUSE_WINDOW seconds is returned instead, unless it
+    failed or its artifact is gone. Returns ``(job, reused)``.
+    """
+    digest = filters_hash(filters)
+    since = timezone.now() - timedelta(seconds=settings.EXPORTS_REUSE_WINDOW)
+    candidates = ExportJob.objects.filter(
+        kind=kind,
+        filters_hash=digest,
+        status__in=REUSABLE_STATUSES,
+        created_at__gte=since,
+    ).order_by("-created_at")
+    for job in candidates[:1]:
+        if job.status != ExportJob.Status.DONE or artifact_path(job).exists():
+            return job, True
+
+    job = ExportJob.objects.create(kind=kind, filters=filters, filters_hash=digest, requested_by=user)
+    if settings.EXPORTS_RUN_INLINE:
+        run_export_job(job.pk)
+        job.refresh_from_db()
+    else:
+        # El worker sólo ve el job una vez confirmado
+        transaction.on_commit(lambda: get_worker().enqueue(job.pk))
+    return job, False
+
+
+def run_export_job(job_id):
+    """
+    Compute a pending job's artifact. The job is claimed with a conditional
+    update, so a job queued in several processes runs only once. The file
+    is written in chunks to ``<name>.part`` and renamed when complete.
+    """
+    claimed = ExportJob.objects.filter(pk=job_id, status=ExportJob.Status.PENDING).update(
+        status=ExportJob.Status.RUNNING,
+        started_at=timezone.now(),
+    )
+    if not claimed:
+        return
+
+    job = ExportJob.objects.get(pk=job_id)
+    rows_for, extension, _ = EXPORT_FORMATS[job.kind]
+    job.file_name = f"export-{job.pk}-{job.kind}.{extension}"
+    path = artifact_path(job)
+    partial = path.with_name(path.name + ".part")
+
+    def progress(rows_done):
+        ExportJob.objects.filter(pk=job.pk).update(rows_done=rows_done)
+
+    try:
+        rows = rows_for(job.filters)
+        ExportJob.objects.filter(pk=job.pk).update(rows_total=rows.count())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if job.kind == ExportJob.Kind.READINGS_PDF:
+            with open(partial, "wb") as output:
+                ReadingReport(job.filters).render(output, progress)
+        else:
+            header = ALERT_CSV_HEADER if job.kind == ExportJob.Kind.ALERTS_CSV else READING_CSV_HEADER
+            with open(partial, "w", newline="", encoding="utf-8") as output:
+                done = 0
+                for text, count in iter_csv_chunks(header, rows):
+                    output.write(text)
+                    done += count
+                    progress(done)
+        os.replace(partial, path)
+    except Exception as exc:
+        logger.exception("Export job %s failed", job.pk)
+        partial.unlink(missing_ok=True)
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.Status.FAILED,
+            error=str(exc),
+            finished_at=timezone.now(),
+        )
+        return
+
+    ExportJob.objects.filter(pk=job.pk).update(
+        status=ExportJob.Status.DONE,
+        file_name=job.file_name,
+        finished_at=timezone.now(),
+    )
+
+
+def run_pending_jobs(stale_after=None):
+    """
+    Run every pending job in this thread, oldest first. With
+    ``stale_after`` (seconds), jobs left running longer than that by a
+    crashed process are reset to pending first. Returns how many ran.
+    """
+    if stale_after is not None:
+        ExportJob.objects.filter(
+            status=ExportJob.Status.RUNNING,
+            started_at__lt=timezone.now() - timedelta(seconds=stale_after),
+        ).update(status=ExportJob.Status.PENDING, rows_done=0)
+
+    job_ids = list(
+        ExportJob.objects.filter(status=ExportJob.Status.PENDING)
+        .order_by("created_at")
+        .values_list("pk", flat=True)
+    )
+    for job_id in job_ids:
+        run_export_job(job_id)
+    return len(job_ids)
+
+
+# -----------------------------
+# Worker del proceso
+# -----------------------------
+_lock = threading.Lock()
+_worker = None
+
+
+def get_worker():
+    global _worker
+    with _lock:
+        if _worker is None:
+            _worker = ExportWorker()
+            _worker.start()
+        return _worker
+
+
+def stop_worker():
+    """
+    Stop the process worker after the job in progress; queued jobs stay
+    pending in the database.
+    """
+    global _worker
+    with _lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.stop()
+
+
+class ExportWorker(threading.Thread):
+    """
+    Runs export jobs one at a time, off the request threads. On start it
+    also picks up jobs left pending by a previous process.
+    """
+
+    def __init__(self):
+        super().__init__(name="exports-worker", daemon=True)
+        self._queue = queue.Queue()
+
+    def enqueue(self, job_id):
+        self._queue.put(job_id)
+
+    def stop(self):
+        self._queue.put(None)
+        self.join()
+
+    def run(self):
+        try:
+            run_pending_jobs()
+        except Exception:
+            logger.exception("Export worker could not resume pending jobs")
+        finally:
+            close_old_connections()
+
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            try:
+                run_export_job(job_id)
+            except Exception:
+                logger.exception("Export job %s crashed", job_id)
+            finally:
+                close_old_connections()
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.exports.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Run pending export jobs in this process (e.g. from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            help="Seconds after which a running job is considered abandoned and rerun.",
+        )
+
+    def handle(self, *args, **options):
+        ran = run_pending_jobs(stale_after=options["stale_after"])
+        self.stdout.write(self.style.SUCCESS(f"Ran {ran} export jobs"))
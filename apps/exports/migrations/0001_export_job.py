@@ -0,0 +1,41 @@
+# Generated by Django 6.0 on 2026-10-17 21:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('readings_csv', 'Readings CSV'), ('alerts_csv', 'Alerts CSV'), ('readings_pdf', 'Readings PDF')], max_length=20, verbose_name='Export kind')),
+                ('filters', models.JSONField(blank=True, default=dict, verbose_name='Filters')),
+                ('filters_hash', models.CharField(max_length=64, verbose_name='Filters hash')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20, verbose_name='Job status')),
+                ('rows_total', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Rows to export')),
+                ('rows_done', models.PositiveBigIntegerField(default=0, verbose_name='Rows exported')),
+                ('file_name', models.CharField(blank=True, max_length=255, verbose_name='Artifact file name')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creation date')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Start date')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finish date')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Requested by')),
+            ],
+            options={
+                'verbose_name': 'Export job',
+                'verbose_name_plural': 'Export jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['kind', 'filters_hash', '-created_at'], name='export_job_reuse_idx')],
+            },
+        ),
+    ]
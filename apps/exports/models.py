@@ -1,3 +1,116 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class ExportJob(models.Model):
+    """
+    An export computed in the background and stored as a file artifact.
+    """
+
+    class Kind(models.TextChoices):
+        READINGS_CSV = "readings_csv", "Readings CSV"
+        ALERTS_CSV = "alerts_csv", "Alerts CSV"
+        READINGS_PDF = "readings_pdf", "Readings PDF"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    kind = models.CharField(
+        max_length=20,
+        choices=Kind.choices,
+        verbose_name="Export kind"
+    )
+
+    filters = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Filters"
+    )
+
+    # sha256 de los filtros canónicos: clave de reutilización junto con kind
+    filters_hash = models.CharField(
+        max_length=64,
+        verbose_name="Filters hash"
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Job status"
+    )
+
+    rows_total = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Rows to export"
+    )
+
+    rows_done = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Rows exported"
+    )
+
+    file_name = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Artifact file name"
+    )
+
+    error = models.TextField(
+        blank=True,
+        verbose_name="Error"
+    )
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="export_jobs",
+        verbose_name="Requested by"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        editable=False,
+        verbose_name="Creation date"
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Start date"
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Finish date"
+    )
+
+    class Meta:
+        verbose_name = "Export job"
+        verbose_name_plural = "Export jobs"
+        ordering = ["-created_at"]
+        # Búsqueda de un export reutilizable: mismo tipo y filtros, más reciente
+        indexes = [
+            models.Index(fields=["kind", "filters_hash", "-created_at"], name="export_job_reuse_idx"),
+        ]
+
+    def __str__(self):
+        return f"Export {self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def progress(self):
+        """
+        Fraction of rows exported, or ``None`` until the total is known.
+        """
+        if self.status == self.Status.DONE:
+            return 1.0
+        if not self.rows_total:
+            return None
+        return min(self.rows_done / self.rows_total, 1.0)
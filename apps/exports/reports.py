@@ -0,0 +1,344 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from reportlab.graphics import renderPDF
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import Table, TableStyle
+from reportlab.pdfgen import canvas
+
+from .services import apply_export_filters
+from apps.analytics.downsampling import lttb
+from apps.analytics.models import ReadingRollup
+from apps.analytics.rollups import LEVELS, plan_ranges, summarize
+from apps.core.versions import get_versions
+from apps.nodes.models import Node
+from apps.readings.models import Reading
+from apps.sensors.models import Sensor
+
+
+# Cambiar al modificar el diseño: invalida los PDF cacheados
+REPORT_VERSION = 1
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN = 40
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+
+ROWS_PER_PAGE = 40
+TABLE_HEADER = ['pk', 'Sensor', 'Nodo', 'Valor', 'Estado', 'Timestamp (UTC)']
+TABLE_COLUMNS = ('pk', 'sensor__name', 'node__name', 'value', 'validation_status', 'timestamp')
+TABLE_WIDTHS = [55, 110, 110, 60, 55, 125]
+TABLE_STYLE = TableStyle([
+    ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 8),
+    ('FONT', (0, 1), (-1, -1), 'Helvetica', 8),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('LINEBELOW', (0, 0), (-1, 0), 0.5, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.whitesmoke]),
+    ('ALIGN', (3, 1), (3, -1), 'RIGHT'),
+    ('TOPPADDING', (0, 0), (-1, -1), 2),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+])
+
+# Gráficas: la serie sale de los rollups (nunca de las lecturas crudas), con
+# la granularidad más fina que no supere CHART_MAX_BUCKETS, reducida con LTTB
+CHART_POINTS = 300
+CHART_MAX_BUCKETS = 5000
+CHART_HEIGHT = 180
+SECTIONS_PER_PAGE = 2
+
+
+class ReadingReport:
+    """
+    PDF report of the readings matching the export ``filters``: a cover
+    with the filters and totals, a summary section per sensor (statistics
+    from the rollups and a downsampled chart), and the readings as tables
+    of ``ROWS_PER_PAGE`` rows.
+
+    Readings are read with one chunked query and drawn a page at a time,
+    and summaries and charts come from the rollups, so generation time and
+    memory grow with the number of pages, not with the rows behind them.
+    """
+
+    def __init__(self, filters):
+        self.filters = filters
+        self.start = parse_datetime(filters['start']) if 'start' in filters else None
+        self.end = parse_datetime(filters['end']) if 'end' in filters else None
+        # Las tablas incluyen end (apply_export_filters); los rollups
+        # trabajan con rangos semiabiertos [start, end)
+        self._end_exclusive = self.end + timedelta(microseconds=1) if self.end is not None else None
+        self._fingerprint = None
+
+    # -----------------------------
+    # Caché
+    # -----------------------------
+
+    def fingerprint(self):
+        """
+        Row count and last id of the matching readings, which change when
+        readings are added to or removed from the report, plus the
+        collection versions of readings, sensors and nodes, which change
+        when one is edited (values, statuses, names). Two cheap queries.
+        """
+        if self._fingerprint is None:
+            readings = apply_export_filters(Reading.objects.all(), self.filters, 'timestamp')
+            self._fingerprint = readings.aggregate(count=Count('id'), last_id=Max('id'))
+            self._fingerprint['versions'] = get_versions(Reading, Sensor, Node)
+        return self._fingerprint
+
+    def cache_key(self):
+        payload = json.dumps(
+            {'version': REPORT_VERSION, 'filters': self.filters, 'data': self.fingerprint()},
+            sort_keys=True,
+            separators=(',', ':'),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    # -----------------------------
+    # Render
+    # -----------------------------
+
+    def render(self, output, progress=None):
+        """
+        Write the PDF to ``output`` (a path or binary file object), calling
+        ``progress(rows_done)`` after every table page.
+        """
+        pdf = canvas.Canvas(output, pagesize=A4)
+        pdf.setTitle("Reporte de lecturas")
+        self._page = 0
+
+        self._draw_cover(pdf)
+        self._draw_summaries(pdf)
+        self._draw_tables(pdf, progress)
+        pdf.save()
+
+    def _new_page(self, pdf):
+        if self._page:
+            pdf.showPage()
+        self._page += 1
+        pdf.setFont('Helvetica', 8)
+        pdf.drawRightString(PAGE_WIDTH - MARGIN, MARGIN / 2, f"Página {self._page}")
+        return PAGE_HEIGHT - MARGIN
+
+    def _draw_cover(self, pdf):
+        y = self._new_page(pdf)
+        pdf.setFont('Helvetica-Bold', 18)
+        pdf.drawString(MARGIN, y - 18, "Reporte de lecturas")
+
+        fingerprint = self.fingerprint()
+        lines = [
+            f"Generado: {timezone.now():%Y-%m-%d %H:%M} UTC",
+            f"Lecturas: {fingerprint['count']}",
+            f"Nodo: {self.filters.get('node_id', 'todos')}",
+            f"Sensor: {self.filters.get('sensor_id', 'todos')}",
+            f"Desde: {self.filters.get('start', '-')}",
+            f"Hasta: {self.filters.get('end', '-')}",
+        ]
+        pdf.setFont('Helvetica', 11)
+        for i, line in enumerate(lines):
+            pdf.drawString(MARGIN, y - 50 - 16 * i, line)
+
+    def _draw_summaries(self, pdf):
+        slot_height = (PAGE_HEIGHT - 2 * MARGIN) / SECTIONS_PER_PAGE
+        drawn = 0
+        for sensor in self._sensors():
+            stats = self._stats(sensor)
+            if not stats.count:
+                continue
+            if drawn % SECTIONS_PER_PAGE == 0:
+                top = self._new_page(pdf)
+            y = top - slot_height * (drawn % SECTIONS_PER_PAGE)
+            self._draw_summary(pdf, sensor, stats, y)
+            drawn += 1
+
+    def _stats(self, sensor):
+        return summarize(
+            node_id=self.filters.get('node_id'),
+            sensor_id=sensor.id,
+            start=self.start,
+            end=self._end_exclusive,
+        )
+
+    def _sensors(self):
+        sensors = Sensor.objects.select_related('node').order_by('node_id', 'id')
+        if 'sensor_id' in self.filters:
+            # Pedido explícitamente: se resume aunque esté borrado
+            return sensors.filter(id=self.filters['sensor_id'])
+        sensors = sensors.filter(is_deleted=False)
+        if 'node_id' in self.filters:
+            sensors = sensors.filter(node_id=self.filters['node_id'])
+        return sensors
+
+    def _draw_summary(self, pdf, sensor, stats, y):
+        pdf.setFont('Helvetica-Bold', 12)
+        pdf.drawString(MARGIN, y - 12, f"{sensor.name} ({sensor.sensor_type}, {sensor.unit}) - {sensor.node.name}")
+        pdf.setFont('Helvetica', 9)
+        pdf.drawString(
+            MARGIN, y - 28,
+            f"Lecturas: {stats.count}   Mín: {stats.minimum:.2f}   Máx: {stats.maximum:.2f}   "
+            f"Media: {stats.mean:.2f}   Desv.: {stats.stddev:.2f}"
+        )
+
+        x, values = self._chart_series(sensor)
+        if len(x) >= 2:
+            renderPDF.draw(_line_chart(x, values), pdf, MARGIN, y - 40 - CHART_HEIGHT)
+
+    def _chart_series(self, sensor):
+        """
+        Mean per bucket of the sensor's readings in the report range,
+        downsampled with LTTB to ``CHART_POINTS``. Returns
+        ``(epoch_seconds, values)`` arrays.
+
+        The finest granularity with at most ``CHART_MAX_BUCKETS`` buckets
+        covers the whole buckets of the range; its partial edges come from
+        finer rollups and raw readings (``plan_ranges``, as in the
+        summaries), so the chart spans the same readings as the tables.
+        """
+        filters = {'sensor_id': sensor.id}
+        if 'node_id' in self.filters:
+            filters['node_id'] = self.filters['node_id']
+
+        for level in range(len(LEVELS) - 1, -1, -1):
+            granularity, _ = LEVELS[level]
+            buckets = ReadingRollup.objects.filter(granularity=granularity, **filters)
+            buckets = _time_range(buckets, 'bucket', self.start, self._end_exclusive)
+            if level == 0 or buckets.count() <= CHART_MAX_BUCKETS:
+                break
+
+        points = []
+        for granularity, lower, upper in plan_ranges(self.start, self._end_exclusive, level):
+            if granularity is None:
+                readings = _time_range(Reading.objects.filter(**filters), 'timestamp', lower, upper)
+                rows = readings.values_list('timestamp', 'value')
+            else:
+                rollups = ReadingRollup.objects.filter(granularity=granularity, **filters)
+                rows = (
+                    _time_range(rollups, 'bucket', lower, upper)
+                    .values('bucket')
+                    .annotate(total=Sum('value_sum'), count=Sum('count'))
+                    .values_list('bucket', 'total', 'count')
+                )
+                rows = (
+                    (bucket, total / count)
+                    for bucket, total, count in rows.iterator(chunk_size=CHART_MAX_BUCKETS)
+                )
+            points.extend((timestamp.timestamp(), value) for timestamp, value in rows)
+        # Los bordes salen después del tramo central
+        points.sort()
+
+        x = np.asarray([point[0] for point in points], dtype=np.float64)
+        values = np.asarray([point[1] for point in points], dtype=np.float64)
+        indices = lttb(x, values, CHART_POINTS)
+        return x[indices], values[indices]
+
+    def _draw_tables(self, pdf, progress):
+        readings = apply_export_filters(Reading.objects.all(), self.filters, 'timestamp')
+        rows = readings.order_by('timestamp', 'id').values_list(*TABLE_COLUMNS)
+        page = []
+        done = 0
+        for row in rows.iterator(chunk_size=settings.EXPORTS_CHUNK_SIZE):
+            page.append(row)
+            if len(page) == ROWS_PER_PAGE:
+                done += self._draw_table(pdf, page)
+                page = []
+                if progress is not None:
+                    progress(done)
+        if page or not done:
+            done += self._draw_table(pdf, page)
+        if progress is not None:
+            progress(done)
+
+    def _draw_table(self, pdf, rows):
+        y = self._new_page(pdf)
+        data = [TABLE_HEADER] + [
+            [pk, sensor_name, node_name, f"{value:.2f}", validation_status, f"{timestamp:%Y-%m-%d %H:%M:%S}"]
+            for pk, sensor_name, node_name, value, validation_status, timestamp in rows
+        ]
+        table = Table(data, colWidths=TABLE_WIDTHS, repeatRows=1)
+        table.setStyle(TABLE_STYLE)
+        _, height = table.wrapOn(pdf, CONTENT_WIDTH, y - MARGIN)
+        table.drawOn(pdf, MARGIN, y - height)
+        return len(rows)
+
+
+def _time_range(queryset, field, start, end):
+    # Rango semiabierto [start, end); None deja el extremo abierto
+    if start is not None:
+        queryset = queryset.filter(**{f'{field}__gte': start})
+    if end is not None:
+        queryset = queryset.filter(**{f'{field}__lt': end})
+    return queryset
+
+
+def _line_chart(x, values):
+    drawing = Drawing(CONTENT_WIDTH, CHART_HEIGHT)
+    chart = LinePlot()
+    chart.x = 40
+    chart.y = 25
+    chart.width = CONTENT_WIDTH - 50
+    chart.height = CHART_HEIGHT - 35
+    chart.data = [list(zip(x.tolist(), values.tolist()))]
+    chart.lines[0].strokeColor = colors.steelblue
+    chart.lines[0].strokeWidth = 1
+    chart.xValueAxis.valueMin = float(x[0])
+    chart.xValueAxis.valueMax = float(x[-1])
+    chart.xValueAxis.labelTextFormat = _axis_date
+    chart.xValueAxis.labels.fontSize = 7
+    chart.yValueAxis.labels.fontSize = 7
+    drawing.add(chart)
+    return drawing
+
+
+def _axis_date(epoch):
+    return datetime.fromtimestamp(epoch, dt_timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+
+# -----------------------------
+# Caché en disco
+# -----------------------------
+
+def cached_report(filters):
+    """
+    Path of the PDF report for ``filters``, rendered only if no report with
+    the same parameters and data fingerprint is cached. Cached reports older
+    than EXPORTS_REPORT_CACHE_MAX_AGE are pruned when a new one is rendered.
+    """
+    report = ReadingReport(filters)
+    directory = Path(settings.EXPORTS_DIR) / 'reports'
+    path = directory / f"{report.cache_key()}.pdf"
+    if path.exists():
+        return path
+
+    directory.mkdir(parents=True, exist_ok=True)
+    _prune(directory)
+    # Fichero temporal único: dos peticiones iguales no pisan su escritura
+    fd, partial = tempfile.mkstemp(dir=directory, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as output:
+            report.render(output)
+        os.replace(partial, path)
+    except BaseException:
+        Path(partial).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def _prune(directory):
+    cutoff = time.time() - settings.EXPORTS_REPORT_CACHE_MAX_AGE
+    for cached in directory.glob('*.pdf'):
+        try:
+            if cached.stat().st_mtime < cutoff:
+                cached.unlink()
+        except FileNotFoundError:
+            pass
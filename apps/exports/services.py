@@ -0,0 +1,228 @@
+import csv
+import zipfile
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from io import StringIO
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from apps.alerts.models import Alert
+from apps.readings.models import Reading
+
+
+# -----------------------------
+# Filtros
+# -----------------------------
+
+def parse_export_filters(params):
+    """
+    Validate the export filters (node_id, sensor_id, start, end) from query
+    params or a request body. Returns ``(filters, error)``; ``filters`` is a
+    canonical JSON-serializable dict (ids as int, bounds as UTC ISO 8601),
+    so equal filter sets compare and hash equal.
+    """
+    filters = {}
+    for param in ('node_id', 'sensor_id'):
+        value = params.get(param)
+        if value in (None, ''):
+            continue
+        value = str(value)
+        if not value.isdigit():
+            return None, f"{param} must be an integer"
+        filters[param] = int(value)
+
+    for param in ('start', 'end'):
+        value = params.get(param)
+        if value in (None, ''):
+            continue
+        bound = _parse_bound(str(value))
+        if bound is None:
+            return None, f"Invalid {param}"
+        filters[param] = bound.astimezone(dt_timezone.utc).isoformat()
+
+    return filters, None
+
+
+def _parse_bound(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def apply_export_filters(queryset, filters, time_field):
+    for param in ('node_id', 'sensor_id'):
+        if param in filters:
+            queryset = queryset.filter(**{param: filters[param]})
+    if 'start' in filters:
+        queryset = queryset.filter(**{f'{time_field}__gte': parse_datetime(filters['start'])})
+    if 'end' in filters:
+        queryset = queryset.filter(**{f'{time_field}__lte': parse_datetime(filters['end'])})
+    return queryset
+
+
+# -----------------------------
+# Filas exportadas (nombres ya unidos, sin instancias)
+# -----------------------------
+
+READING_CSV_HEADER = ['pk', 'Sensor', 'Nodo', 'Valor', 'Timestamp']
+READING_COLUMNS = ('pk', 'sensor__name', 'node__name', 'value', 'timestamp')
+
+ALERT_CSV_HEADER = ['pk', 'Sensor', 'Nodo', 'Tipo alerta', 'Valor', 'Timestamp', 'Estado']
+ALERT_COLUMNS = ('pk', 'sensor__name', 'node__name', 'alert_type', 'detected_value', 'created_at', 'status')
+
+
+def reading_rows(filters):
+    readings = apply_export_filters(Reading.objects.all(), filters, 'timestamp')
+    return readings.order_by('timestamp', 'id').values_list(*READING_COLUMNS)
+
+
+def alert_rows(filters):
+    # Alert no tiene timestamp: se filtra y exporta created_at
+    alerts = apply_export_filters(Alert.objects.all(), filters, 'created_at')
+    return alerts.order_by('created_at', 'id').values_list(*ALERT_COLUMNS)
+
+
+# -----------------------------
+# Escritura por bloques
+# -----------------------------
+
+def iter_csv_chunks(header, rows):
+    """
+    Encode ``rows`` (a values_list queryset) as CSV, reading it with one
+    query in chunks of EXPORTS_CHUNK_SIZE rows. Yields ``(text, row_count)``
+    per chunk; the first chunk also carries the header.
+    """
+    chunk_size = settings.EXPORTS_CHUNK_SIZE
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    pending = 0
+    for row in rows.iterator(chunk_size=chunk_size):
+        writer.writerow(row)
+        pending += 1
+        if pending == chunk_size:
+            yield buffer.getvalue(), pending
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue(), pending
+
+
+# -----------------------------
+# Export columnar NumPy (.npz)
+# -----------------------------
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+ONE_MILLISECOND = timedelta(milliseconds=1)
+
+# validation_status -> uint8: índice en esta tupla (se incluye en el .npz)
+NPZ_STATUS_LABELS = tuple(Reading.ValidationStatus.values)
+
+
+def iter_npz_chunks(filters):
+    """
+    Encode the filtered readings as a compressed ``.npz`` with one set of
+    columns per sensor: ``sensor_<id>_timestamp_ms`` (int64 epoch ms),
+    ``sensor_<id>_value`` (float64) and ``sensor_<id>_status`` (uint8
+    index into ``status_labels``), plus ``sensor_ids``. Loads with
+    ``np.load(..., allow_pickle=False)``.
+
+    Readings are read with one query in ``(sensor, timestamp)`` order, in
+    chunks of EXPORTS_CHUNK_SIZE ``values_list`` rows, and each sensor's
+    columns are written as soon as the sensor is complete. Yields the
+    archive's bytes as they are produced; memory holds one sensor's columns.
+    """
+    readings = apply_export_filters(Reading.objects.all(), filters, 'timestamp')
+    rows = readings.order_by('sensor_id', 'timestamp').values_list(
+        'sensor_id', 'timestamp', 'value', 'validation_status'
+    )
+    status_codes = {label: code for code, label in enumerate(NPZ_STATUS_LABELS)}
+
+    chunk_size = settings.EXPORTS_CHUNK_SIZE
+    stream = _ZipStream()
+    archive = zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+    sensor_ids = []
+    columns = None
+    for sensor_id, timestamp, value, validation_status in rows.iterator(chunk_size=chunk_size):
+        if columns is None or sensor_id != columns.sensor_id:
+            if columns is not None:
+                columns.write(archive)
+                yield stream.drain()
+            columns = _SensorColumns(sensor_id, chunk_size)
+            sensor_ids.append(sensor_id)
+        columns.append((timestamp - EPOCH) // ONE_MILLISECOND, value, status_codes[validation_status])
+
+    if columns is not None:
+        columns.write(archive)
+    _write_array(archive, 'sensor_ids', np.asarray(sensor_ids, dtype=np.int64))
+    _write_array(archive, 'status_labels', np.asarray(NPZ_STATUS_LABELS))
+    archive.close()
+    yield stream.drain()
+
+
+class _SensorColumns:
+    """
+    Columns of one sensor. Rows are buffered as Python values only up to
+    ``chunk_size`` and then packed into typed arrays.
+    """
+    COLUMNS = (('timestamp_ms', np.int64), ('value', np.float64), ('status', np.uint8))
+
+    def __init__(self, sensor_id, chunk_size):
+        self.sensor_id = sensor_id
+        self.chunk_size = chunk_size
+        self._pending = ([], [], [])
+        self._packed = ([], [], [])
+
+    def append(self, *row):
+        for column, value in zip(self._pending, row):
+            column.append(value)
+        if len(self._pending[0]) == self.chunk_size:
+            self._pack()
+
+    def _pack(self):
+        for pending, packed, (_, dtype) in zip(self._pending, self._packed, self.COLUMNS):
+            packed.append(np.asarray(pending, dtype=dtype))
+            pending.clear()
+
+    def write(self, archive):
+        self._pack()
+        for packed, (name, dtype) in zip(self._packed, self.COLUMNS):
+            _write_array(archive, f'sensor_{self.sensor_id}_{name}', np.concatenate(packed).astype(dtype, copy=False))
+
+
+def _write_array(archive, name, array):
+    # Igual que np.savez_compressed, miembro a miembro
+    with archive.open(f'{name}.npy', mode='w', force_zip64=True) as member:
+        np.lib.format.write_array(member, array, allow_pickle=False)
+
+
+class _ZipStream:
+    """
+    Write-only, unseekable file object: zipfile then writes the archive
+    sequentially (with data descriptors), and the bytes written so far can
+    be handed to the response with ``drain()``.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
@@ -1,24 +1,47 @@
 # apps/exports/tests/test_views.py
 # py .\manage.py test apps.exports.tests.test_views
 
-from django.test import TestCase
+import re
+import shutil
+import tempfile
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
-from io import StringIO
+from io import BytesIO, StringIO
 import csv
 
+import numpy as np
+
 from apps.users.models import User
 from apps.nodes.models import Node
 from apps.sensors.models import Sensor
 from apps.readings.models import Reading
+from apps.readings.services import ON_CONFLICT_UPDATE, ingest_readings
 from apps.alerts.models import Alert
+from apps.exports.jobs import get_worker, stop_worker
+from apps.exports.models import ExportJob
+from apps.exports.reports import ReadingReport
+from apps.analytics.rollups import rebuild_all_rollups
+
+
+def use_temporary_exports_dir(test):
+    """Los artefactos y reportes cacheados van a un directorio temporal"""
+    directory = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+    settings_override = override_settings(EXPORTS_DIR=directory)
+    settings_override.enable()
+    test.addCleanup(settings_override.disable)
 
 
 class ExportTests(TestCase):
     """Tests básicos para vistas de exportación"""
     
     def setUp(self):
+        use_temporary_exports_dir(self)
         self.admin = User.objects.create_user(
             email="admin@test.com",
             password="adminpass123",
@@ -45,7 +68,13 @@ class ExportTests(TestCase):
                             alert_type=Alert.AlertType.HIGH, detected_value=30.0,
                             status=Alert.AlertStatus.PENDING)
         
+        self.node = node
+        self.sensor = sensor
         self.client = APIClient()
+
+    def read_csv(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
     
     # --------------------------------------------------
     # TESTS CSV
@@ -60,8 +89,8 @@ class ExportTests(TestCase):
         self.assertEqual(response['Content-Type'], 'text/csv')
         self.assertIn('attachment; filename="readings.csv"', response['Content-Disposition'])
         
-        # Verificar contenido CSV
-        content = response.content.decode('utf-8')
+        # Verificar contenido CSV (respuesta en streaming)
+        content = self.read_csv(response)
         self.assertIn('pk,Sensor,Nodo,Valor,Timestamp', content)
         self.assertIn('Test Sensor', content)
     
@@ -107,7 +136,7 @@ class ExportTests(TestCase):
         response = self.client.get(reverse('export-readings-csv'))
         
         # Parsear CSV
-        csv_data = response.content.decode('utf-8').splitlines()
+        csv_data = self.read_csv(response).splitlines()
         reader = csv.reader(csv_data)
         rows = list(reader)
         
@@ -115,4 +144,362 @@ class ExportTests(TestCase):
         self.assertEqual(rows[0], ['pk', 'Sensor', 'Nodo', 'Valor', 'Timestamp'])
         
         # Verificar al menos una fila de datos
-        self.assertTrue(len(rows) > 1)
\ No newline at end of file
+        self.assertTrue(len(rows) > 1)
+
+    def test_7_csv_filters_by_node_sensor_and_time(self):
+        """7. El CSV filtra por nodo, sensor y rango de tiempo"""
+        other = Sensor.objects.create(node=self.node, name="Other Sensor",
+                                      sensor_type=Sensor.SensorTypes.HUMIDITY,
+                                      model="DHT22", unit="%")
+        Reading.objects.create(sensor=other, node=self.node, value=60.0,
+                               timestamp="2024-01-02T10:00:00Z")
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('export-readings-csv')
+
+        rows = list(csv.reader(self.read_csv(self.client.get(url, {'node_id': self.node.id})).splitlines()))
+        self.assertEqual([row[1] for row in rows[1:]], ['Test Sensor', 'Other Sensor'])
+
+        rows = list(csv.reader(self.read_csv(self.client.get(url, {'sensor_id': other.id})).splitlines()))
+        self.assertEqual([row[1] for row in rows[1:]], ['Other Sensor'])
+
+        rows = list(csv.reader(self.read_csv(self.client.get(url, {'start': '2024-01-02'})).splitlines()))
+        self.assertEqual([row[3] for row in rows[1:]], ['60.0'])
+
+        rows = list(csv.reader(self.read_csv(
+            self.client.get(reverse('export-alerts-csv'), {'end': '2000-01-01'})
+        ).splitlines()))
+        self.assertEqual(rows, [['pk', 'Sensor', 'Nodo', 'Tipo alerta', 'Valor', 'Timestamp', 'Estado']])
+
+        response = self.client.get(url, {'start': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'node_id': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(EXPORTS_CHUNK_SIZE=10)
+    def test_8_csv_uses_one_query_in_chunks(self):
+        """8. El CSV se genera con una sola consulta y por bloques, sin N+1"""
+        Reading.objects.bulk_create(
+            Reading(sensor=self.sensor, node=self.node, value=float(n),
+                    timestamp=f"2024-02-01T10:{n // 60:02d}:{n % 60:02d}Z")
+            for n in range(25)
+        )
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('export-readings-csv'))
+
+        with self.assertNumQueries(1):
+            chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(len(b''.join(chunks).decode('utf-8').splitlines()), 27)
+
+
+@override_settings(EXPORTS_CHUNK_SIZE=3)
+class ExportNpzTests(TestCase):
+    """Tests para el export columnar NumPy (.npz)"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass123",
+            role=User.Roles.ADMIN
+        )
+        self.node = Node.objects.create(name="Test Node", location="Test", user=self.admin)
+        self.other_node = Node.objects.create(name="Other Node", location="Test", user=self.admin)
+        self.sensor = Sensor.objects.create(node=self.node, name="Test Sensor",
+                                            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+                                            model="DHT22", unit="°C")
+        self.other = Sensor.objects.create(node=self.other_node, name="Other Sensor",
+                                           sensor_type=Sensor.SensorTypes.HUMIDITY,
+                                           model="DHT22", unit="%")
+        statuses = ['valid', 'high', 'low']
+        Reading.objects.bulk_create(
+            Reading(sensor=self.sensor, node=self.node, value=20.0 + n,
+                    timestamp=f"2024-01-01T10:{n:02d}:00.250Z", validation_status=statuses[n % 3])
+            for n in range(7)
+        )
+        Reading.objects.create(sensor=self.other, node=self.other_node, value=55.5,
+                               timestamp="2024-01-02T00:00:00Z")
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def load(self, params=None):
+        response = self.client.get(reverse('export-readings-npz'), params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('readings.npz', response['Content-Disposition'])
+        return np.load(BytesIO(b''.join(response.streaming_content)), allow_pickle=False)
+
+    def test_1_columns_per_sensor(self):
+        """1. Columnas tipadas por sensor con timestamps en ms y estado codificado"""
+        with self.assertNumQueries(1):
+            data = self.load()
+        self.assertEqual(data['sensor_ids'].tolist(), [self.sensor.id, self.other.id])
+
+        prefix = f'sensor_{self.sensor.id}'
+        timestamps = data[f'{prefix}_timestamp_ms']
+        self.assertEqual(timestamps.dtype, np.int64)
+        self.assertEqual(timestamps[0], 1704103200250)  # 2024-01-01T10:00:00.250Z
+        self.assertEqual(np.diff(timestamps).tolist(), [60_000] * 6)
+        self.assertEqual(data[f'{prefix}_value'].dtype, np.float64)
+        self.assertEqual(data[f'{prefix}_value'].tolist(), [20.0 + n for n in range(7)])
+
+        labels = data['status_labels']
+        statuses = data[f'{prefix}_status']
+        self.assertEqual(statuses.dtype, np.uint8)
+        self.assertEqual(labels[statuses].tolist()[:3], ['valid', 'high', 'low'])
+
+    def test_2_uses_the_export_filters(self):
+        """2. Filtra por nodo, sensor y tiempo como los demás exports"""
+        data = self.load({'node_id': self.other_node.id})
+        self.assertEqual(data['sensor_ids'].tolist(), [self.other.id])
+
+        data = self.load({'sensor_id': self.sensor.id, 'start': '2024-01-01T10:05:00Z'})
+        self.assertEqual(data[f'sensor_{self.sensor.id}_value'].tolist(), [25.0, 26.0])
+
+        data = self.load({'end': '2000-01-01'})
+        self.assertEqual(data['sensor_ids'].tolist(), [])
+
+        response = self.client.get(reverse('export-readings-npz'), {'sensor_id': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ExportJobTestMixin:
+    """Datos y directorio de artefactos temporales para los export jobs"""
+
+    def setUp(self):
+        use_temporary_exports_dir(self)
+
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass123",
+            role=User.Roles.ADMIN
+        )
+        self.node = Node.objects.create(name="Test Node", location="Test", user=self.admin)
+        self.sensor = Sensor.objects.create(node=self.node, name="Test Sensor",
+                                            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+                                            model="DHT22", unit="°C")
+        for n in range(5):
+            Reading.objects.create(sensor=self.sensor, node=self.node, value=20.0 + n,
+                                   timestamp=f"2024-01-01T10:0{n}:00Z")
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def download(self, job_id):
+        response = self.client.get(reverse('export-job-download', args=[job_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content)
+
+
+@override_settings(EXPORTS_RUN_INLINE=True, EXPORTS_CHUNK_SIZE=2)
+class ExportJobTests(ExportJobTestMixin, TestCase):
+    """Tests para los export jobs (ejecutados dentro de la petición)"""
+
+    def test_1_job_writes_a_downloadable_artifact(self):
+        """1. Un job CSV termina con progreso completo y su fichero se descarga"""
+        response = self.client.post(reverse('export-job-create'), {
+            'kind': 'readings_csv', 'start': '2024-01-01T10:01:00Z'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'done')
+        self.assertEqual((response.data['rows_done'], response.data['rows_total']), (4, 4))
+        self.assertEqual(response.data['progress'], 1.0)
+        self.assertTrue(response.data['download_url'].endswith(
+            reverse('export-job-download', args=[response.data['id']])
+        ))
+
+        rows = list(csv.reader(self.download(response.data['id']).decode('utf-8').splitlines()))
+        self.assertEqual(rows[0], ['pk', 'Sensor', 'Nodo', 'Valor', 'Timestamp'])
+        self.assertEqual([row[3] for row in rows[1:]], ['21.0', '22.0', '23.0', '24.0'])
+
+    def test_2_same_filters_reuse_the_artifact(self):
+        """2. Los mismos filtros dentro de la ventana reutilizan el job"""
+        url = reverse('export-job-create')
+        first = self.client.post(url, {'kind': 'readings_pdf', 'sensor_id': self.sensor.id}, format='json')
+        again = self.client.post(url, {'kind': 'readings_pdf', 'sensor_id': str(self.sensor.id)}, format='json')
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertTrue(again.data['reused'])
+        self.assertEqual(again.data['id'], first.data['id'])
+        self.assertTrue(self.download(first.data['id']).startswith(b'%PDF'))
+
+        other = self.client.post(url, {'kind': 'alerts_csv', 'sensor_id': self.sensor.id}, format='json')
+        self.assertEqual(other.status_code, status.HTTP_202_ACCEPTED)
+
+        with override_settings(EXPORTS_REUSE_WINDOW=0):
+            fresh = self.client.post(url, {'kind': 'readings_pdf', 'sensor_id': self.sensor.id}, format='json')
+        self.assertNotEqual(fresh.data['id'], first.data['id'])
+        self.assertEqual(ExportJob.objects.count(), 3)
+
+    def test_3_invalid_requests_and_unfinished_jobs(self):
+        """3. Tipo o filtros inválidos dan 400 y un job sin terminar no se descarga"""
+        url = reverse('export-job-create')
+        self.assertEqual(self.client.post(url, {'kind': 'xlsx'}, format='json').status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, {'kind': 'readings_csv', 'end': 'soon'}, format='json').status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+        job = ExportJob.objects.create(kind='readings_csv', filters={}, filters_hash='x')
+        response = self.client.get(reverse('export-job-detail', args=[job.id]))
+        self.assertEqual((response.data['status'], response.data['progress']), ('pending', None))
+        response = self.client.get(reverse('export-job-download', args=[job.id]))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response = self.client.get(reverse('export-job-detail', args=[job.id + 1]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ExportWorkerTests(ExportJobTestMixin, TransactionTestCase):
+    """El worker en segundo plano ejecuta los jobs fuera de la petición"""
+
+    def setUp(self):
+        super().setUp()
+        stop_worker()
+        self.addCleanup(stop_worker)
+
+    def test_1_worker_runs_submitted_jobs(self):
+        """1. El POST responde pending y el worker deja el artefacto listo"""
+        response = self.client.post(reverse('export-job-create'), {'kind': 'alerts_csv'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        stop_worker()  # espera al job en curso
+        job = ExportJob.objects.get(pk=response.data['id'])
+        self.assertEqual(job.status, ExportJob.Status.DONE)
+        self.assertEqual(self.download(job.id).decode('utf-8').splitlines(),
+                         ['pk,Sensor,Nodo,Tipo alerta,Valor,Timestamp,Estado'])
+
+    def test_2_worker_resumes_pending_jobs(self):
+        """2. Al arrancar, el worker retoma los jobs pendientes"""
+        job = ExportJob.objects.create(kind='readings_csv', filters={'node_id': self.node.id}, filters_hash='x')
+        get_worker()
+        stop_worker()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.rows_done), (ExportJob.Status.DONE, 5))
+
+
+@override_settings(EXPORTS_CHUNK_SIZE=7)
+class ReadingReportTests(ExportJobTestMixin, TestCase):
+    """Tests para el motor de reportes PDF"""
+
+    def render(self, filters):
+        output = BytesIO()
+        progress = []
+        ReadingReport(filters).render(output, progress.append)
+        return output.getvalue(), progress
+
+    def count_pages(self, pdf):
+        return len(re.findall(rb'/Type /Page\b(?!s)', pdf))
+
+    def test_1_report_has_cover_summaries_and_table_pages(self):
+        """1. Portada, una sección por sensor y páginas de tabla según las filas"""
+        other = Sensor.objects.create(node=self.node, name="Other Sensor",
+                                      sensor_type=Sensor.SensorTypes.HUMIDITY,
+                                      model="DHT22", unit="%")
+        Reading.objects.bulk_create(
+            Reading(sensor=other, node=self.node, value=50.0,
+                    timestamp=f"2024-01-02T{n // 60:02d}:{n % 60:02d}:00Z")
+            for n in range(80)
+        )
+        rebuild_all_rollups()
+
+        pdf, progress = self.render({})
+        self.assertTrue(pdf.startswith(b'%PDF'))
+        # portada + 1 página de resúmenes (2 sensores) + 85 filas / 40 por página
+        self.assertEqual(self.count_pages(pdf), 1 + 1 + 3)
+        self.assertEqual(progress, [40, 80, 85])
+
+        pdf, progress = self.render({'sensor_id': self.sensor.id})
+        self.assertEqual(self.count_pages(pdf), 1 + 1 + 1)
+        self.assertEqual(progress, [5])
+
+    def test_2_queries_do_not_grow_with_rows(self):
+        """2. El número de consultas no depende del número de lecturas"""
+        rebuild_all_rollups()
+        with CaptureQueriesContext(connection) as few:
+            self.render({})
+
+        Reading.objects.bulk_create(
+            Reading(sensor=self.sensor, node=self.node, value=float(n),
+                    timestamp=f"2024-03-01T{n // 60:02d}:{n % 60:02d}:00Z")
+            for n in range(200)
+        )
+        rebuild_all_rollups()
+        with CaptureQueriesContext(connection) as many:
+            self.render({})
+        self.assertEqual(len(many), len(few))
+
+    def test_3_pdf_endpoint_caches_by_parameters_and_data(self):
+        """3. El PDF se cachea por filtros y datos, y se regenera si cambian"""
+        url = reverse('export-readings-pdf')
+        first = self.client.get(url, {'sensor_id': self.sensor.id})
+        self.assertEqual(first['Content-Type'], 'application/pdf')
+        first_pdf = b''.join(first.streaming_content)
+
+        with CaptureQueriesContext(connection) as cached:
+            again = b''.join(self.client.get(url, {'sensor_id': str(self.sensor.id)}).streaming_content)
+        self.assertEqual(again, first_pdf)
+        self.assertEqual(len(cached), 2)  # sólo la huella de los datos y las versiones
+
+        Reading.objects.create(sensor=self.sensor, node=self.node, value=30.0,
+                               timestamp="2024-01-01T11:00:00Z")
+        fresh = b''.join(self.client.get(url, {'sensor_id': self.sensor.id}).streaming_content)
+        self.assertNotEqual(fresh, first_pdf)
+
+    def test_4_pdf_is_regenerated_when_readings_or_names_change(self):
+        """4. Editar una lectura (PATCH o upsert) o renombrar el sensor invalida el PDF"""
+        url = reverse('export-readings-pdf')
+        params = {'sensor_id': self.sensor.id}
+        versions = [b''.join(self.client.get(url, params).streaming_content)]
+
+        reading = Reading.objects.filter(sensor=self.sensor).first()
+        response = self.client.patch(reverse('reading-detail', args=[reading.id]), {'value': 99.5}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        versions.append(b''.join(self.client.get(url, params).streaming_content))
+
+        ingest_readings([{"sensor_id": self.sensor.id, "node_id": self.node.id, "value": -1.0,
+                          "timestamp": reading.timestamp, "validation_status": "valid"}],
+                        on_conflict=ON_CONFLICT_UPDATE)
+        versions.append(b''.join(self.client.get(url, params).streaming_content))
+
+        self.sensor.name = "Renamed Sensor"
+        self.sensor.save()
+        versions.append(b''.join(self.client.get(url, params).streaming_content))
+
+        # Cada cambio genera un PDF nuevo en lugar de servir el cacheado
+        self.assertEqual(len(set(versions)), 4)
+
+    def test_5_summary_counts_the_same_readings_as_the_tables(self):
+        """5. Una lectura justo en end cuenta en el resumen igual que en las tablas"""
+        rebuild_all_rollups()
+        filters = {'start': '2024-01-01T10:01:00Z', 'end': '2024-01-01T10:04:00Z'}
+
+        _, progress = self.render(filters)
+        stats = ReadingReport(filters)._stats(self.sensor)
+        self.assertEqual(progress, [4])
+        self.assertEqual(stats.count, 4)
+        self.assertEqual(stats.maximum, 24.0)
+
+
+    def test_6_chart_covers_the_same_range_as_the_tables(self):
+        """6. La gráfica incluye los buckets parciales de los bordes, sin pasarse de end"""
+        for timestamp, value in (("2024-01-01T10:00:45Z", 30.0), ("2024-01-01T10:03:30Z", 40.0)):
+            Reading.objects.create(sensor=self.sensor, node=self.node, value=value, timestamp=timestamp)
+        rebuild_all_rollups()
+        filters = {'start': '2024-01-01T10:00:30Z', 'end': '2024-01-01T10:03:00Z'}
+
+        x, values = ReadingReport(filters)._chart_series(self.sensor)
+        readings = Reading.objects.filter(timestamp__gte='2024-01-01T10:00:30Z', timestamp__lte='2024-01-01T10:03:00Z')
+        self.assertEqual(list(values), list(readings.order_by('timestamp').values_list('value', flat=True)))
+        self.assertEqual(list(values), [30.0, 21.0, 22.0, 23.0])
+        self.assertEqual(x[0], Reading.objects.get(value=30.0).timestamp.timestamp())
+
+    def test_7_deleted_sensors_have_no_summary_with_or_without_node_filter(self):
+        """7. Un sensor borrado no tiene sección de resumen, filtrando por nodo o sin filtrar"""
+        deleted = Sensor.objects.create(node=self.node, name="Deleted Sensor",
+                                        sensor_type=Sensor.SensorTypes.HUMIDITY,
+                                        model="DHT22", unit="%")
+        Reading.objects.create(sensor=deleted, node=self.node, value=50.0, timestamp="2024-01-01T11:00:00Z")
+        deleted.delete()
+        rebuild_all_rollups()
+
+        for filters in ({}, {'node_id': self.node.id}):
+            report = ReadingReport(filters)
+            self.assertEqual([sensor.id for sensor in report._sensors()], [self.sensor.id], filters)
+        self.assertEqual([s.id for s in ReadingReport({'sensor_id': deleted.id})._sensors()], [deleted.id])
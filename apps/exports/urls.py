@@ -4,5 +4,9 @@ from . import views
 urlpatterns = [
     path('readings/csv/', views.export_readings_csv, name='export-readings-csv'),
     path('alerts/csv/', views.export_alerts_csv, name='export-alerts-csv'),
+    path('readings/npz/', views.export_readings_npz, name='export-readings-npz'),
     path('readings/pdf/', views.export_readings_pdf, name='export-readings-pdf'),
+    path('jobs/', views.export_job_create, name='export-job-create'),
+    path('jobs/<int:pk>/', views.export_job_detail, name='export-job-detail'),
+    path('jobs/<int:pk>/download/', views.export_job_download, name='export-job-download'),
 ]
@@ -1,12 +1,22 @@
-import csv
-from io import StringIO, BytesIO
-from django.http import HttpResponse
+from django.http import FileResponse, StreamingHttpResponse
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from apps.readings.models import Reading
-from apps.alerts.models import Alert
 from apps.core.permissions import IsAdminOrReadOnly
-from reportlab.pdfgen import canvas
+from .jobs import EXPORT_FORMATS, artifact_path, submit_export
+from .models import ExportJob
+from .serializers import ExportJobSerializer
+from .services import (
+    ALERT_CSV_HEADER,
+    READING_CSV_HEADER,
+    alert_rows,
+    iter_csv_chunks,
+    iter_npz_chunks,
+    parse_export_filters,
+    reading_rows,
+)
+from .reports import cached_report
 
 # -----------------------------
 # Export CSV
@@ -15,46 +25,59 @@ from reportlab.pdfgen import canvas
 @api_view(['GET'])
 @permission_classes([IsAdminOrReadOnly])
 def export_readings_csv(request):
-    # CORREGIDO: Eliminar .filter(is_deleted=False) - Reading no tiene ese campo
-    readings = Reading.objects.all()  # <-- CAMBIADO
-    
-    # opcional: filtrar por sensor, nodo, fechas
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['pk', 'Sensor', 'Nodo', 'Valor', 'Timestamp'])
-    for r in readings:
-        writer.writerow([r.pk, r.sensor.name, r.node.name, r.value, r.timestamp])
-    response = HttpResponse(output.getvalue(), content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="readings.csv"'
-    return response
+    """
+    Stream readings as CSV in chronological order.
+    Query params: node_id, sensor_id, start, end (YYYY-MM-DD o ISO 8601).
+    """
+    filters, error = parse_export_filters(request.query_params)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+    return _csv_response(READING_CSV_HEADER, reading_rows(filters), 'readings.csv')
 
 
 @api_view(['GET'])
 @permission_classes([IsAdminOrReadOnly])
 def export_alerts_csv(request):
-    # CORREGIDO: Eliminar .filter(is_deleted=False) - Alert no tiene ese campo
-    alerts = Alert.objects.all()  # <-- CAMBIADO
-    
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['pk', 'Sensor', 'Nodo', 'Tipo alerta', 'Valor', 'Timestamp', 'Estado'])
-    
-    # CORREGIDO: Alert tiene 'detected_value', no 'timestamp'. Usar 'created_at' en su lugar
-    for a in alerts:
-        writer.writerow([
-            a.pk, 
-            a.sensor.name, 
-            a.node.name, 
-            a.alert_type, 
-            a.detected_value, 
-            a.created_at,  # <-- CAMBIADO: Alert no tiene timestamp, usar created_at
-            a.status
-        ])
-    
-    response = HttpResponse(output.getvalue(), content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="alerts.csv"'
+    """
+    Stream alerts as CSV in creation order.
+    Query params: node_id, sensor_id, start, end (filtran por created_at).
+    """
+    filters, error = parse_export_filters(request.query_params)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+    return _csv_response(ALERT_CSV_HEADER, alert_rows(filters), 'alerts.csv')
+
+
+def _csv_response(header, rows, filename):
+    """
+    Stream ``rows`` as CSV: one query read in chunks of EXPORTS_CHUNK_SIZE
+    rows, each chunk encoded and sent before the next is fetched.
+    """
+    chunks = (text for text, _ in iter_csv_chunks(header, rows))
+    response = StreamingHttpResponse(chunks, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
+# -----------------------------
+# Export NumPy (.npz)
+# -----------------------------
+
+@api_view(['GET'])
+@permission_classes([IsAdminOrReadOnly])
+def export_readings_npz(request):
+    """
+    Stream readings as compressed NumPy columns per sensor (see
+    ``iter_npz_chunks``). Same filters as the CSV export.
+    """
+    filters, error = parse_export_filters(request.query_params)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(iter_npz_chunks(filters), content_type='application/octet-stream')
+    response['Content-Disposition'] = 'attachment; filename="readings.npz"'
+    return response
+
+
 # -----------------------------
 # Export PDF (simple)
 # -----------------------------
@@ -62,21 +85,85 @@ def export_alerts_csv(request):
 @api_view(['GET'])
 @permission_classes([IsAdminOrReadOnly])
 def export_readings_pdf(request):
-    # CORREGIDO: Eliminar .filter(is_deleted=False)
-    readings = Reading.objects.all()  # <-- CAMBIADO
-    
-    buffer = BytesIO()
-    p = canvas.Canvas(buffer)
-    y = 800
-    p.drawString(100, y, "Listado de Lecturas")
-    y -= 30
-    for r in readings:
-        line = f"{r.pk} | {r.sensor.name} | {r.node.name} | {r.value} | {r.timestamp}"
-        p.drawString(50, y, line)
-        y -= 20
-        if y < 50:
-            p.showPage()
-            y = 800
-    p.save()
-    buffer.seek(0)
-    return HttpResponse(buffer, content_type='application/pdf')
\ No newline at end of file
+    filters, error = parse_export_filters(request.query_params)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Mismo reporte y mismos datos: se sirve el PDF cacheado
+    return FileResponse(
+        open(cached_report(filters), 'rb'),
+        filename='readings.pdf',
+        content_type='application/pdf'
+    )
+
+
+# -----------------------------
+# Export jobs en segundo plano
+# -----------------------------
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def export_job_create(request):
+    """
+    Submit a background export. Body: ``kind`` (readings_csv, alerts_csv,
+    readings_pdf) plus the export filters (node_id, sensor_id, start, end).
+    Returns 202 with the new job, or 200 with a job for the same kind and
+    filters submitted within EXPORTS_REUSE_WINDOW seconds.
+    """
+    kind = request.data.get('kind')
+    if kind not in ExportJob.Kind.values:
+        return Response(
+            {"error": f"kind must be one of: {', '.join(ExportJob.Kind.values)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    filters, error = parse_export_filters(request.data)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    job, reused = submit_export(kind, filters, request.user)
+    serializer = ExportJobSerializer(job, context={'request': request})
+    return Response(
+        {**serializer.data, "reused": reused},
+        status=status.HTTP_200_OK if reused else status.HTTP_202_ACCEPTED
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_job_detail(request, pk):
+    """
+    Status and progress of an export job.
+    """
+    try:
+        job = ExportJob.objects.get(pk=pk)
+    except ExportJob.DoesNotExist:
+        return Response({"error": "Export job not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(ExportJobSerializer(job, context={'request': request}).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_job_download(request, pk):
+    """
+    Download the artifact of a finished export job.
+    """
+    try:
+        job = ExportJob.objects.get(pk=pk)
+    except ExportJob.DoesNotExist:
+        return Response({"error": "Export job not found"}, status=status.HTTP_404_NOT_FOUND)
+    if job.status != ExportJob.Status.DONE:
+        return Response(
+            {"error": f"Export job is {job.status}"},
+            status=status.HTTP_409_CONFLICT
+        )
+    path = artifact_path(job)
+    if not path.exists():
+        return Response({"error": "Export artifact no longer exists"}, status=status.HTTP_410_GONE)
+
+    _, extension, content_type = EXPORT_FORMATS[job.kind]
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=f"{job.kind}-{job.pk}.{extension}",
+        content_type=content_type
+    )
@@ -1,7 +1,8 @@
-from django.db.models.signals import pre_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from .models import Node
+from apps.core.versions import bump_version
 
 User = get_user_model()
 
@@ -10,3 +11,11 @@ def soft_delete_user_nodes(sender, instance, **kwargs):
     nodes = Node.objects.filter(user=instance, is_deleted=False)
     for node in nodes:
         node.delete()
+
+
+# Versión de la colección para los GET condicionales (ETag) de nodos:
+# altas, ediciones y borrados lógicos pasan por save()
+@receiver(post_save, sender=Node)
+@receiver(post_delete, sender=Node)
+def bump_nodes_version(sender, **kwargs):
+    bump_version(Node)
@@ -2,6 +2,8 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from apps.nodes.models import Node
 
 User = get_user_model()
@@ -65,7 +67,7 @@ class NodeViewsTests(APITestCase):
         self.authenticate(self.normal_user)
         response = self.client.get(self.list_create_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.data['results']), 1)
 
     # -------------------------
     # POST /nodes/
@@ -148,3 +150,39 @@ class NodeViewsTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.node.refresh_from_db()
         self.assertFalse(self.node.is_deleted)
+
+    # -------------------------
+    # GET condicional (ETag / If-None-Match)
+    # -------------------------
+    def test_unchanged_nodes_answer_304_without_querying_them(self):
+        self.authenticate(self.normal_user)
+        response = self.client.get(self.list_create_url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"nodes.node.'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_create_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertFalse([q for q in queries.captured_queries if "nodes_node" in q["sql"]])
+
+        # Se admiten listas y ETags débiles; uno que no coincide da la respuesta completa
+        response = self.client.get(self.list_create_url, HTTP_IF_NONE_MATCH=f'"stale", W/{etag}')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.list_create_url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_node_changes_invalidate_the_etag(self):
+        self.authenticate(self.owner_admin_user)
+        etag = self.client.get(self.detail_url(self.node_owner_admin.id))["ETag"]
+
+        self.client.patch(self.detail_url(self.node_owner_admin.id), {"name": "Renamed"}, format='json')
+        response = self.client.get(self.detail_url(self.node_owner_admin.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Renamed")
+        etag = response["ETag"]
+
+        # El borrado lógico también cambia la versión: ya no es un 304
+        self.client.delete(self.detail_url(self.node_owner_admin.id))
+        response = self.client.get(self.detail_url(self.node_owner_admin.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
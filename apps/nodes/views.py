@@ -3,7 +3,9 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from .models import Node
 from .serializers import NodeSerializer
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsAdminOrReadOnly,IsOwnerAndAdminOrReadOnly
+from apps.core.versions import collection_etag, not_modified, with_etag
 
 # -----------------------------
 # CRUD de nodos
@@ -13,12 +15,19 @@ from apps.core.permissions import IsAdminOrReadOnly,IsOwnerAndAdminOrReadOnly
 @permission_classes([IsAdminOrReadOnly])
 def node_list_create(request):
     """
-    List all nodes or create a new node (admin only for create).
+    List nodes (cursor-paginated) or create a new node (admin only for create).
+    GET supports conditional requests (ETag / If-None-Match).
     """
     if request.method == 'GET':
-        nodes = Node.objects.filter(is_deleted=False)
+        # Sin cambios en la colección: 304 sin consultar los nodos
+        etag = collection_etag(request, Node)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        paginator = KeysetPagination(ordering=('id',))
+        nodes = paginator.paginate_queryset(Node.objects.filter(is_deleted=False), request)
         serializer = NodeSerializer(nodes, many=True)
-        return Response(serializer.data)
+        return with_etag(paginator.get_paginated_response(serializer.data), etag)
 
     if request.method == 'POST':
         serializer = NodeSerializer(data=request.data)
@@ -33,7 +42,14 @@ def node_list_create(request):
 def node_detail(request, pk):
     """
     Retrieve, update, or delete a node by pk.
+    GET supports conditional requests (ETag / If-None-Match).
     """
+    if request.method == 'GET':
+        etag = collection_etag(request, Node)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+
     try:
         node = Node.objects.get(pk=pk, is_deleted=False)
     except Node.DoesNotExist:
@@ -41,7 +57,7 @@ def node_detail(request, pk):
     
     if request.method == 'GET':
         serializer = NodeSerializer(node)
-        return Response(serializer.data)
+        return with_etag(Response(serializer.data), etag)
 
     if request.method == 'PATCH':
         if request.user != node.user:
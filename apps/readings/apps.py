@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ReadingsConfig(AppConfig):
     name = 'apps.readings'
+
+    def ready(self):
+        # Registra los signals que mantienen snapshot y rollups
+        import apps.readings.signals
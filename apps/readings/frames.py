@@ -0,0 +1,107 @@
+"""
+Compact binary frame format for readings sent by constrained nodes.
+
+A frame is a fixed header followed by ``count`` fixed-width records, all
+little-endian:
+
+    header  magic ``b"NR"`` (2s) | version (B) | node_id (I) | count (H)
+    record  sensor_id (I) | epoch seconds (I) | value float32 (f) | flag (B)
+
+Several frames may be concatenated in one body (e.g. a gateway forwarding
+buffered samples of several nodes). A reading costs 13 bytes on the wire
+instead of ~130 bytes of JSON.
+"""
+import math
+import struct
+from datetime import datetime, timezone as dt_timezone
+
+from .models import Reading
+
+
+FRAME_MAGIC = b"NR"
+FRAME_VERSION = 1
+
+HEADER = struct.Struct("<2sBIH")
+RECORD = struct.Struct("<IIfB")
+
+MAX_RECORDS_PER_FRAME = 0xFFFF
+
+# Flag de validación <-> validation_status
+FLAG_TO_STATUS = {
+    0: Reading.ValidationStatus.VALID,
+    1: Reading.ValidationStatus.HIGH,
+    2: Reading.ValidationStatus.LOW,
+}
+STATUS_TO_FLAG = {value: flag for flag, value in FLAG_TO_STATUS.items()}
+
+
+class FrameError(ValueError):
+    """
+    Raised when a binary frame is truncated or malformed.
+    """
+
+
+def encode_frame(node_id, records):
+    """
+    Encode ``records`` of one node into a frame.
+
+    ``records`` is an iterable of ``(sensor_id, timestamp, value, validation_status)``
+    where ``timestamp`` is an aware datetime or epoch seconds.
+    """
+    records = list(records)
+    if len(records) > MAX_RECORDS_PER_FRAME:
+        raise FrameError(f"A frame holds at most {MAX_RECORDS_PER_FRAME} records")
+
+    chunks = [HEADER.pack(FRAME_MAGIC, FRAME_VERSION, node_id, len(records))]
+    for sensor_id, timestamp, value, validation_status in records:
+        if isinstance(timestamp, datetime):
+            timestamp = int(timestamp.timestamp())
+        chunks.append(
+            RECORD.pack(sensor_id, timestamp, value, STATUS_TO_FLAG[validation_status])
+        )
+    return b"".join(chunks)
+
+
+def decode_frames(data):
+    """
+    Decode one or more concatenated frames into reading payload dicts,
+    ready to be validated like a JSON batch.
+    """
+    items = []
+    view = memoryview(data)
+    offset = 0
+
+    while offset < len(view):
+        if len(view) - offset < HEADER.size:
+            raise FrameError("Truncated frame header")
+
+        magic, version, node_id, count = HEADER.unpack_from(view, offset)
+        if magic != FRAME_MAGIC:
+            raise FrameError("Invalid frame magic")
+        if version != FRAME_VERSION:
+            raise FrameError(f"Unsupported frame version {version}")
+        offset += HEADER.size
+
+        end = offset + count * RECORD.size
+        if end > len(view):
+            raise FrameError("Truncated frame records")
+
+        for sensor_id, epoch, value, flag in RECORD.iter_unpack(view[offset:end]):
+            try:
+                validation_status = FLAG_TO_STATUS[flag]
+            except KeyError:
+                raise FrameError(f"Unknown validation flag {flag}")
+            # JSON no admite NaN ni infinitos: por aquí tampoco entran
+            if not math.isfinite(value):
+                raise FrameError(f"Non-finite value for sensor {sensor_id}")
+            items.append({
+                "sensor": sensor_id,
+                "node": node_id,
+                # float32 -> recortamos el ruido de precisión
+                "value": float(format(value, ".7g")),
+                "timestamp": datetime.fromtimestamp(epoch, tz=dt_timezone.utc),
+                "validation_status": validation_status,
+            })
+        offset = end
+
+    return items
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.readings.spool import drain_spool, get_spool
+
+
+class Command(BaseCommand):
+    help = "Replay readings queued on the ingest spool into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.READINGS_SPOOL_DRAIN_BATCH,
+            help="Readings per ingest transaction.",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            default=60,
+            help="Seconds after which an unsealed segment is considered abandoned "
+                 "(only where segment locks are unavailable, i.e. Windows).",
+        )
+
+    def handle(self, *args, **options):
+        spool = get_spool()
+        # Segmentos de procesos caídos (sin sellar o a medio drenar)
+        spool.recover(stale_after=options["stale_after"])
+
+        replayed = drain_spool(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Replayed {replayed} readings, {spool.pending()} segments pending"
+        ))
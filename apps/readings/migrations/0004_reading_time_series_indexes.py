@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-17 19:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nodes', '0002_initial'),
+        ('readings', '0003_remove_reading_updated_at'),
+        ('sensors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reading',
+            name='node',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='readings', to='nodes.node', verbose_name='Node'),
+        ),
+        migrations.AlterField(
+            model_name='reading',
+            name='sensor',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='readings', to='sensors.sensor', verbose_name='Sensor'),
+        ),
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(fields=['node', '-timestamp'], name='reading_node_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(fields=['sensor', '-timestamp'], name='reading_sensor_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(fields=['-timestamp'], name='reading_ts_idx'),
+        ),
+    ]
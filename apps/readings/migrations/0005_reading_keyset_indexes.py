@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-17 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nodes', '0002_initial'),
+        ('readings', '0004_reading_time_series_indexes'),
+        ('sensors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reading',
+            name='reading_node_ts_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reading',
+            name='reading_sensor_ts_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reading',
+            name='reading_ts_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(fields=['node', '-timestamp', '-id'], name='reading_node_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(fields=['sensor', '-timestamp', '-id'], name='reading_sensor_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reading',
+            index=models.Index(fields=['-timestamp', '-id'], name='reading_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0 on 2026-10-17 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_latest_readings(apps, schema_editor):
+    Reading = apps.get_model('readings', 'Reading')
+    LatestReading = apps.get_model('readings', 'LatestReading')
+
+    rows = []
+    sensor_ids = Reading.objects.order_by().values_list('sensor_id', flat=True).distinct()
+    for sensor_id in sensor_ids:
+        latest = Reading.objects.filter(sensor_id=sensor_id).order_by('-timestamp', '-id').first()
+        rows.append(LatestReading(
+            sensor_id=sensor_id,
+            node_id=latest.node_id,
+            reading_id=latest.id,
+            value=latest.value,
+            timestamp=latest.timestamp,
+            validation_status=latest.validation_status,
+        ))
+    LatestReading.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nodes', '0002_initial'),
+        ('readings', '0005_reading_keyset_indexes'),
+        ('sensors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestReading',
+            fields=[
+                ('sensor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='latest_reading', serialize=False, to='sensors.sensor', verbose_name='Sensor')),
+                ('value', models.FloatField(verbose_name='Sensor value')),
+                ('timestamp', models.DateTimeField(verbose_name='Timestamp of the reading')),
+                ('validation_status', models.CharField(choices=[('valid', 'Valid'), ('high', 'High'), ('low', 'Low')], max_length=20, verbose_name='Validation status')),
+                ('node', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='nodes.node', verbose_name='Node')),
+                ('reading', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='readings.reading', verbose_name='Reading')),
+            ],
+            options={
+                'verbose_name': 'Latest reading',
+                'verbose_name_plural': 'Latest readings',
+            },
+        ),
+        migrations.RunPython(backfill_latest_readings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 6.0 on 2026-10-17 20:19
+
+from datetime import timezone as dt_timezone
+
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import TruncDay, TruncHour, TruncMinute
+
+
+def remove_duplicate_readings(apps, schema_editor):
+    """
+    Keep the newest reading (highest id) of every (sensor, timestamp) pair.
+    Alerts of the removed copies cascade; rollups of the affected sensors
+    are re-aggregated so they stop counting them.
+    """
+    Reading = apps.get_model('readings', 'Reading')
+    ReadingRollup = apps.get_model('analytics', 'ReadingRollup')
+
+    duplicates = (
+        Reading.objects
+        .order_by()
+        .values('sensor_id', 'timestamp')
+        .annotate(keep_id=Max('id'), copies=Count('id'))
+        .filter(copies__gt=1)
+    )
+    sensor_ids = set()
+    for row in duplicates.iterator():
+        Reading.objects.filter(
+            sensor_id=row['sensor_id'],
+            timestamp=row['timestamp'],
+        ).exclude(id=row['keep_id']).delete()
+        sensor_ids.add(row['sensor_id'])
+
+    if not sensor_ids:
+        return
+
+    ReadingRollup.objects.filter(sensor_id__in=sensor_ids).delete()
+    for granularity, trunc in (('minute', TruncMinute), ('hour', TruncHour), ('day', TruncDay)):
+        rows = (
+            Reading.objects
+            .filter(sensor_id__in=sensor_ids)
+            .order_by()
+            .annotate(bucket=trunc('timestamp', tzinfo=dt_timezone.utc))
+            .values('sensor_id', 'node_id', 'bucket')
+            .annotate(
+                count=Count('id'),
+                value_sum=Sum('value'),
+                value_min=Min('value'),
+                value_max=Max('value'),
+                value_sum_sq=Sum(F('value') * F('value')),
+            )
+        )
+        ReadingRollup.objects.bulk_create(
+            (ReadingRollup(granularity=granularity, **row) for row in rows.iterator()),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('nodes', '0002_initial'),
+        ('readings', '0006_latestreading'),
+        ('sensors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_readings, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='reading',
+            name='reading_sensor_ts_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='reading',
+            constraint=models.UniqueConstraint(fields=('sensor', 'timestamp'), name='reading_sensor_ts_uniq'),
+        ),
+    ]
@@ -17,14 +17,16 @@ class Reading(models.Model):
         Sensor,
         on_delete=models.CASCADE,
         related_name="readings",
-        verbose_name="Sensor"
+        verbose_name="Sensor",
+        db_index=False,  # cubierto por reading_sensor_ts_uniq
     )
 
     node = models.ForeignKey(
         Node,
         on_delete=models.CASCADE,
         related_name="readings",
-        verbose_name="Node"
+        verbose_name="Node",
+        db_index=False,  # cubierto por reading_node_ts_idx
     )
 
     value = models.FloatField(verbose_name="Sensor value")
@@ -50,6 +52,63 @@ class Reading(models.Model):
         verbose_name = "Reading"
         verbose_name_plural = "Readings"
         ordering = ["-timestamp"]
+        # Un sensor no puede tener dos lecturas en el mismo instante: los
+        # reintentos del gateway se detectan como duplicados en el ingest.
+        # El índice único también sirve las consultas por sensor.
+        constraints = [
+            models.UniqueConstraint(fields=["sensor", "timestamp"], name="reading_sensor_ts_uniq"),
+        ]
+        # Índices para las consultas de series temporales (latest, analytics, exports)
+        indexes = [
+            models.Index(fields=["node", "-timestamp", "-id"], name="reading_node_ts_idx"),
+            models.Index(fields=["-timestamp", "-id"], name="reading_ts_idx"),
+        ]
 
     def __str__(self):
         return f"{self.sensor.name} @ {self.node.name}: {self.value} ({self.timestamp})"
+
+
+class LatestReading(models.Model):
+    """
+    Last known reading of each sensor, maintained on ingest.
+    Lets dashboards read "current value per sensor" without scanning readings.
+    """
+
+    sensor = models.OneToOneField(
+        Sensor,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="latest_reading",
+        verbose_name="Sensor"
+    )
+
+    node = models.ForeignKey(
+        Node,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Node"
+    )
+
+    reading = models.ForeignKey(
+        Reading,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Reading"
+    )
+
+    value = models.FloatField(verbose_name="Sensor value")
+
+    timestamp = models.DateTimeField(verbose_name="Timestamp of the reading")
+
+    validation_status = models.CharField(
+        max_length=20,
+        choices=Reading.ValidationStatus.choices,
+        verbose_name="Validation status"
+    )
+
+    class Meta:
+        verbose_name = "Latest reading"
+        verbose_name_plural = "Latest readings"
+
+    def __str__(self):
+        return f"Latest {self.sensor_id}: {self.value} ({self.timestamp})"
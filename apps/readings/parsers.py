@@ -0,0 +1,21 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .frames import FrameError, decode_frames
+
+
+class ReadingFrameParser(BaseParser):
+    """
+    Parses the compact binary reading frames sent by constrained nodes.
+    The result is a list of reading payloads, handled as a batch.
+    """
+    media_type = "application/vnd.nodosiot.frame"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        data = stream.read() if stream is not None else b""
+        if not data:
+            raise ParseError("Empty frame body")
+        try:
+            return decode_frames(data)
+        except FrameError as exc:
+            raise ParseError(f"Frame parse error - {exc}")
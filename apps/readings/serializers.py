@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import Reading
+from .models import LatestReading, Reading
+from apps.core.rows import RowEncoder
+from apps.sensors.registry import get_sensor
 
 
 class ReadingSerializer(serializers.ModelSerializer):
@@ -18,3 +20,61 @@ class ReadingSerializer(serializers.ModelSerializer):
             "id",
             "created_at",
         )
+
+
+# Listados de lecturas: misma salida que ReadingSerializer(many=True)
+READING_ROWS = RowEncoder(ReadingSerializer)
+
+
+class ReadingIngestSerializer(ReadingSerializer):
+    """
+    Validates readings for ingest. Repeated (sensor, timestamp) keys are not
+    an error here: ``ingest_readings`` resolves them as duplicates.
+
+    ``sensor`` and ``node`` are checked against the in-process sensor
+    registry instead of being fetched: the sensor must exist, be active and
+    belong to ``node``. ``validated_data`` carries ``sensor_id``/``node_id``.
+    """
+    sensor = serializers.IntegerField(source="sensor_id", min_value=1)
+    node = serializers.IntegerField(source="node_id", min_value=1)
+
+    default_error_messages = {
+        "sensor_does_not_exist": 'Invalid pk "{pk_value}" - object does not exist.',
+        "sensor_inactive": "Sensor {pk_value} is inactive.",
+        "node_mismatch": "Sensor {sensor_id} does not belong to node {node_id}.",
+    }
+
+    class Meta(ReadingSerializer.Meta):
+        validators = []
+
+    def validate(self, attrs):
+        sensor_id = attrs["sensor_id"]
+        entry = get_sensor(sensor_id)
+        if entry is None:
+            raise serializers.ValidationError({
+                "sensor": self.error_messages["sensor_does_not_exist"].format(pk_value=sensor_id)
+            })
+        if not entry.is_active:
+            raise serializers.ValidationError({
+                "sensor": self.error_messages["sensor_inactive"].format(pk_value=sensor_id)
+            })
+        if entry.node_id != attrs["node_id"]:
+            raise serializers.ValidationError({
+                "node": self.error_messages["node_mismatch"].format(
+                    sensor_id=sensor_id, node_id=attrs["node_id"]
+                )
+            })
+        return attrs
+
+
+class LatestReadingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LatestReading
+        fields = (
+            "sensor",
+            "node",
+            "reading",
+            "value",
+            "timestamp",
+            "validation_status",
+        )
@@ -0,0 +1,241 @@
+import asyncio
+from datetime import timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from .models import Reading
+from .snapshots import refresh_latest_readings, update_latest_readings
+from .stream import publish_readings_on_commit
+from apps.alerts.incidents import track_incidents
+from apps.analytics.rollups import apply_readings, rebuild_buckets
+from apps.core.versions import bump_version
+from infrastructure.writer import get_writer
+
+
+# Resultado de cada lectura en un ingest
+CREATED = "created"
+UPDATED = "updated"
+DUPLICATE = "duplicate"
+INGEST_OUTCOMES = (CREATED, UPDATED, DUPLICATE)
+
+# Qué hacer con una lectura cuyo (sensor, timestamp) ya existe
+ON_CONFLICT_IGNORE = "ignore"
+ON_CONFLICT_UPDATE = "update"
+ON_CONFLICT_MODES = (ON_CONFLICT_IGNORE, ON_CONFLICT_UPDATE)
+
+
+def ingest_readings(items, on_conflict=ON_CONFLICT_IGNORE):
+    """
+    Persist a batch of validated readings and their alert incidents.
+    Also advances the latest-value snapshot and the rollups, since
+    ``bulk_create`` does not send the signals that keep them in sync.
+
+    ``items`` are ``validated_data`` dicts produced by ``ReadingSerializer``.
+    Readings are keyed on ``(sensor, timestamp)``: a key that already exists,
+    or that repeats within the batch, is a gateway retry. With
+    ``on_conflict="ignore"`` the stored reading is returned untouched; with
+    ``on_conflict="update"`` its node, value and validation status are
+    overwritten. Within a batch the first occurrence of a key wins.
+    Only newly created readings open, extend or close incidents (see
+    ``track_incidents``).
+
+    Returns a list of ``(reading, alert, outcome)`` tuples in input order,
+    where ``outcome`` is one of ``INGEST_OUTCOMES`` and ``alert`` is the
+    incident a new out-of-range reading opened or extended, else ``None``.
+    """
+    if on_conflict not in ON_CONFLICT_MODES:
+        raise ValueError(f"Unknown on_conflict mode: {on_conflict!r}")
+
+    try:
+        return _ingest(items, on_conflict)
+    except IntegrityError:
+        # Otra petición insertó la misma clave entre la consulta y el insert;
+        # al reintentar se resuelve como duplicado
+        return _ingest(items, on_conflict)
+
+
+def write_readings(items, on_conflict=ON_CONFLICT_IGNORE):
+    """
+    ``ingest_readings`` through the shared group-commit writer when
+    DB_WRITER_ENABLED, so concurrent requests share one bulk insert and one
+    commit instead of queueing on SQLite's write lock.
+    """
+    if not settings.DB_WRITER_ENABLED:
+        return ingest_readings(items, on_conflict)
+    future = submit_readings(items, on_conflict)
+    return future.result(timeout=settings.DB_WRITER_TIMEOUT)
+
+
+async def awrite_readings(items, on_conflict=ON_CONFLICT_IGNORE):
+    """
+    Async ``write_readings``. With the group-commit writer the coroutine just
+    awaits its future; otherwise the ingest runs in the sync thread.
+    """
+    if not settings.DB_WRITER_ENABLED:
+        return await sync_to_async(ingest_readings)(items, on_conflict)
+    future = submit_readings(items, on_conflict)
+    return await asyncio.wait_for(asyncio.wrap_future(future), settings.DB_WRITER_TIMEOUT)
+
+
+def submit_readings(items, on_conflict=ON_CONFLICT_IGNORE):
+    """
+    Queue readings on the group-commit writer. Returns a ``Future`` for the
+    ``ingest_readings`` result; callers may ignore it (fire and forget).
+    """
+    if on_conflict not in ON_CONFLICT_MODES:
+        raise ValueError(f"Unknown on_conflict mode: {on_conflict!r}")
+    return get_writer().submit(_ingest_intents, (items, on_conflict), rows=len(items))
+
+
+def _ingest_intents(payloads):
+    """
+    Writer handler: ingest the ``(items, on_conflict)`` payloads of several
+    requests with one ``ingest_readings`` call per conflict mode, and split
+    the results back per payload.
+    """
+    results = [None] * len(payloads)
+    for mode in ON_CONFLICT_MODES:
+        indexes = [i for i, (_, on_conflict) in enumerate(payloads) if on_conflict == mode]
+        if not indexes:
+            continue
+        ingested = ingest_readings(
+            [item for i in indexes for item in payloads[i][0]],
+            mode,
+        )
+        offset = 0
+        for i in indexes:
+            size = len(payloads[i][0])
+            results[i] = ingested[offset:offset + size]
+            offset += size
+    return results
+
+
+def _reading_key(sensor_id, timestamp):
+    return (sensor_id, timestamp.astimezone(dt_timezone.utc))
+
+
+def _ingest(items, on_conflict):
+    incoming = [Reading(**item) for item in items]
+
+    with transaction.atomic():
+        existing = _existing_readings(incoming)
+
+        results = []
+        readings = []
+        seen = {}
+        changed = {}
+        for reading in incoming:
+            key = _reading_key(reading.sensor_id, reading.timestamp)
+            if key in seen:
+                results.append([seen[key], None, DUPLICATE])
+                continue
+
+            current = existing.get(key)
+            if current is None:
+                readings.append(reading)
+                result = [reading, None, CREATED]
+            elif on_conflict == ON_CONFLICT_UPDATE and _differs(current, reading):
+                changed[current.id] = (current.node_id, current.timestamp)
+                current.node_id = reading.node_id
+                current.value = reading.value
+                current.validation_status = reading.validation_status
+                result = [current, None, UPDATED]
+            else:
+                result = [current, None, DUPLICATE]
+            seen[key] = result[0]
+            results.append(result)
+
+        Reading.objects.bulk_create(readings)
+
+        # readings está en el mismo orden que los resultados CREATED
+        incidents = iter(track_incidents(readings))
+        for result in results:
+            if result[2] == CREATED:
+                result[1] = next(incidents)
+
+        update_latest_readings(readings)
+        apply_readings(readings)
+        publish_readings_on_commit(readings)
+
+        if changed:
+            _store_updates(existing, changed)
+
+    return [tuple(result) for result in results]
+
+
+def _existing_readings(readings):
+    """
+    Stored readings sharing a ``(sensor, timestamp)`` key with ``readings``,
+    fetched with a single query over the unique index.
+    """
+    if not readings:
+        return {}
+    candidates = Reading.objects.filter(
+        sensor_id__in={reading.sensor_id for reading in readings},
+        timestamp__in={reading.timestamp for reading in readings},
+    )
+    return {
+        _reading_key(reading.sensor_id, reading.timestamp): reading
+        for reading in candidates
+    }
+
+
+def _differs(current, reading):
+    return (
+        current.node_id != reading.node_id
+        or current.value != reading.value
+        or current.validation_status != reading.validation_status
+    )
+
+
+def _store_updates(existing, changed):
+    """
+    Save readings overwritten by an upsert and refresh the derived data of
+    both their previous and current position.
+    """
+    updated = [reading for reading in existing.values() if reading.id in changed]
+    Reading.objects.bulk_update(updated, fields=["node", "value", "validation_status"])
+    # bulk_update no envía post_save
+    bump_version(Reading)
+
+    points = set()
+    for reading in updated:
+        previous_node_id, timestamp = changed[reading.id]
+        points.add((reading.sensor_id, previous_node_id, timestamp))
+        points.add((reading.sensor_id, reading.node_id, timestamp))
+    refresh_latest_readings(reading.sensor_id for reading in updated)
+    rebuild_buckets(points)
+
+
+def update_reading(serializer):
+    """
+    Save a validated partial update of a reading. Snapshot and rollups are
+    refreshed by the Reading signals within the same transaction.
+    """
+    with transaction.atomic():
+        return serializer.save()
+
+
+def delete_reading(reading):
+    """
+    Delete a reading. Snapshot and rollups are refreshed by the Reading
+    signals within the same transaction.
+    """
+    with transaction.atomic():
+        reading.delete()
+
+
+def alert_summary(alert):
+    """
+    Compact alert representation embedded in ingest responses.
+    """
+    return {
+        "id": alert.id,
+        "alert_type": alert.alert_type,
+        "status": alert.status,
+        "detected_value": alert.detected_value,
+        "occurrences": alert.occurrences,
+        "peak_value": alert.peak_value,
+    }
@@ -0,0 +1,64 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Reading
+from .snapshots import refresh_latest_readings, update_latest_readings
+from .stream import publish_readings_on_commit
+from apps.analytics.rollups import apply_readings, rebuild_buckets
+from apps.core.versions import bump_version
+
+
+# Mantiene snapshot y rollups cuando una lectura se guarda o borra de a una
+# (ORM, admin, PATCH/DELETE). La ingesta en bloque usa bulk_create, que no
+# emite signals, y actualiza ambos explícitamente en services.ingest_readings.
+
+@receiver(pre_save, sender=Reading)
+def prepare_reading_for_save(sender, instance, **kwargs):
+    # Normaliza valores asignados como texto (p.ej. timestamp="2024-01-01T10:00:00Z")
+    # para que snapshot y rollups trabajen con los tipos que se guardan
+    instance.value = sender._meta.get_field("value").to_python(instance.value)
+    timestamp = sender._meta.get_field("timestamp").to_python(instance.timestamp)
+    if timestamp is not None and timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    instance.timestamp = timestamp
+
+    if instance._state.adding or instance.pk is None:
+        return
+    instance._previous_point = (
+        Reading.objects
+        .filter(pk=instance.pk)
+        .values_list("sensor_id", "node_id", "timestamp")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Reading)
+def sync_derived_data_on_save(sender, instance, created, **kwargs):
+    if created:
+        update_latest_readings([instance])
+        apply_readings([instance])
+        publish_readings_on_commit([instance])
+        return
+
+    points = [(instance.sensor_id, instance.node_id, instance.timestamp)]
+    previous = getattr(instance, "_previous_point", None)
+    if previous is not None:
+        points.append(previous)
+    refresh_latest_readings({point[0] for point in points})
+    rebuild_buckets(points)
+
+
+@receiver(post_delete, sender=Reading)
+def sync_derived_data_on_delete(sender, instance, **kwargs):
+    refresh_latest_readings([instance.sensor_id])
+    rebuild_buckets([(instance.sensor_id, instance.node_id, instance.timestamp)])
+
+
+# Versión de la colección (caché de reportes PDF): ediciones y borrados.
+# Las altas del ingest no la tocan: ya cambian el número y el último id
+@receiver(post_save, sender=Reading)
+@receiver(post_delete, sender=Reading)
+def bump_readings_version(sender, created=False, **kwargs):
+    if not created:
+        bump_version(Reading)
@@ -0,0 +1,185 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import LatestReading, Reading
+from .serializers import LatestReadingSerializer
+from apps.sensors.models import Sensor
+
+
+# -----------------------------
+# Cache en proceso del snapshot: {sensor_id: (sort_key, data)}
+# -----------------------------
+_lock = threading.Lock()
+_rows = None
+_loaded_at = 0.0
+
+
+def _sort_key(timestamp, reading_id):
+    return (timestamp, reading_id)
+
+
+def clear_snapshot_cache():
+    """
+    Drop the in-process snapshot cache; the next read reloads the table.
+    """
+    global _rows
+    with _lock:
+        _rows = None
+
+
+def _load_rows():
+    global _rows, _loaded_at
+    rows = {
+        row.sensor_id: (
+            _sort_key(row.timestamp, row.reading_id),
+            LatestReadingSerializer(row).data,
+        )
+        for row in LatestReading.objects.all()
+    }
+    with _lock:
+        _rows = rows
+        _loaded_at = time.monotonic()
+    return rows
+
+
+def _cached_rows():
+    ttl = settings.READINGS_SNAPSHOT_CACHE_TTL
+    with _lock:
+        rows = _rows
+        fresh = rows is not None and time.monotonic() - _loaded_at < ttl
+    if fresh:
+        return rows
+    return _load_rows()
+
+
+def _merge_rows(latest_rows):
+    """
+    Write-through of committed snapshot rows. Only moves a sensor forward,
+    so callbacks running out of order cannot regress it.
+    """
+    with _lock:
+        if _rows is None:
+            return
+        for row in latest_rows:
+            key = _sort_key(row.timestamp, row.reading_id)
+            current = _rows.get(row.sensor_id)
+            if current is None or key > current[0]:
+                _rows[row.sensor_id] = (key, LatestReadingSerializer(row).data)
+
+
+def _copy_reading(row, reading):
+    row.node_id = reading.node_id
+    row.reading = reading
+    row.value = reading.value
+    row.timestamp = reading.timestamp
+    row.validation_status = reading.validation_status
+    return row
+
+
+# -----------------------------
+# Mantenimiento
+# -----------------------------
+
+def update_latest_readings(readings):
+    """
+    Advance the snapshot with freshly inserted readings.
+    Must run inside the ingest transaction, after the readings are saved.
+    """
+    newest = {}
+    for reading in readings:
+        current = newest.get(reading.sensor_id)
+        if current is None or (
+            _sort_key(reading.timestamp, reading.id) > _sort_key(current.timestamp, current.id)
+        ):
+            newest[reading.sensor_id] = reading
+
+    if not newest:
+        return
+
+    existing = LatestReading.objects.in_bulk(list(newest))
+    to_create = []
+    to_update = []
+    for sensor_id, reading in newest.items():
+        row = existing.get(sensor_id)
+        if row is None:
+            to_create.append(_copy_reading(LatestReading(sensor_id=sensor_id), reading))
+        elif _sort_key(reading.timestamp, reading.id) > _sort_key(row.timestamp, row.reading_id):
+            to_update.append(_copy_reading(row, reading))
+
+    LatestReading.objects.bulk_create(to_create)
+    LatestReading.objects.bulk_update(
+        to_update,
+        fields=["node", "reading", "value", "timestamp", "validation_status"],
+    )
+
+    changed = to_create + to_update
+    if changed:
+        transaction.on_commit(lambda: _merge_rows(changed))
+
+
+def refresh_latest_readings(sensor_ids):
+    """
+    Recompute the snapshot of ``sensor_ids`` from the readings table,
+    e.g. after a reading was edited or deleted.
+    """
+    for sensor_id in set(sensor_ids):
+        latest = (
+            Reading.objects
+            .filter(sensor_id=sensor_id)
+            .order_by("-timestamp", "-id")
+            .first()
+        )
+        if latest is None:
+            LatestReading.objects.filter(sensor_id=sensor_id).delete()
+        else:
+            LatestReading.objects.update_or_create(
+                sensor_id=sensor_id,
+                defaults={
+                    "node_id": latest.node_id,
+                    "reading": latest,
+                    "value": latest.value,
+                    "timestamp": latest.timestamp,
+                    "validation_status": latest.validation_status,
+                },
+            )
+
+    transaction.on_commit(clear_snapshot_cache)
+
+
+# -----------------------------
+# Lectura
+# -----------------------------
+
+def get_snapshot(node_id=None):
+    """
+    Latest reading of every active sensor, optionally limited to one node.
+    Sensors without readings are listed with empty values.
+    """
+    rows = _cached_rows()
+
+    sensors = Sensor.objects.filter(
+        is_active=True,
+        is_deleted=False,
+        node__is_deleted=False,
+    )
+    if node_id:
+        sensors = sensors.filter(node_id=node_id)
+
+    snapshot = []
+    for sensor_id, sensor_node_id in sensors.order_by("id").values_list("id", "node_id"):
+        cached = rows.get(sensor_id)
+        if cached is not None:
+            snapshot.append(cached[1])
+        else:
+            snapshot.append({
+                "sensor": sensor_id,
+                "node": sensor_node_id,
+                "reading": None,
+                "value": None,
+                "timestamp": None,
+                "validation_status": None,
+            })
+    return snapshot
@@ -0,0 +1,171 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections
+from django.utils.dateparse import parse_datetime
+
+from .models import Reading
+from .services import ingest_readings
+from infrastructure.spool import Spool
+
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Spool y drenador del proceso
+# -----------------------------
+_lock = threading.Lock()
+_spool = None
+_drainer = None
+
+
+def get_spool():
+    global _spool
+    with _lock:
+        if _spool is None:
+            _spool = Spool(
+                settings.READINGS_SPOOL_DIR,
+                max_segment_bytes=settings.READINGS_SPOOL_SEGMENT_BYTES,
+                fsync=settings.READINGS_SPOOL_FSYNC,
+            )
+        return _spool
+
+
+def reset_spool():
+    """
+    Stop the background drainer and forget the spool, so the next use picks
+    up the current settings. The active segment is sealed, not lost.
+    """
+    global _spool, _drainer
+    with _lock:
+        if _drainer is not None:
+            _drainer.stop()
+            _drainer = None
+        if _spool is not None:
+            _spool.seal()
+            _spool = None
+
+
+def _ensure_drainer():
+    global _drainer
+    interval = settings.READINGS_SPOOL_DRAIN_INTERVAL
+    if not interval:
+        return
+    with _lock:
+        if _drainer is None:
+            _drainer = SpoolDrainer(interval)
+            _drainer.start()
+
+
+class SpoolDrainer(threading.Thread):
+    """
+    Replays the spool into the database every ``interval`` seconds.
+    """
+
+    def __init__(self, interval):
+        super().__init__(name="readings-spool-drainer", daemon=True)
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        get_spool().recover()
+        while not self._stopped.wait(self.interval):
+            try:
+                drain_spool()
+            except Exception:
+                logger.exception("Reading spool drain failed, retrying in %ss", self.interval)
+            finally:
+                close_old_connections()
+
+
+# -----------------------------
+# Escritura
+# -----------------------------
+
+def _encode(item):
+    return {
+        "sensor": item["sensor_id"],
+        "node": item["node_id"],
+        "value": item["value"],
+        "timestamp": item["timestamp"].isoformat(),
+        "validation_status": item.get("validation_status", Reading.ValidationStatus.VALID),
+    }
+
+
+def _decode(record):
+    return {
+        "sensor_id": record["sensor"],
+        "node_id": record["node"],
+        "value": record["value"],
+        "timestamp": parse_datetime(record["timestamp"]),
+        "validation_status": record["validation_status"],
+    }
+
+
+def spool_readings(items, on_conflict):
+    """
+    Durably queue validated readings for ingest. ``items`` are
+    ``validated_data`` dicts; they reach ``Reading``/``Alert`` once the
+    drainer replays them through ``ingest_readings``.
+    """
+    get_spool().append({
+        "on_conflict": on_conflict,
+        "readings": [_encode(item) for item in items],
+    })
+    _ensure_drainer()
+
+
+# -----------------------------
+# Drenado
+# -----------------------------
+
+def drain_spool(batch_size=None):
+    """
+    Seal the active segment and replay every sealed one into the database
+    in batches of up to ``batch_size`` readings. Returns the number of
+    readings replayed. Replays are idempotent, so a segment interrupted
+    halfway is simply drained again.
+    """
+    batch_size = batch_size or settings.READINGS_SPOOL_DRAIN_BATCH
+    spool = get_spool()
+    spool.seal()
+
+    replayed = 0
+    for path in spool.claim():
+        try:
+            mode, batch = None, []
+            for record in spool.read(path):
+                if batch and (record["on_conflict"] != mode or len(batch) >= batch_size):
+                    replayed += _replay(batch, mode)
+                    batch = []
+                mode = record["on_conflict"]
+                batch.extend(_decode(item) for item in record["readings"])
+            if batch:
+                replayed += _replay(batch, mode)
+        except Exception:
+            spool.unclaim(path)
+            raise
+        spool.release(path)
+    return replayed
+
+
+def _replay(items, on_conflict):
+    try:
+        ingest_readings(items, on_conflict)
+        return len(items)
+    except IntegrityError:
+        pass
+
+    # Algún sensor o nodo ya no existe: se aíslan las lecturas culpables
+    replayed = 0
+    for item in items:
+        try:
+            ingest_readings([item], on_conflict)
+            replayed += 1
+        except IntegrityError as exc:
+            logger.error("Dropping spooled reading %r: %s", item, exc)
+    return replayed
@@ -0,0 +1,119 @@
+import asyncio
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Reading
+from .serializers import READING_ROWS
+from apps.core.sse import KEEPALIVE, RESET_EVENT, format_event, live_events, retry_field
+from infrastructure.broker import get_broker
+
+
+READINGS_EVENT = "readings"
+
+STREAM_NAME = "readings"
+
+
+def reading_broker():
+    # Sin buffer: se reanuda desde la base de datos por id de lectura
+    return get_broker(STREAM_NAME, buffer_size=0, max_pending=settings.READINGS_STREAM_MAX_PENDING)
+
+
+def publish_readings_on_commit(readings):
+    """
+    Publish newly stored ``readings`` to the tail stream once the current
+    transaction commits. Nothing is encoded while no client is subscribed.
+    """
+    if readings:
+        transaction.on_commit(lambda: publish_readings(readings))
+
+
+def publish_readings(readings):
+    broker = reading_broker()
+    if not broker.subscriber_count:
+        return
+    for data in READING_ROWS.encode_objects(readings):
+        broker.publish(READINGS_EVENT, data)
+
+
+# -----------------------------
+# Suscripción de un cliente
+# -----------------------------
+
+class ReadingTail:
+    """
+    One client's tail of new readings of ``node_ids`` or ``sensor_ids``
+    (either matches; all readings when both are empty).
+
+    Events are ``readings`` with a list of readings in id order and the
+    last reading id as event id. At most one is sent every ``interval``
+    seconds: readings arriving in between are coalesced into the next one.
+    With ``last_id`` the readings stored after it are sent first, read from
+    the database; if there are more than EVENT_STREAM_BUFFER, or the id is
+    not a reading id, a ``reset`` event (with the current last id) tells
+    the client to reload its window instead.
+    """
+
+    def __init__(self, node_ids=(), sensor_ids=(), interval=0.0, last_id=None):
+        self.node_ids = frozenset(node_ids)
+        self.sensor_ids = frozenset(sensor_ids)
+        self.interval = interval
+        self.last_id = last_id
+
+    def matches(self, reading):
+        if not self.node_ids and not self.sensor_ids:
+            return True
+        return reading["node"] in self.node_ids or reading["sensor"] in self.sensor_ids
+
+    async def events(self):
+        # Suscrito antes de consultar: lo que se confirme mientras tanto
+        # llega por el broker y se descarta si ya salió en la reanudación
+        subscription, _, _ = reading_broker().subscribe(predicate=self.matches)
+        try:
+            yield retry_field()
+            if self.last_id is not None:
+                yield await self._resume()
+
+            loop = asyncio.get_running_loop()
+            next_send = loop.time()
+            async for event in live_events(subscription):
+                if event is None:
+                    yield KEEPALIVE
+                    continue
+                if (delay := next_send - loop.time()) > 0:
+                    await asyncio.sleep(delay)
+                readings = self._unseen([event, *subscription.drain()])
+                if readings:
+                    yield self._batch(readings)
+                    next_send = loop.time() + self.interval
+        finally:
+            subscription.close()
+
+    async def _resume(self):
+        limit = settings.EVENT_STREAM_BUFFER
+        if isinstance(self.last_id, int):
+            queryset = READING_ROWS.values_list(self._missed_readings()[:limit + 1])
+            rows = [row async for row in queryset]
+            if len(rows) <= limit:
+                return self._batch(READING_ROWS.encode(rows))
+
+        self.last_id = await Reading.objects.order_by("-id").values_list("id", flat=True).afirst() or 0
+        return format_event({}, RESET_EVENT, self.last_id)
+
+    def _missed_readings(self):
+        readings = Reading.objects.filter(id__gt=self.last_id)
+        if self.node_ids or self.sensor_ids:
+            readings = readings.filter(Q(node_id__in=self.node_ids) | Q(sensor_id__in=self.sensor_ids))
+        return readings.order_by("id")
+
+    def _unseen(self, events):
+        readings = [event.data for event in events]
+        if self.last_id is not None:
+            readings = [reading for reading in readings if reading["id"] > self.last_id]
+        return sorted(readings, key=lambda reading: reading["id"])
+
+    def _batch(self, readings):
+        if readings:
+            self.last_id = readings[-1]["id"]
+        return format_event(readings, READINGS_EVENT, self.last_id)
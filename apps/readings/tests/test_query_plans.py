@@ -0,0 +1,90 @@
+# apps/readings/tests/test_query_plans.py
+# py .\manage.py test apps.readings.tests.test_query_plans
+
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+
+from apps.core.pagination import KeysetPagination
+from apps.readings.models import Reading
+
+
+# SQLite crea los UniqueConstraint dentro de la tabla (sqlite_autoindex_*)
+SENSOR_TS_UNIQ = r'(reading_sensor_ts_uniq|sqlite_autoindex_readings_reading_\d+)'
+
+
+@skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN es específico de SQLite")
+class QueryPlanTestCase(TestCase):
+    """Base con aserciones sobre EXPLAIN QUERY PLAN"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertRegex(
+            plan,
+            rf"USING (COVERING )?INDEX {index_name}(?!\w)",
+            msg=f"La consulta no usa {index_name}:\n{plan}"
+        )
+
+    def assertNoFullScan(self, queryset, table):
+        plan = queryset.explain()
+        self.assertIsNone(
+            re.search(rf"SCAN {table}\b(?! USING)", plan),
+            msg=f"Full scan de {table}:\n{plan}"
+        )
+
+
+class ReadingQueryPlanTests(QueryPlanTestCase):
+    """Las consultas calientes de readings usan índices compuestos"""
+
+    def setUp(self):
+        self.since = timezone.now() - timedelta(minutes=60)
+
+    def test_1_latest_readings_by_node(self):
+        """1. latest_readings filtrado por nodo usa (node, timestamp)"""
+        qs = Reading.objects.filter(timestamp__gte=self.since, node__id=1).order_by('-timestamp')
+        self.assertUsesIndex(qs, 'reading_node_ts_idx')
+        self.assertNotIn('TEMP B-TREE', qs.explain())
+
+    def test_2_latest_readings_by_sensor(self):
+        """2. latest_readings filtrado por sensor usa el índice único (sensor, timestamp)"""
+        qs = Reading.objects.filter(timestamp__gte=self.since, sensor__id=1).order_by('-timestamp')
+        self.assertUsesIndex(qs, SENSOR_TS_UNIQ)
+        self.assertNotIn('TEMP B-TREE', qs.explain())
+
+    def test_3_latest_readings_without_filters(self):
+        """3. latest_readings sin filtros usa el índice de timestamp"""
+        qs = Reading.objects.filter(timestamp__gte=self.since).order_by('-timestamp')
+        self.assertUsesIndex(qs, 'reading_ts_idx')
+
+    def test_4_daily_summary_range(self):
+        """4. daily_summary por nodo/sensor y rango no hace full scan"""
+        end = timezone.now()
+        for field, index in (('node_id', 'reading_node_ts_idx'), ('sensor_id', SENSOR_TS_UNIQ)):
+            qs = Reading.objects.filter(
+                **{field: 1}, timestamp__gte=self.since, timestamp__lte=end
+            ).values('id')
+            self.assertUsesIndex(qs, index)
+            self.assertNoFullScan(qs, 'readings_reading')
+
+    def test_5_exports_ordered_listing(self):
+        """5. El listado completo ordenado (exports) recorre el índice de timestamp"""
+        qs = Reading.objects.all()
+        self.assertUsesIndex(qs, 'reading_ts_idx')
+        self.assertNotIn('TEMP B-TREE', qs.explain())
+
+    def test_6_keyset_page_uses_index_without_sort(self):
+        """6. Una página por cursor recorre el índice sin ordenar en memoria"""
+        paginator = KeysetPagination(ordering=('-timestamp', '-id'))
+        position = paginator.build_position_filter([timezone.now(), 10], reverse=False)
+        for qs, index in (
+            (Reading.objects.filter(position), 'reading_ts_idx'),
+            (Reading.objects.filter(position, node_id=1), 'reading_node_ts_idx'),
+            (Reading.objects.filter(position, sensor_id=1), SENSOR_TS_UNIQ),
+        ):
+            qs = qs.order_by('-timestamp', '-id')[:101]
+            self.assertUsesIndex(qs, index)
+            self.assertNotIn('TEMP B-TREE', qs.explain())
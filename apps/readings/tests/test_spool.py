@@ -0,0 +1,211 @@
+# apps/readings/tests/test_spool.py
+# py .\manage.py test apps.readings.tests.test_spool
+
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import skipIf
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.utils import timezone
+from datetime import timedelta
+
+from apps.users.models import User
+from apps.nodes.models import Node
+from apps.sensors.models import Sensor
+from apps.readings.models import Reading
+from apps.alerts.models import Alert
+from apps.readings.spool import drain_spool, get_spool, reset_spool
+from infrastructure.spool import FSYNC_NEVER, Spool, fcntl
+
+
+class SpoolTestMixin:
+    """Spool en un directorio temporal, sin drenador en segundo plano"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        settings = override_settings(
+            READINGS_SPOOL_ENABLED=True,
+            READINGS_SPOOL_DIR=self.tmp.name,
+            READINGS_SPOOL_DRAIN_INTERVAL=0,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        reset_spool()
+        self.addCleanup(reset_spool)
+
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass",
+            role=User.Roles.ADMIN
+        )
+
+        self.node = Node.objects.create(
+            name="Gateway Node",
+            location="Test Location",
+            user=self.admin
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        self.base = timezone.now()
+        self.list_url = reverse('reading-list-create')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def build_item(self, value, seconds, validation_status=Reading.ValidationStatus.VALID, **overrides):
+        item = {
+            "sensor": self.sensor.id,
+            "node": self.node.id,
+            "value": value,
+            "timestamp": (self.base + timedelta(seconds=seconds)).isoformat(),
+            "validation_status": validation_status,
+        }
+        item.update(overrides)
+        return item
+
+
+class ReadingSpoolTests(SpoolTestMixin, TestCase):
+    """Tests para el spool de ingesta en disco"""
+
+    def test_1_segments_round_trip_and_ignore_torn_tail(self):
+        """1. Los segmentos rotan por tamaño y un registro cortado se ignora"""
+        spool = Spool(Path(self.tmp.name) / "raw", max_segment_bytes=64, fsync=FSYNC_NEVER)
+        for i in range(5):
+            spool.append({"n": i, "pad": "x" * 40})
+        spool.seal()
+
+        segments = spool.claim()
+        self.assertEqual(len(segments), 5)
+        self.assertEqual([Spool.read(path) for path in segments][2], [{"n": 2, "pad": "x" * 40}])
+
+        # Simula una caída a mitad de escritura
+        with open(segments[0], "ab") as segment:
+            segment.write(b"\x20\x00\x00\x00garbage")
+        self.assertEqual(Spool.read(segments[0]), [{"n": 0, "pad": "x" * 40}])
+
+        for path in segments:
+            spool.release(path)
+        self.assertEqual(spool.pending(), 0)
+
+    def test_2_post_is_accepted_and_drained_later(self):
+        """2. Con spool activo el POST responde 202 y el drenado inserta lecturas y alertas"""
+        payload = [
+            self.build_item(20.0, 0),
+            self.build_item(50.0, 1, Reading.ValidationStatus.HIGH),
+            self.build_item(21.0, 2, sensor=999),
+        ]
+        response = self.client.post(self.list_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['queued'], 2)
+        self.assertEqual(response.data['results'][0]['status'], 'queued')
+        self.assertEqual(response.data['results'][2]['status'], 'error')
+
+        response = self.client.post(self.list_url, self.build_item(-5.0, 3, Reading.ValidationStatus.LOW), format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(Reading.objects.count(), 0)
+
+        self.assertEqual(drain_spool(), 3)
+        self.assertEqual(Reading.objects.count(), 3)
+        self.assertEqual(Alert.objects.count(), 2)
+        self.assertEqual(get_spool().pending(), 0)
+
+    def test_3_replaying_a_segment_is_idempotent(self):
+        """3. Drenar otra vez un segmento interrumpido no duplica lecturas"""
+        payload = [self.build_item(20.0, 0), self.build_item(50.0, 1, Reading.ValidationStatus.HIGH)]
+        self.client.post(self.list_url, payload, format='json')
+        self.client.post(self.list_url, payload, format='json')
+
+        spool = get_spool()
+        spool.seal()
+        [segment] = spool.claim()
+        spool.unclaim(segment)
+
+        self.assertEqual(drain_spool(batch_size=1), 4)
+        self.assertEqual(Reading.objects.count(), 2)
+        self.assertEqual(Alert.objects.count(), 1)
+
+    def test_4_command_recovers_abandoned_segments(self):
+        """4. drain_spool recupera segmentos de un proceso caído"""
+        crashed = Spool(self.tmp.name)
+        crashed.append({
+            "on_conflict": "ignore",
+            "readings": [{
+                "sensor": self.sensor.id,
+                "node": self.node.id,
+                "value": 19.5,
+                "timestamp": self.base.isoformat(),
+                "validation_status": "valid",
+            }],
+        })
+        # Simula la caída: el archivo se cierra sin sellar y el lock se suelta
+        crashed._file.close()
+
+        out = StringIO()
+        call_command('drain_spool', '--stale-after', '0', stdout=out)
+        self.assertIn('Replayed 1 readings, 0 segments pending', out.getvalue())
+        self.assertEqual(Reading.objects.get().value, 19.5)
+
+    @skipIf(fcntl is None, "segment locks need fcntl")
+    def test_5_recover_leaves_segments_of_live_owners_alone(self):
+        """5. recover no toca el segmento abierto ni los reclamados por otro proceso vivo"""
+        directory = Path(self.tmp.name) / "shared"
+        writer = Spool(directory, fsync=FSYNC_NEVER)
+        drainer = Spool(directory, fsync=FSYNC_NEVER)
+        # Cada Spool abre sus propios archivos: sus locks chocan como entre procesos
+        other = Spool(directory, fsync=FSYNC_NEVER)
+
+        drainer.append({"n": 0})
+        drainer.seal()
+        [claimed] = drainer.claim()
+        writer.append({"n": 1})
+
+        other.recover(stale_after=0)
+        self.assertEqual(other.claim(), [])
+        self.assertTrue(claimed.exists())
+
+        # El escritor sigue en el mismo segmento
+        writer.append({"n": 2})
+        writer.seal()
+        [segment] = other.claim()
+        self.assertEqual(Spool.read(segment), [{"n": 1}, {"n": 2}])
+        other.release(segment)
+
+        # Cuando el drenador suelta el segmento, vuelve a la cola
+        drainer.unclaim(claimed)
+        [segment] = other.claim()
+        self.assertEqual(Spool.read(segment), [{"n": 0}])
+
+
+class ReadingSpoolCommitTests(SpoolTestMixin, TransactionTestCase):
+    """Drenado con commits reales (SQLite comprueba las FK al hacer commit)"""
+
+    def test_1_orphaned_readings_do_not_block_the_spool(self):
+        """1. Lecturas de un sensor borrado se descartan sin bloquear el resto"""
+        other = Sensor.objects.create(
+            node=self.node,
+            name="Humidity Sensor",
+            sensor_type=Sensor.SensorTypes.HUMIDITY,
+            model="DHT22",
+            unit="%"
+        )
+        payload = [self.build_item(20.0, 0), self.build_item(60.0, 0, sensor=other.id)]
+        self.client.post(self.list_url, payload, format='json')
+        # Borrado físico (delete() en BaseModel es un soft delete)
+        Sensor.objects.filter(id=other.id).delete()
+
+        with self.assertLogs('apps.readings.spool', level='ERROR'):
+            self.assertEqual(drain_spool(), 1)
+        self.assertEqual(Reading.objects.get().sensor_id, self.sensor.id)
@@ -0,0 +1,161 @@
+# apps/readings/tests/test_stream.py
+# py .\manage.py test apps.readings.tests.test_stream
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import timedelta
+
+from apps.users.models import User
+from apps.nodes.models import Node
+from apps.sensors.models import Sensor
+from apps.readings.models import Reading
+from apps.readings.services import ingest_readings
+from apps.readings.stream import reading_broker
+from infrastructure.broker import reset_brokers
+
+
+@override_settings(EVENT_STREAM_TIMEOUT=5, EVENT_STREAM_KEEPALIVE=5, READINGS_STREAM_MAX_RATE=100)
+class ReadingStreamTests(TestCase):
+    """Tests para el tail SSE de lecturas nuevas"""
+
+    def setUp(self):
+        reset_brokers()
+        self.addCleanup(reset_brokers)
+
+        self.researcher = User.objects.create_user(email="researcher@test.com", password="pass",
+                                                   role=User.Roles.RESEARCHER)
+        self.nodes = [Node.objects.create(name=f"Node {n}", location="Lab", user=self.researcher) for n in range(3)]
+        self.sensors = [
+            Sensor.objects.create(node=node, name=f"Sensor {node.name}", sensor_type=Sensor.SensorTypes.TEMPERATURE,
+                                  model="DHT22", unit="°C")
+            for node in self.nodes
+        ]
+
+        self.url = reverse('reading-stream')
+        self.token = str(RefreshToken.for_user(self.researcher).access_token)
+        self.base = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+        self.seconds = 0
+
+    def ingest(self, *sensors):
+        # Confirma los on_commit, como haría la transacción del ingest
+        items = []
+        for sensor in sensors:
+            self.seconds += 1
+            items.append({"sensor_id": sensor.id, "node_id": sensor.node_id, "value": 20.0 + self.seconds,
+                          "timestamp": self.base + timedelta(seconds=self.seconds), "validation_status": "valid"})
+        with self.captureOnCommitCallbacks(execute=True):
+            return [reading.id for reading, _, _ in ingest_readings(items)]
+
+    def create_reading(self, sensor):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Reading.objects.create(sensor=sensor, node_id=sensor.node_id, value=1.0,
+                                          timestamp=self.base, validation_status="valid").id
+
+    async def open_stream(self, query="", **headers):
+        response = await self.async_client.get(
+            f"{self.url}{query}", headers={"Authorization": f"Bearer {self.token}", **headers}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        return stream
+
+    async def next_event(self, stream):
+        while True:
+            chunk = (await asyncio.wait_for(anext(stream), timeout=5)).decode()
+            if chunk.startswith(":"):
+                continue
+            fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+            fields["data"] = json.loads(fields["data"])
+            return fields
+
+    async def test_1_pushes_new_readings_of_subscribed_nodes_and_sensors(self):
+        """1. Llegan las lecturas nuevas de los nodos o sensores suscritos, con su id"""
+        node, sensor, other = self.sensors
+        stream = await self.open_stream(f"?node_id={node.node_id}&sensor_id={sensor.id}")
+
+        ids = await sync_to_async(self.ingest)(other, node, sensor)
+        event = await self.next_event(stream)
+        self.assertEqual(event["event"], "readings")
+        self.assertEqual([reading["id"] for reading in event["data"]], ids[1:])
+        self.assertEqual(event["id"], str(ids[2]))
+        self.assertEqual(event["data"][0]["sensor"], node.id)
+        self.assertEqual(event["data"][0]["value"], 22.0)
+
+        # Una lectura guardada de a una (post_save) también llega
+        reading_id = await sync_to_async(self.create_reading)(sensor)
+        event = await self.next_event(stream)
+        self.assertEqual([r["id"] for r in event["data"]], [reading_id])
+
+    @override_settings(READINGS_STREAM_MAX_RATE=2)
+    async def test_2_coalesces_to_the_maximum_rate(self):
+        """2. Lo que llega antes del siguiente envío permitido sale agrupado en un evento"""
+        sensor = self.sensors[0]
+        stream = await self.open_stream(f"?sensor_id={sensor.id}&max_rate=50")
+
+        first = await sync_to_async(self.ingest)(sensor)
+        self.assertEqual([r["id"] for r in (await self.next_event(stream))["data"]], first)
+
+        loop = asyncio.get_running_loop()
+        sent = loop.time()
+        second = await sync_to_async(self.ingest)(sensor)
+        third = await sync_to_async(self.ingest)(sensor, sensor)
+        event = await self.next_event(stream)
+        self.assertEqual([r["id"] for r in event["data"]], second + third)
+        # max_rate=50 se limita a READINGS_STREAM_MAX_RATE=2: medio segundo entre eventos
+        self.assertGreaterEqual(loop.time() - sent, 0.4)
+
+    async def test_3_resumes_from_the_last_reading_id(self):
+        """3. Al reconectar se envían las lecturas guardadas desde el último id visto"""
+        node, sensor, other = self.sensors
+        ids = await sync_to_async(self.ingest)(node, other, node, sensor)
+
+        stream = await self.open_stream(f"?node_id={node.node_id}", **{"Last-Event-ID": str(ids[0])})
+        event = await self.next_event(stream)
+        self.assertEqual([r["id"] for r in event["data"]], [ids[2]])
+        self.assertEqual(event["id"], str(ids[2]))
+
+        # Lo ya reenviado no se repite en vivo
+        more = await sync_to_async(self.ingest)(node)
+        self.assertEqual([r["id"] for r in (await self.next_event(stream))["data"]], more)
+
+        # Nada perdido: evento vacío con el mismo id
+        stream = await self.open_stream(f"?node_id={node.node_id}&last_event_id={more[0]}")
+        event = await self.next_event(stream)
+        self.assertEqual((event["data"], event["id"]), ([], str(more[0])))
+
+    @override_settings(EVENT_STREAM_BUFFER=2)
+    async def test_4_resets_when_the_gap_is_too_large_or_unknown(self):
+        """4. Si faltan demasiadas lecturas o el id no es válido, llega un reset"""
+        ids = await sync_to_async(self.ingest)(*self.sensors)
+
+        for last_id in (ids[0] - 1, "abc"):
+            stream = await self.open_stream(**{"Last-Event-ID": str(last_id)})
+            event = await self.next_event(stream)
+            self.assertEqual((event["event"], event["id"], event["data"]), ("reset", str(ids[-1]), {}))
+
+        stream = await self.open_stream(**{"Last-Event-ID": str(ids[0])})
+        self.assertEqual([r["id"] for r in (await self.next_event(stream))["data"]], ids[1:])
+
+    async def test_5_rejects_invalid_params_and_cleans_up(self):
+        """5. Parámetros inválidos dan 400; al terminar el stream se libera la suscripción"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        for query in ("?node_id=1,x", "?sensor_id=-2", "?max_rate=0", "?max_rate=fast"):
+            response = await self.async_client.get(f"{self.url}{query}", headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+        self.assertEqual((await self.async_client.get(self.url)).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with self.settings(EVENT_STREAM_TIMEOUT=0.1, EVENT_STREAM_KEEPALIVE=0.05):
+            stream = await self.open_stream()
+            self.assertEqual(reading_broker().subscriber_count, 1)
+            self.assertIn(b": keepalive\n\n", [chunk async for chunk in stream])
+        self.assertEqual(reading_broker().subscriber_count, 0)
@@ -1,10 +1,15 @@
 # apps/readings/tests/test_views.py
 # py .\manage.py test apps.readings.tests.test_views
 
-from django.test import TestCase
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.utils import timezone
 from datetime import timedelta
 
@@ -13,6 +18,12 @@ from apps.nodes.models import Node
 from apps.sensors.models import Sensor
 from apps.readings.models import Reading
 from apps.alerts.models import Alert
+from apps.readings.frames import FrameError, decode_frames, encode_frame
+from apps.readings.parsers import ReadingFrameParser
+from apps.readings.serializers import ReadingIngestSerializer
+from apps.readings.snapshots import clear_snapshot_cache, get_snapshot
+from apps.readings.views import _validate_batch
+from apps.sensors.registry import get_sensor
 
 
 class ReadingEssentialTests(TestCase):
@@ -78,7 +89,7 @@ class ReadingEssentialTests(TestCase):
         
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
     
     def test_3_researcher_cannot_create_reading(self):
         """3. Researcher NO puede crear reading (POST) - solo admin"""
@@ -249,4 +260,704 @@ class ReadingEssentialTests(TestCase):
         
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertEqual(Reading.objects.count(), 0)
\ No newline at end of file
+        self.assertEqual(Reading.objects.count(), 0)
+
+class ReadingBatchTests(TestCase):
+    """Tests para la ingesta batch de lecturas"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass",
+            role=User.Roles.ADMIN
+        )
+
+        self.node = Node.objects.create(
+            name="Gateway Node",
+            location="Test Location",
+            user=self.admin
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        self.list_url = reverse('reading-list-create')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def build_item(self, value, validation_status=Reading.ValidationStatus.VALID, **overrides):
+        item = {
+            "sensor": self.sensor.id,
+            "node": self.node.id,
+            "value": value,
+            "timestamp": timezone.now().isoformat(),
+            "validation_status": validation_status,
+        }
+        item.update(overrides)
+        return item
+
+    def test_1_batch_creates_readings_and_alerts(self):
+        """1. Un batch válido crea todas las lecturas y sus alertas"""
+        payload = [
+            self.build_item(20.0),
+            self.build_item(50.0, Reading.ValidationStatus.HIGH),
+            self.build_item(-5.0, Reading.ValidationStatus.LOW),
+        ]
+
+        response = self.client.post(self.list_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(response.data['failed'], 0)
+
+        self.assertEqual(Reading.objects.count(), 3)
+        self.assertEqual(Alert.objects.count(), 2)
+
+        results = response.data['results']
+        self.assertEqual([r['index'] for r in results], [0, 1, 2])
+        self.assertIsNone(results[0]['alert'])
+        self.assertEqual(results[1]['alert']['alert_type'], 'high')
+        self.assertEqual(results[2]['alert']['alert_type'], 'low')
+        self.assertEqual(
+            Alert.objects.get(id=results[1]['alert']['id']).reading_id,
+            results[1]['id']
+        )
+
+    def test_2_batch_reports_per_item_errors(self):
+        """2. Los items inválidos se reportan sin bloquear los válidos"""
+        payload = [
+            self.build_item(20.0),
+            self.build_item(21.0, sensor=999),
+        ]
+
+        response = self.client.post(self.list_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['failed'], 1)
+        self.assertEqual(response.data['results'][1]['status'], 'error')
+        self.assertIn('sensor', response.data['results'][1]['errors'])
+        self.assertEqual(Reading.objects.count(), 1)
+
+    def test_3_batch_all_invalid_returns_400(self):
+        """3. Un batch sin items válidos devuelve 400 y no escribe nada"""
+        response = self.client.post(self.list_url, [{"value": "x"}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Reading.objects.count(), 0)
+
+    def test_4_batch_size_limits(self):
+        """4. Batch vacío o demasiado grande se rechaza"""
+        response = self.client.post(self.list_url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.settings(READINGS_BATCH_MAX_SIZE=2):
+            payload = [self.build_item(float(i)) for i in range(3)]
+            response = self.client.post(self.list_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Reading.objects.count(), 0)
+
+    def test_5_replayed_batch_is_a_no_op(self):
+        """5. Reenviar el mismo batch no duplica lecturas ni alertas"""
+        payload = [
+            self.build_item(20.0),
+            self.build_item(50.0, Reading.ValidationStatus.HIGH),
+        ]
+        first = self.client.post(self.list_url, payload, format='json')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        replay = self.client.post(self.list_url, payload, format='json')
+        self.assertEqual(replay.status_code, status.HTTP_200_OK)
+        self.assertEqual(replay.data['created'], 0)
+        self.assertEqual(replay.data['duplicates'], 2)
+        self.assertEqual(
+            [r['id'] for r in replay.data['results']],
+            [r['id'] for r in first.data['results']]
+        )
+        self.assertEqual([r['status'] for r in replay.data['results']], ['duplicate', 'duplicate'])
+        self.assertIsNone(replay.data['results'][1]['alert'])
+
+        self.assertEqual(Reading.objects.count(), 2)
+        self.assertEqual(Alert.objects.count(), 1)
+
+    def test_6_duplicates_within_a_batch(self):
+        """6. Claves repetidas dentro del batch se guardan una sola vez"""
+        item = self.build_item(20.0)
+        new = self.build_item(21.0)
+        response = self.client.post(self.list_url, [item, new, item], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['duplicates'], 1)
+        results = response.data['results']
+        self.assertEqual(results[2]['id'], results[0]['id'])
+        self.assertEqual(Reading.objects.count(), 2)
+
+    def test_7_single_post_retry_returns_existing_reading(self):
+        """7. Reintentar un POST individual devuelve la lectura guardada con 200"""
+        item = self.build_item(48.0, Reading.ValidationStatus.HIGH)
+        first = self.client.post(self.list_url, item, format='json')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        retry = self.client.post(self.list_url, item, format='json')
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertNotIn('alert', retry.data)
+        self.assertEqual(Alert.objects.count(), 1)
+
+    def test_8_on_conflict_update_overwrites(self):
+        """8. on_conflict=update sobrescribe el valor y refresca el snapshot"""
+        item = self.build_item(20.0)
+        self.client.post(self.list_url, [item], format='json')
+
+        url = self.list_url + '?on_conflict=update'
+        response = self.client.post(url, [dict(item, value=22.5)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 1)
+
+        reading = Reading.objects.get()
+        self.assertEqual(reading.value, 22.5)
+        self.sensor.refresh_from_db()
+        self.assertEqual(self.sensor.latest_reading.value, 22.5)
+
+        response = self.client.post(self.list_url + '?on_conflict=replace', [item], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReadingFrameTests(TestCase):
+    """Tests para la ingesta en formato binario compacto"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass",
+            role=User.Roles.ADMIN
+        )
+
+        self.node = Node.objects.create(
+            name="Arduino Node",
+            location="Test Location",
+            user=self.admin
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        self.list_url = reverse('reading-list-create')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def post_frame(self, body):
+        return self.client.post(
+            self.list_url,
+            body,
+            content_type=ReadingFrameParser.media_type
+        )
+
+    def test_1_frame_round_trip(self):
+        """1. encode_frame / decode_frames conservan los datos"""
+        ts = timezone.now().replace(microsecond=0)
+        frame = encode_frame(self.node.id, [
+            (self.sensor.id, ts, 25.5, Reading.ValidationStatus.VALID),
+            (self.sensor.id, ts, 48.2, Reading.ValidationStatus.HIGH),
+        ])
+
+        self.assertEqual(len(frame), 9 + 2 * 13)
+        items = decode_frames(frame)
+        self.assertEqual(items[0]['timestamp'], ts)
+        self.assertEqual(items[0]['value'], 25.5)
+        self.assertEqual(items[1]['value'], 48.2)
+        self.assertEqual(items[1]['validation_status'], 'high')
+        self.assertEqual(items[1]['node'], self.node.id)
+
+    def test_2_post_frame_creates_readings(self):
+        """2. POST binario crea lecturas y alertas como un batch"""
+        ts = timezone.now()
+        frame = encode_frame(self.node.id, [
+            (self.sensor.id, ts, 21.0, Reading.ValidationStatus.VALID),
+            (self.sensor.id, ts + timedelta(seconds=1), -3.0, Reading.ValidationStatus.LOW),
+        ])
+
+        response = self.post_frame(frame)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(Reading.objects.count(), 2)
+        self.assertEqual(Alert.objects.get().alert_type, 'low')
+
+    def test_3_malformed_frame_is_rejected(self):
+        """3. Un frame truncado o con versión desconocida devuelve 400"""
+        frame = encode_frame(self.node.id, [
+            (self.sensor.id, timezone.now(), 21.0, Reading.ValidationStatus.VALID),
+        ])
+
+        response = self.post_frame(frame[:-4])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post_frame(frame[:2] + bytes([9]) + frame[3:])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.assertRaises(FrameError):
+            decode_frames(b"XX" + frame[2:])
+        self.assertEqual(Reading.objects.count(), 0)
+
+    def test_4_non_finite_values_are_rejected(self):
+        """4. Un frame con NaN o ±inf se rechaza entero con 400"""
+        ts = timezone.now()
+        for value in (float('nan'), float('inf'), float('-inf')):
+            frame = encode_frame(self.node.id, [
+                (self.sensor.id, ts, 21.0, Reading.ValidationStatus.VALID),
+                (self.sensor.id, ts + timedelta(seconds=1), value, Reading.ValidationStatus.VALID),
+            ])
+            with self.assertRaises(FrameError):
+                decode_frames(frame)
+            response = self.post_frame(frame)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, value)
+        self.assertEqual(Reading.objects.count(), 0)
+
+
+class ReadingPaginationTests(TestCase):
+    """Tests para la paginación por cursor del listado de readings"""
+
+    def setUp(self):
+        self.researcher = User.objects.create_user(
+            email="researcher@test.com",
+            password="researcherpass",
+            role=User.Roles.RESEARCHER
+        )
+
+        self.node = Node.objects.create(
+            name="Test Node",
+            location="Test Location",
+            user=self.researcher
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        self.sensors = [self.sensor] + [
+            Sensor.objects.create(
+                node=self.node,
+                name=f"Sensor {n}",
+                sensor_type=Sensor.SensorTypes.TEMPERATURE,
+                model="DHT22",
+                unit="°C"
+            )
+            for n in (2, 3)
+        ]
+
+        # 7 lecturas; varias comparten timestamp (en sensores distintos)
+        # para probar el desempate por id
+        base = timezone.now()
+        offsets = [0, 0, 1, 1, 1, 2, 3]
+        self.readings = [
+            Reading.objects.create(
+                sensor=self.sensors[i % 3],
+                node=self.node,
+                value=float(i),
+                timestamp=base - timedelta(minutes=offset)
+            )
+            for i, offset in enumerate(offsets)
+        ]
+        self.expected_ids = [
+            r.id for r in sorted(self.readings, key=lambda r: (r.timestamp, r.id), reverse=True)
+        ]
+
+        self.list_url = reverse('reading-list-create')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.researcher)
+
+    def test_1_pages_forward_and_backward_without_gaps(self):
+        """1. Recorrer páginas hacia delante y atrás no repite ni pierde filas"""
+        seen = []
+        pages = []
+        url = self.list_url + '?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page_ids = [r['id'] for r in response.data['results']]
+            pages.append(page_ids)
+            seen.extend(page_ids)
+            last = response.data
+            url = response.data['next']
+
+        self.assertEqual(seen, self.expected_ids)
+        self.assertEqual([len(p) for p in pages], [3, 3, 1])
+
+        # Volver atrás desde la última página
+        response = self.client.get(last['previous'])
+        self.assertEqual([r['id'] for r in response.data['results']], pages[1])
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([r['id'] for r in response.data['results']], pages[0])
+        self.assertIsNone(response.data['previous'])
+
+    def test_2_page_size_is_bounded(self):
+        """2. page_size se limita al máximo permitido"""
+        with self.settings(API_PAGE_SIZE=2):
+            response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(self.list_url, {'page_size': 100000})
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertIsNone(response.data['next'])
+
+    def test_3_invalid_cursor_returns_404(self):
+        """3. Un cursor manipulado devuelve 404"""
+        response = self.client.get(self.list_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ReadingSnapshotTests(TestCase):
+    """Tests para el snapshot de última lectura por sensor"""
+
+    def setUp(self):
+        clear_snapshot_cache()
+
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass",
+            role=User.Roles.ADMIN
+        )
+
+        self.node = Node.objects.create(
+            name="Test Node",
+            location="Test Location",
+            user=self.admin
+        )
+        self.other_node = Node.objects.create(
+            name="Other Node",
+            location="Other Location",
+            user=self.admin
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+        self.idle_sensor = Sensor.objects.create(
+            node=self.node,
+            name="Humidity Sensor",
+            sensor_type=Sensor.SensorTypes.HUMIDITY,
+            model="DHT22",
+            unit="%"
+        )
+        self.other_sensor = Sensor.objects.create(
+            node=self.other_node,
+            name="Pressure Sensor",
+            sensor_type=Sensor.SensorTypes.PRESSURE,
+            model="BMP280",
+            unit="hPa"
+        )
+
+        self.list_url = reverse('reading-list-create')
+        self.snapshot_url = reverse('reading-snapshot')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def post_reading(self, sensor, value, timestamp):
+        return self.client.post(self.list_url, {
+            "sensor": sensor.id,
+            "node": sensor.node_id,
+            "value": value,
+            "timestamp": timestamp.isoformat(),
+        }, format='json')
+
+    def snapshot_by_sensor(self, **params):
+        response = self.client.get(self.snapshot_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {row['sensor']: row for row in response.data}
+
+    def test_1_snapshot_tracks_newest_reading(self):
+        """1. El snapshot devuelve la lectura más reciente, aunque llegue tarde otra más vieja"""
+        now = timezone.now()
+        self.post_reading(self.sensor, 20.0, now - timedelta(minutes=5))
+        latest = self.post_reading(self.sensor, 22.0, now)
+        self.post_reading(self.sensor, 18.0, now - timedelta(minutes=10))  # llegada tardía
+
+        rows = self.snapshot_by_sensor()
+        self.assertEqual(rows[self.sensor.id]['value'], 22.0)
+        self.assertEqual(rows[self.sensor.id]['reading'], latest.data['id'])
+        self.assertIsNone(rows[self.idle_sensor.id]['value'])
+        self.assertEqual(len(rows), 3)
+
+    def test_2_snapshot_filters_by_node_and_active(self):
+        """2. Filtra por nodo (un node_id no entero da 400) y excluye sensores inactivos o eliminados"""
+        self.post_reading(self.other_sensor, 1013.0, timezone.now())
+        self.idle_sensor.is_active = False
+        self.idle_sensor.save()
+
+        rows = self.snapshot_by_sensor(node_id=self.node.id)
+        self.assertEqual(list(rows), [self.sensor.id])
+
+        rows = self.snapshot_by_sensor(node_id=self.other_node.id)
+        self.assertEqual(rows[self.other_sensor.id]['value'], 1013.0)
+
+        for node_id in ('abc', '-1', '1.5'):
+            response = self.client.get(self.snapshot_url, {'node_id': node_id})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, node_id)
+
+    def test_3_snapshot_follows_delete(self):
+        """3. Al borrar la última lectura, el snapshot vuelve a la anterior"""
+        now = timezone.now()
+        self.post_reading(self.sensor, 20.0, now - timedelta(minutes=5))
+        latest = self.post_reading(self.sensor, 22.0, now)
+
+        url = reverse('reading-detail', kwargs={'pk': latest.data['id']})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        rows = self.snapshot_by_sensor()
+        self.assertEqual(rows[self.sensor.id]['value'], 20.0)
+
+    def test_4_snapshot_cost_is_independent_of_history(self):
+        """4. El snapshot no consulta la tabla de lecturas"""
+        now = timezone.now()
+        for minutes in range(20):
+            self.post_reading(self.sensor, float(minutes), now - timedelta(minutes=minutes))
+
+        self.snapshot_by_sensor()  # carga la caché
+        with self.assertNumQueries(1):  # solo la lista de sensores activos
+            rows = get_snapshot()
+        self.assertEqual(len(rows), 3)
+
+
+class ReadingAsyncTests(TestCase):
+    """Tests para el fast path asíncrono de ingest y lecturas recientes"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass",
+            role=User.Roles.ADMIN
+        )
+
+        self.researcher = User.objects.create_user(
+            email="researcher@test.com",
+            password="researcherpass",
+            role=User.Roles.RESEARCHER
+        )
+
+        self.node = Node.objects.create(
+            name="Gateway Node",
+            location="Test Location",
+            user=self.admin
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        self.base = timezone.now()
+        self.ingest_url = reverse('reading-ingest-async')
+        self.latest_url = reverse('reading-latest-async')
+        self.client = APIClient()
+        self.authenticate(self.admin)
+
+    def authenticate(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def build_item(self, value, seconds, validation_status=Reading.ValidationStatus.VALID):
+        return {
+            "sensor": self.sensor.id,
+            "node": self.node.id,
+            "value": value,
+            "timestamp": (self.base - timedelta(seconds=seconds)).isoformat(),
+            "validation_status": validation_status,
+        }
+
+    def test_1_async_batch_has_the_sync_contract(self):
+        """1. El batch asíncrono crea lecturas y alertas y los reintentos son duplicados"""
+        payload = [self.build_item(20.0, 1), self.build_item(50.0, 2, Reading.ValidationStatus.HIGH)]
+        response = self.client.post(self.ingest_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(response.json()['results'][1]['alert']['alert_type'], 'high')
+
+        response = self.client.post(self.ingest_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['duplicates'], 2)
+        self.assertEqual(Reading.objects.count(), 2)
+        self.assertEqual(Alert.objects.count(), 1)
+
+    def test_2_async_single_reading_and_frames(self):
+        """2. Lectura individual y frames binarios por la vía asíncrona"""
+        response = self.client.post(self.ingest_url, self.build_item(-5.0, 1, Reading.ValidationStatus.LOW), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['alert']['alert_type'], 'low')
+
+        frame = encode_frame(self.node.id, [
+            (self.sensor.id, self.base.replace(microsecond=0) - timedelta(seconds=5), 21.0, Reading.ValidationStatus.VALID),
+        ])
+        response = self.client.post(self.ingest_url, frame, content_type=ReadingFrameParser.media_type)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reading.objects.count(), 2)
+
+    def test_3_async_ingest_errors_and_permissions(self):
+        """3. JSON inválido, datos inválidos y permisos"""
+        response = self.client.post(self.ingest_url, 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.ingest_url, {"value": "x"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('sensor', response.json())
+
+        self.authenticate(self.researcher)
+        response = self.client.post(self.ingest_url, self.build_item(20.0, 1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(self.ingest_url).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_4_async_latest_matches_sync(self):
+        """4. latest asíncrono devuelve lo mismo que el síncrono"""
+        for seconds in (10, 20, 600):
+            self.client.post(self.ingest_url, self.build_item(float(seconds), seconds), format='json')
+
+        self.authenticate(self.researcher)
+        params = {'interval': 5, 'sensor_id': self.sensor.id}
+        sync_response = self.client.get(reverse('reading-latest'), params)
+        async_response = self.client.get(self.latest_url, params)
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+        self.assertEqual([r['value'] for r in async_response.json()], [10.0, 20.0])
+
+    @override_settings(READINGS_LONG_POLL_INTERVAL=0.05)
+    def test_5_long_poll_waits_for_data(self):
+        """5. Con wait, una consulta vacía espera antes de responder"""
+        started = time.monotonic()
+        response = self.client.get(self.latest_url, {'interval': 1, 'unit': 'seconds', 'wait': 0.3})
+        self.assertEqual(response.json(), [])
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+
+        for wait in ('soon', 'nan', 'inf'):
+            response = self.client.get(self.latest_url, {'interval': 1, 'unit': 'seconds', 'wait': wait})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, wait)
+
+        # Un wait negativo se trata como 0: responde sin esperar
+        started = time.monotonic()
+        response = self.client.get(self.latest_url, {'interval': 1, 'unit': 'seconds', 'wait': -5})
+        self.assertEqual(response.json(), [])
+        self.assertLess(time.monotonic() - started, 0.3)
+
+    def test_6_load_test_command_compares_both_paths(self):
+        """6. load_test_async mide la vista síncrona y la asíncrona"""
+        out = StringIO()
+        call_command(
+            'load_test_async', '--scenario', 'ingest', '--concurrency', '2',
+            '--duration', '0.2', stdout=out
+        )
+        rows = [line.split() for line in out.getvalue().splitlines()[1:]]
+        self.assertEqual([row[0] for row in rows], ['sync', 'async'])
+        self.assertTrue(all(row[-1] == '0' and int(row[2]) > 0 for row in rows))
+        self.assertEqual(Reading.objects.count(), sum(int(row[2]) for row in rows))
+
+
+class ReadingIngestValidationTests(TestCase):
+    """Tests para la validación del ingest contra el registro de sensores"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass",
+            role=User.Roles.ADMIN
+        )
+
+        self.node = Node.objects.create(
+            name="Gateway Node",
+            location="Test Location",
+            user=self.admin
+        )
+
+        self.other_node = Node.objects.create(
+            name="Other Node",
+            location="Other Location",
+            user=self.admin
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        self.base = timezone.now()
+        self.list_url = reverse('reading-list-create')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def build_item(self, seconds, node=None):
+        return {
+            "sensor": self.sensor.id,
+            "node": (node or self.node).id,
+            "value": 21.5,
+            "timestamp": (self.base - timedelta(seconds=seconds)).isoformat(),
+        }
+
+    def test_1_validation_does_not_query_the_database(self):
+        """1. Con el registro cargado, validar un lote no hace consultas"""
+        serializer = ReadingIngestSerializer(data=self.build_item(0))
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data['sensor_id'], self.sensor.id)
+
+        with self.assertNumQueries(0):
+            results, valid_indexes, _ = _validate_batch([self.build_item(n) for n in range(50)])
+        self.assertEqual(len(valid_indexes), 50)
+
+    def test_2_sensor_must_belong_to_the_node(self):
+        """2. Una lectura con un nodo que no es el del sensor se rechaza"""
+        response = self.client.post(self.list_url, self.build_item(0, node=self.other_node), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('node', response.data)
+        self.assertEqual(Reading.objects.count(), 0)
+
+    def test_3_inactive_and_deleted_sensors_are_rejected(self):
+        """3. Sensores inactivos, borrados o de un nodo borrado se rechazan"""
+        self.assertEqual(self.client.post(self.list_url, self.build_item(0), format='json').status_code,
+                         status.HTTP_201_CREATED)
+
+        self.sensor.is_active = False
+        self.sensor.save()
+        response = self.client.post(self.list_url, self.build_item(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('inactive', str(response.data['sensor']))
+
+        self.sensor.is_active = True
+        self.sensor.save()
+        self.node.delete()  # borrado lógico
+        response = self.client.post(self.list_url, self.build_item(2), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('does not exist', str(response.data['sensor']))
+
+    def test_4_new_sensors_are_seen_immediately(self):
+        """4. Un sensor recién creado se acepta sin esperar al TTL"""
+        get_sensor(self.sensor.id)  # carga el registro
+        sensor = Sensor.objects.create(
+            node=self.other_node,
+            name="Humidity Sensor",
+            sensor_type=Sensor.SensorTypes.HUMIDITY,
+            model="DHT22",
+            unit="%"
+        )
+        entry = get_sensor(sensor.id)
+        self.assertEqual((entry.node_id, entry.unit, entry.is_active), (self.other_node.id, "%", True))
@@ -0,0 +1,136 @@
+# apps/readings/tests/test_writer.py
+# py .\manage.py test apps.readings.tests.test_writer
+
+import threading
+
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.utils import timezone
+from datetime import timedelta
+
+from apps.users.models import User
+from apps.nodes.models import Node
+from apps.sensors.models import Sensor
+from apps.readings.models import Reading
+from apps.alerts.models import Alert
+from apps.readings.services import submit_readings
+from infrastructure.writer import GroupCommitWriter, stop_writer
+
+
+class GroupCommitWriterTests(TransactionTestCase):
+    """Tests para el escritor único con group commit"""
+
+    def setUp(self):
+        self.writer = GroupCommitWriter(max_rows=100, max_delay=0.05)
+        self.addCleanup(self.writer.stop)
+        self.batches = []
+
+    def double(self, payloads):
+        self.batches.append(list(payloads))
+        return [payload * 2 for payload in payloads]
+
+    def test_1_concurrent_intents_share_a_commit(self):
+        """1. Intents concurrentes se agrupan y cada uno recibe su resultado"""
+        futures = {}
+        threads = [
+            threading.Thread(target=lambda n=n: futures.__setitem__(n, self.writer.submit(self.double, n)))
+            for n in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({n: f.result(timeout=5) for n, f in futures.items()}, {n: n * 2 for n in range(20)})
+        self.assertLess(len(self.batches), 20)
+
+    def test_2_group_is_bounded_by_rows(self):
+        """2. Un grupo no supera max_rows"""
+        futures = [self.writer.submit(self.double, n, rows=30) for n in range(10)]
+        for future in futures:
+            future.result(timeout=5)
+        self.assertTrue(all(len(batch) <= 4 for batch in self.batches))
+
+    def test_3_failing_intent_does_not_fail_the_group(self):
+        """3. Un intent que falla se aísla y el resto se confirma"""
+        def checked(payloads):
+            if 'bad' in payloads:
+                raise ValueError('bad payload')
+            return payloads
+
+        with self.assertLogs('infrastructure.writer', level='ERROR'):
+            futures = [self.writer.submit(checked, payload) for payload in ('a', 'bad', 'c')]
+            self.assertEqual(futures[2].result(timeout=5), 'c')
+        self.assertEqual(futures[0].result(timeout=5), 'a')
+        with self.assertRaises(ValueError):
+            futures[1].result(timeout=5)
+
+
+@override_settings(DB_WRITER_ENABLED=True, DB_WRITER_MAX_DELAY_MS=20)
+class ReadingWriterTests(TransactionTestCase):
+    """La ingesta de lecturas pasa por el escritor cuando está activo"""
+
+    def setUp(self):
+        stop_writer()
+        self.addCleanup(stop_writer)
+
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="adminpass",
+            role=User.Roles.ADMIN
+        )
+
+        self.node = Node.objects.create(
+            name="Gateway Node",
+            location="Test Location",
+            user=self.admin
+        )
+
+        self.sensor = Sensor.objects.create(
+            node=self.node,
+            name="Temperature Sensor",
+            sensor_type=Sensor.SensorTypes.TEMPERATURE,
+            model="DHT22",
+            unit="°C"
+        )
+
+        self.base = timezone.now()
+        self.list_url = reverse('reading-list-create')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def build_data(self, value, seconds, validation_status=Reading.ValidationStatus.VALID):
+        return {
+            "sensor": self.sensor,
+            "node": self.node,
+            "value": value,
+            "timestamp": self.base + timedelta(seconds=seconds),
+            "validation_status": validation_status,
+        }
+
+    def test_1_post_goes_through_the_writer(self):
+        """1. El POST crea lecturas y alertas vía el escritor"""
+        response = self.client.post(self.list_url, [
+            {"sensor": self.sensor.id, "node": self.node.id, "value": 20.0,
+             "timestamp": self.base.isoformat()},
+            {"sensor": self.sensor.id, "node": self.node.id, "value": 50.0,
+             "timestamp": (self.base + timedelta(seconds=1)).isoformat(), "validation_status": "high"},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reading.objects.count(), 2)
+        self.assertEqual(Alert.objects.get().reading_id, response.data['results'][1]['id'])
+
+    def test_2_fire_and_forget_and_cross_request_duplicates(self):
+        """2. Intents sin esperar se confirman juntos y los duplicados entre peticiones se detectan"""
+        first = submit_readings([self.build_data(20.0, 0), self.build_data(48.0, 1, 'high')])
+        second = submit_readings([self.build_data(20.0, 0)])
+        stop_writer()
+
+        self.assertEqual([outcome for _, _, outcome in first.result()], ['created', 'created'])
+        [(reading, alert, outcome)] = second.result()
+        self.assertEqual(outcome, 'duplicate')
+        self.assertEqual(reading.id, first.result()[0][0].id)
+        self.assertEqual(Reading.objects.count(), 2)
+        self.assertEqual(Alert.objects.count(), 1)
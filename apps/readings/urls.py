@@ -5,4 +5,8 @@ urlpatterns = [
     path('', views.reading_list_create, name='reading-list-create'),
     path('<int:pk>/', views.reading_detail, name='reading-detail'),
     path('latest/', views.latest_readings, name='reading-latest'),
+    path('snapshot/', views.reading_snapshot, name='reading-snapshot'),
+    path('async/', views.reading_ingest_async, name='reading-ingest-async'),
+    path('async/latest/', views.latest_readings_async, name='reading-latest-async'),
+    path('stream/', views.reading_stream, name='reading-stream'),
 ]
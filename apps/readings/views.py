@@ -1,64 +1,212 @@
+import asyncio
+import json
+import math
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 from .models import Reading
-from .serializers import ReadingSerializer
+from .parsers import ReadingFrameParser
+from .serializers import READING_ROWS, ReadingIngestSerializer, ReadingSerializer
+from .services import (
+    CREATED,
+    DUPLICATE,
+    ON_CONFLICT_IGNORE,
+    ON_CONFLICT_MODES,
+    UPDATED,
+    alert_summary,
+    awrite_readings,
+    delete_reading,
+    update_reading,
+    write_readings,
+)
+from .snapshots import get_snapshot
+from .spool import spool_readings
+from .stream import ReadingTail
+from apps.core.async_api import async_api_view, json_response
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsAdminOrReadOnly
-from apps.alerts.models import Alert
+from apps.core.sse import request_last_event_id, sse_response
 
 
 @api_view(['GET', 'POST'])
+@parser_classes([*api_settings.DEFAULT_PARSER_CLASSES, ReadingFrameParser])
 @permission_classes([IsAdminOrReadOnly])
 def reading_list_create(request):
     """
-    List all readings or create a new reading.
+    List readings (cursor-paginated) or create a new reading.
+    POST also accepts an array of readings (batch mode), either as JSON
+    or as binary frames (application/vnd.nodosiot.frame).
     Auto-generate alerts based on validation_status.
+    Readings are idempotent on (sensor, timestamp); ``?on_conflict=update``
+    overwrites a stored reading instead of ignoring the retry.
+    With READINGS_SPOOL_ENABLED, valid readings are queued on disk and the
+    response is 202 Accepted.
     """
     if request.method == 'GET':
-        readings = Reading.objects.all()
-        serializer = ReadingSerializer(readings, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination(ordering=('-timestamp', '-id'))
+        rows = READING_ROWS.values_list(Reading.objects.all(), named=True)
+        readings = paginator.paginate_queryset(rows, request)
+        return paginator.get_paginated_response(READING_ROWS.encode(readings))
 
     if request.method == 'POST':
-        serializer = ReadingSerializer(data=request.data)
+        on_conflict, error = _parse_on_conflict(request.query_params)
+        if error:
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+        # Modo batch: el gateway envía un array de lecturas (JSON o frames)
+        if isinstance(request.data, list):
+            return Response(*_create_reading_batch(request.data, on_conflict))
+
+        serializer = ReadingIngestSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # Guardamos la lectura TAL CUAL viene
-        reading = serializer.save()
-
-        alert = None
-
-        # ----------------------------------------
-        # Creación de alerta basada en validation_status
-        # ----------------------------------------
-        if reading.validation_status in (
-            Reading.ValidationStatus.HIGH,
-            Reading.ValidationStatus.LOW,
-        ):
-            alert = Alert.objects.create(
-                sensor=reading.sensor,
-                node=reading.node,
-                reading=reading,
-                alert_type=reading.validation_status,  # 'high' o 'low'
-                detected_value=reading.value,
-                status=Alert.AlertStatus.PENDING
-            )
+        if settings.READINGS_SPOOL_ENABLED:
+            spool_readings([serializer.validated_data], on_conflict)
+            return Response(*_queued_reading_result())
+
+        # Guardamos la lectura TAL CUAL viene, con su alerta si corresponde.
+        # Un reintento del gateway devuelve la lectura ya guardada.
+        [ingested] = write_readings([serializer.validated_data], on_conflict)
+        return Response(*_reading_result(*ingested))
+
+
+# -----------------------------
+# Ingest: fases compartidas por la vista síncrona y la asíncrona.
+# Devuelven (data, status) para construir la respuesta.
+# -----------------------------
+
+def _parse_on_conflict(params):
+    on_conflict = params.get('on_conflict', ON_CONFLICT_IGNORE)
+    if on_conflict not in ON_CONFLICT_MODES:
+        return None, {"error": f"on_conflict must be one of: {', '.join(ON_CONFLICT_MODES)}"}
+    return on_conflict, None
 
-        response_data = ReadingSerializer(reading).data
 
-        if alert:
-            response_data["alert"] = {
-                "id": alert.id,
-                "alert_type": alert.alert_type,
-                "status": alert.status,
-                "detected_value": alert.detected_value,
+def _check_batch_size(items):
+    max_size = settings.READINGS_BATCH_MAX_SIZE
+    if not items:
+        return {"error": "Batch must contain at least one reading"}
+    if len(items) > max_size:
+        return {"error": f"Batch size exceeds the maximum of {max_size} readings"}
+    return None
+
+
+def _validate_batch(items):
+    """
+    Validate every item of a batch. Returns ``(results, valid_indexes,
+    valid_data)`` where ``results`` already holds the per-item errors.
+    """
+    results = [None] * len(items)
+    valid_indexes = []
+    valid_data = []
+
+    for index, item in enumerate(items):
+        serializer = ReadingIngestSerializer(data=item)
+        if serializer.is_valid():
+            valid_indexes.append(index)
+            valid_data.append(serializer.validated_data)
+        else:
+            results[index] = {
+                "index": index,
+                "status": "error",
+                "errors": serializer.errors,
             }
+    return results, valid_indexes, valid_data
+
+
+def _create_reading_batch(items, on_conflict=ON_CONFLICT_IGNORE):
+    """
+    Validate a batch of readings and persist the valid ones in one transaction.
+    Returns per-item results in input order; replayed readings are reported
+    as "duplicate" (or "updated") rather than failed.
+    """
+    error = _check_batch_size(items)
+    if error:
+        return error, status.HTTP_400_BAD_REQUEST
+
+    results, valid_indexes, valid_data = _validate_batch(items)
 
-        return Response(response_data, status=status.HTTP_201_CREATED)
+    if settings.READINGS_SPOOL_ENABLED:
+        if valid_data:
+            spool_readings(valid_data, on_conflict)
+        return _queued_batch_result(items, results, valid_indexes)
+
+    ingested = write_readings(valid_data, on_conflict) if valid_data else []
+    return _batch_result(items, results, valid_indexes, ingested)
+
+
+def _reading_result(reading, alert, outcome):
+    response_data = ReadingSerializer(reading).data
+
+    if alert:
+        response_data["alert"] = alert_summary(alert)
+
+    if outcome == CREATED:
+        return response_data, status.HTTP_201_CREATED
+    return response_data, status.HTTP_200_OK
+
+
+def _batch_result(items, results, valid_indexes, ingested):
+    counts = {CREATED: 0, UPDATED: 0, DUPLICATE: 0}
+    for index, (reading, alert, outcome) in zip(valid_indexes, ingested):
+        counts[outcome] += 1
+        results[index] = {
+            "index": index,
+            "status": outcome,
+            "id": reading.id,
+            "alert": alert_summary(alert) if alert else None,
+        }
+
+    failed = len(items) - len(ingested)
+    if failed and not ingested:
+        response_status = status.HTTP_400_BAD_REQUEST
+    elif failed:
+        response_status = status.HTTP_207_MULTI_STATUS
+    elif counts[CREATED]:
+        response_status = status.HTTP_201_CREATED
+    else:
+        # Reintento completo: nada nuevo que crear
+        response_status = status.HTTP_200_OK
+
+    return {
+        "created": counts[CREATED],
+        "updated": counts[UPDATED],
+        "duplicates": counts[DUPLICATE],
+        "failed": failed,
+        "results": results,
+    }, response_status
+
+
+def _queued_reading_result():
+    return {"status": "queued"}, status.HTTP_202_ACCEPTED
+
+
+def _queued_batch_result(items, results, valid_indexes):
+    """
+    Results of a batch whose valid readings were queued on the ingest spool.
+    """
+    for index in valid_indexes:
+        results[index] = {"index": index, "status": "queued"}
+
+    queued = len(valid_indexes)
+    failed = len(items) - queued
+    if not queued:
+        response_status = status.HTTP_400_BAD_REQUEST
+    elif failed:
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_202_ACCEPTED
+
+    return {"queued": queued, "failed": failed, "results": results}, response_status
 
 
 @api_view(['GET', 'PATCH', 'DELETE'])
@@ -86,12 +234,12 @@ def reading_detail(request, pk):
     if request.method == 'PATCH':
         serializer = ReadingSerializer(reading, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            update_reading(serializer)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     if request.method == 'DELETE':
-        reading.delete()
+        delete_reading(reading)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -101,10 +249,15 @@ def reading_detail(request, pk):
 @api_view(['GET'])
 @permission_classes([IsAdminOrReadOnly])
 def latest_readings(request):
-    interval = int(request.query_params.get('interval', 60))
-    unit = request.query_params.get('unit', 'minutes')
-    node_id = request.query_params.get('node_id')
-    sensor_id = request.query_params.get('sensor_id')
+    readings = _latest_readings_queryset(request.query_params)
+    return Response(READING_ROWS.encode_queryset(readings))
+
+
+def _latest_readings_queryset(params):
+    interval = int(params.get('interval', 60))
+    unit = params.get('unit', 'minutes')
+    node_id = params.get('node_id')
+    sensor_id = params.get('sensor_id')
 
     # Calculamos la fecha/hora límite
     if unit == 'seconds':
@@ -119,6 +272,154 @@ def latest_readings(request):
     if sensor_id:
         readings = readings.filter(sensor__id=sensor_id)
 
-    readings = readings.order_by('-timestamp')
-    serializer = ReadingSerializer(readings, many=True)
-    return Response(serializer.data)
+    return readings.order_by('-timestamp')
+
+
+# -----------------------------
+# Snapshot: último valor por sensor
+# -----------------------------
+@api_view(['GET'])
+@permission_classes([IsAdminOrReadOnly])
+def reading_snapshot(request):
+    """
+    Latest reading of every active sensor.
+    Query params:
+      - node_id
+    """
+    node_id = request.query_params.get('node_id')
+    if node_id and not node_id.isdigit():
+        return Response({"error": "node_id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(get_snapshot(node_id=int(node_id) if node_id else None))
+
+
+# -----------------------------
+# Fast path asíncrono (ASGI): no ocupa un hilo por conexión
+# -----------------------------
+@async_api_view(['POST'], permission_classes=(IsAdminOrReadOnly,))
+async def reading_ingest_async(request):
+    """
+    Native async counterpart of POST on reading_list_create, with the same
+    request and response contract (JSON or binary frames, batches,
+    on_conflict, spool).
+    """
+    on_conflict, error = _parse_on_conflict(request.GET)
+    if error:
+        return json_response(error, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        data = _parse_ingest_body(request)
+    except ParseError as exc:
+        return json_response({"detail": exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+    if isinstance(data, list):
+        error = _check_batch_size(data)
+        if error:
+            return json_response(error, status=status.HTTP_400_BAD_REQUEST)
+        items = data
+    else:
+        items = [data]
+
+    # La validación consulta sensor y nodo con el ORM síncrono
+    results, valid_indexes, valid_data = await sync_to_async(_validate_batch)(items)
+
+    if not isinstance(data, list) and not valid_data:
+        return json_response(results[0]["errors"], status=status.HTTP_400_BAD_REQUEST)
+
+    if settings.READINGS_SPOOL_ENABLED:
+        if valid_data:
+            await sync_to_async(spool_readings)(valid_data, on_conflict)
+        if not isinstance(data, list):
+            return json_response(*_queued_reading_result())
+        return json_response(*_queued_batch_result(items, results, valid_indexes))
+
+    ingested = await awrite_readings(valid_data, on_conflict) if valid_data else []
+    if not isinstance(data, list):
+        return json_response(*_reading_result(*ingested[0]))
+    return json_response(*_batch_result(items, results, valid_indexes, ingested))
+
+
+def _parse_ingest_body(request):
+    if request.content_type == ReadingFrameParser.media_type:
+        return ReadingFrameParser().parse(request)
+    try:
+        return json.loads(request.body)
+    except ValueError as exc:
+        raise ParseError(f"JSON parse error - {exc}")
+
+
+@async_api_view(['GET'], permission_classes=(IsAdminOrReadOnly,))
+async def latest_readings_async(request):
+    """
+    Native async counterpart of latest_readings. With ``wait`` (seconds),
+    it long-polls: an empty result is retried until readings arrive or the
+    wait expires, without holding a worker thread.
+    """
+    try:
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        wait = math.nan
+    # nan/inf harían que el plazo no venciera nunca
+    if not math.isfinite(wait):
+        return json_response({"error": "wait must be a number of seconds"}, status=status.HTTP_400_BAD_REQUEST)
+    wait = max(0.0, min(wait, settings.READINGS_LONG_POLL_MAX_WAIT))
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        rows = READING_ROWS.values_list(_latest_readings_queryset(request.GET))
+        readings = [row async for row in rows]
+        if readings or loop.time() >= deadline:
+            break
+        await asyncio.sleep(settings.READINGS_LONG_POLL_INTERVAL)
+
+    return json_response(READING_ROWS.encode(readings))
+
+
+@async_api_view(['GET'], permission_classes=(IsAdminOrReadOnly,))
+async def reading_stream(request):
+    """
+    Server-Sent Events tail of new readings, instead of polling
+    latest_readings. Query params:
+      - node_id, sensor_id: comma-separated ids; a reading of any of them
+        is sent (all readings if neither is given)
+      - max_rate: events per second (default and cap
+        READINGS_STREAM_MAX_RATE); readings in between are coalesced
+    Resumes after the reading id in ``Last-Event-ID`` (or
+    ``last_event_id``) with the readings stored since.
+    """
+    params = request.GET
+    node_ids, error = _id_list(params, 'node_id')
+    if not error:
+        sensor_ids, error = _id_list(params, 'sensor_id')
+    if error:
+        return json_response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        max_rate = min(float(params.get('max_rate', settings.READINGS_STREAM_MAX_RATE)),
+                       settings.READINGS_STREAM_MAX_RATE)
+    except ValueError:
+        max_rate = 0
+    if not max_rate > 0:
+        return json_response({"error": "max_rate must be a positive number"}, status=status.HTTP_400_BAD_REQUEST)
+
+    last_id = request_last_event_id(request)
+    tail = ReadingTail(
+        node_ids=node_ids,
+        sensor_ids=sensor_ids,
+        interval=1 / max_rate,
+        last_id=int(last_id) if last_id and last_id.isdigit() else last_id,
+    )
+    return sse_response(tail.events())
+
+
+def _id_list(params, param):
+    """
+    Returns ``(ids, error)`` for a comma-separated id parameter.
+    """
+    value = params.get(param)
+    if not value:
+        return [], None
+    ids = value.split(',')
+    if not all(item.isdigit() for item in ids):
+        return None, f"{param} must be a comma-separated list of integers"
+    return [int(item) for item in ids], None
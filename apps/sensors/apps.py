@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class SensorsConfig(AppConfig):
     name = 'apps.sensors'
+
+    def ready(self):
+        # Registra los signals que invalidan el registro de sensores
+        import apps.sensors.signals
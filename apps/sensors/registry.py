@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from .models import Sensor
+
+
+# Lo que el ingest necesita saber de un sensor, sin tocar la base de datos
+SensorEntry = namedtuple("SensorEntry", ("id", "node_id", "sensor_type", "unit", "is_active"))
+
+# Un id desconocido recarga el registro como mucho una vez por intervalo
+# (sensores creados por otro proceso), sin permitir una consulta por lectura
+MISS_RELOAD_INTERVAL = 1.0
+
+
+# -----------------------------
+# Registro en proceso: {sensor_id: SensorEntry}
+# -----------------------------
+_lock = threading.Lock()
+_entries = None
+_loaded_at = 0.0
+_generation = 0
+
+
+def clear_sensor_registry():
+    """
+    Drop the in-process registry; the next lookup reloads it.
+    """
+    global _entries, _generation
+    with _lock:
+        _entries = None
+        _generation += 1
+
+
+def _load_entries():
+    global _entries, _loaded_at
+    with _lock:
+        generation = _generation
+
+    rows = Sensor.objects.filter(is_deleted=False, node__is_deleted=False).values_list(
+        "id", "node_id", "sensor_type", "unit", "is_active", "node__is_active"
+    )
+    entries = {
+        sensor_id: SensorEntry(sensor_id, node_id, sensor_type, unit, is_active and node_is_active)
+        for sensor_id, node_id, sensor_type, unit, is_active, node_is_active in rows
+    }
+
+    with _lock:
+        # Si se invalidó mientras se cargaba, lo leído puede estar desfasado:
+        # se devuelve pero no se guarda
+        if generation == _generation:
+            _entries = entries
+            _loaded_at = time.monotonic()
+    return entries
+
+
+def _cached_entries():
+    with _lock:
+        entries = _entries
+        age = time.monotonic() - _loaded_at
+    if entries is None or age >= settings.SENSOR_REGISTRY_TTL:
+        return _load_entries(), 0.0
+    return entries, age
+
+
+def get_sensor(sensor_id):
+    """
+    Registry entry of a sensor, or ``None`` if it does not exist or it or
+    its node is soft-deleted. ``is_active`` is false when either the sensor
+    or its node is deactivated.
+
+    The registry is invalidated by the Sensor and Node signals; queryset
+    ``update()`` calls bypass them and are picked up after
+    ``SENSOR_REGISTRY_TTL`` seconds.
+    """
+    entries, age = _cached_entries()
+    entry = entries.get(sensor_id)
+    if entry is None and age >= MISS_RELOAD_INTERVAL:
+        entry = _load_entries().get(sensor_id)
+    return entry
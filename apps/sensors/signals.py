@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Sensor
+from .registry import clear_sensor_registry
+from apps.core.versions import bump_version
+from apps.nodes.models import Node
+
+
+# El registro de sensores del ingest se invalida con cualquier cambio de un
+# sensor o de su nodo (alta, edición, desactivación, borrado lógico o físico).
+# Se limpia ya, para que la propia transacción vea el cambio, y otra vez al
+# confirmar, por si otro hilo recargó el estado anterior entretanto.
+
+@receiver(post_save, sender=Sensor)
+@receiver(post_delete, sender=Sensor)
+@receiver(post_save, sender=Node)
+@receiver(post_delete, sender=Node)
+def invalidate_sensor_registry(sender, **kwargs):
+    clear_sensor_registry()
+    transaction.on_commit(clear_sensor_registry)
+
+
+# Versión de la colección para los GET condicionales (ETag) de sensores
+@receiver(post_save, sender=Sensor)
+@receiver(post_delete, sender=Sensor)
+def bump_sensors_version(sender, **kwargs):
+    bump_version(Sensor)
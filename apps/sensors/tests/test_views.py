@@ -70,7 +70,7 @@ class SensorViewTests(APITestCase):
         self.client.force_authenticate(user=self.other_user)
         response = self.client.get(self.sensor_list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_unauthenticated_user_cannot_list_sensors(self):
         response = self.client.get(self.sensor_list_url)
@@ -171,3 +171,25 @@ class SensorViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.sensor_2.refresh_from_db()
         self.assertFalse(self.sensor_2.is_deleted)
+
+    # --------------------------------------------------
+    # GET condicional (ETag / If-None-Match)
+    # --------------------------------------------------
+    def test_sensor_etag_follows_sensor_changes_only(self):
+        self.client.force_authenticate(user=self.other_user)
+        etag = self.client.get(self.sensor_list_url)["ETag"]
+        detail_etag = self.client.get(self.sensor_detail_url(self.sensor_1))["ETag"]
+
+        # Editar el nodo no cambia la representación de los sensores
+        self.node.name = "Renamed node"
+        self.node.save()
+        response = self.client.get(self.sensor_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.sensor_detail_url(self.sensor_1), HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.sensor_2.delete()
+        response = self.client.get(self.sensor_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([s["id"] for s in response.data["results"]], [self.sensor_1.id])
+        self.assertNotEqual(response["ETag"], etag)
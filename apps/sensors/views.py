@@ -1,6 +1,8 @@
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsAdminOrReadOnly , IsOwnerAndAdminOrReadOnly
+from apps.core.versions import collection_etag, not_modified, with_etag
 from rest_framework.response import Response
 
 from .models import Sensor
@@ -14,13 +16,20 @@ from .serializers import SensorSerializer
 @permission_classes([IsAdminOrReadOnly])
 def sensor_list_create(request):
     """
-    List all sensors or create a new sensor.
+    List sensors (cursor-paginated) or create a new sensor.
     All actions require authentication.
+    GET supports conditional requests (ETag / If-None-Match).
     """
     if request.method == 'GET':
-        sensors = Sensor.objects.filter(is_deleted=False)
+        # Sin cambios en la colección: 304 sin consultar los sensores
+        etag = collection_etag(request, Sensor)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        paginator = KeysetPagination(ordering=('id',))
+        sensors = paginator.paginate_queryset(Sensor.objects.filter(is_deleted=False), request)
         serializer = SensorSerializer(sensors, many=True)
-        return Response(serializer.data)
+        return with_etag(paginator.get_paginated_response(serializer.data), etag)
 
     if request.method == 'POST':
         serializer = SensorSerializer(data=request.data)
@@ -41,7 +50,14 @@ def sensor_list_create(request):
 def sensor_detail(request, pk):
     """
     Retrieve, update, or delete a sensor by pk.
+    GET supports conditional requests (ETag / If-None-Match).
     """
+    if request.method == 'GET':
+        etag = collection_etag(request, Sensor)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+
     try:
         sensor = Sensor.objects.get(pk=pk, is_deleted=False)
     except Sensor.DoesNotExist:
@@ -52,7 +68,7 @@ def sensor_detail(request, pk):
 
     if request.method == 'GET':
         serializer = SensorSerializer(sensor)
-        return Response(serializer.data)
+        return with_etag(Response(serializer.data), etag)
 
     if request.method == 'PATCH':
         if request.user != sensor.node.user:
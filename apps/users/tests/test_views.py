@@ -34,7 +34,7 @@ class UserViewsTests(APITestCase):
         self.authenticate(self.admin_user)
         response = self.client.get(self.list_create_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 2)
+        self.assertGreaterEqual(len(response.data['results']), 2)
 
     def test_non_admin_cannot_list_users(self):
         self.authenticate(self.normal_user)
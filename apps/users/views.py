@@ -6,6 +6,7 @@ from django.contrib.auth import get_user_model, authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from .serializers import UserSerializer
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsAdmin
 
 User = get_user_model()
@@ -18,12 +19,13 @@ User = get_user_model()
 @permission_classes([IsAdmin])
 def user_list_create(request):
     """
-    List all users or create a new user (admin only).
+    List users (cursor-paginated) or create a new user (admin only).
     """
     if request.method == 'GET':
-        users = User.objects.all()
+        paginator = KeysetPagination(ordering=('id',))
+        users = paginator.paginate_queryset(User.objects.all(), request)
         serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     if request.method == 'POST':
         serializer = UserSerializer(data=request.data)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class WebhooksConfig(AppConfig):
+    name = 'apps.webhooks'
+
+    def ready(self):
+        # Registra los signals que encolan las entregas de alertas
+        import apps.webhooks.signals
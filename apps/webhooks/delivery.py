@@ -0,0 +1,404 @@
+import hashlib
+import heapq
+import hmac
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import WebhookDeadLetter, WebhookSubscription
+from apps.alerts.models import Alert
+from apps.alerts.serializers import ALERT_ROWS
+from infrastructure.http import DisallowedAddress, KeepAliveClient
+
+
+logger = logging.getLogger(__name__)
+
+ALERT_OPENED = "alert.opened"
+
+# Respuestas que se reintentan; cualquier otro 4xx va directo a dead letter
+RETRYABLE_STATUSES = (408, 425, 429)
+
+# Duraciones de las últimas entregas correctas, para los percentiles
+LATENCY_SAMPLES = 1000
+
+_WAKE = object()
+
+
+class _Delivery:
+    """
+    One POST to one subscription: up to ``batch_size`` events, signed
+    once and sent with the same body (and delivery id) on every attempt.
+    """
+    __slots__ = ("id", "subscription_id", "url", "secret", "payload", "event_count", "body",
+                 "attempts", "last_status", "last_error")
+
+    def __init__(self, subscription_id, url, secret, payload, event_count):
+        self.id = str(uuid.uuid4())
+        self.subscription_id = subscription_id
+        self.url = url
+        self.secret = secret
+        self.payload = payload
+        self.event_count = event_count
+        self.body = json.dumps(payload, cls=JSONEncoder, separators=(",", ":")).encode()
+        self.attempts = 0
+        self.last_status = None
+        self.last_error = ""
+
+    def headers(self):
+        signature = hmac.new(self.secret.encode(), self.body, hashlib.sha256).hexdigest()
+        return {
+            "Content-Type": "application/json",
+            "X-Webhook-Delivery": self.id,
+            "X-Webhook-Signature": f"sha256={signature}",
+        }
+
+
+class WebhookDispatcher:
+    """
+    Delivers alert events to webhook subscriptions off the request threads.
+
+    ``enqueue(alert_ids)`` only queues. A batcher thread gathers the ids for
+    ``batch_window`` seconds, loads the alerts and their owners' active
+    subscriptions, and queues one signed POST per subscription with up to
+    ``batch_size`` events. ``workers`` threads send them, each over its own
+    keep-alive connections.
+
+    Network errors, 5xx, 408, 425 and 429 are retried with exponential
+    backoff (``backoff * 2 ** (attempt - 1)`` seconds) up to
+    ``max_attempts``; deliveries that exhaust them, get another 4xx, or are
+    still waiting for a retry on ``stop()`` are stored as
+    ``WebhookDeadLetter`` rows. ``metrics()`` reports delivery counters.
+
+    URLs whose host resolves to a non-public address are dead-lettered
+    without a request unless ``allow_private``. Dead letters record the
+    status or the error type only, never the receiver's response body.
+    """
+
+    def __init__(self, workers=4, batch_window=1.0, batch_size=100, max_attempts=5, backoff=1.0, timeout=5.0,
+                 allow_private=False):
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.timeout = timeout
+        self.allow_private = allow_private
+
+        self._events = queue.Queue()
+        self._work = queue.Queue()
+        self._retries = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+        self._counters = dict.fromkeys((
+            "events_enqueued", "deliveries_sent", "events_delivered", "attempts_failed",
+            "retries_scheduled", "dead_lettered", "connections_opened",
+        ), 0)
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+        self._batcher = threading.Thread(target=self._run_batcher, name="webhook-batcher", daemon=True)
+        self._workers = [
+            threading.Thread(target=self._run_worker, name=f"webhook-worker-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        self._batcher.start()
+        for worker in self._workers:
+            worker.start()
+
+    def enqueue(self, alert_ids):
+        alert_ids = list(alert_ids)
+        self._count("events_enqueued", len(alert_ids))
+        for alert_id in alert_ids:
+            self._events.put(alert_id)
+
+    def redeliver(self, dead_letter):
+        """
+        Queue the payload of a ``WebhookDeadLetter`` again, with a fresh
+        attempt budget, to its subscription's current URL and secret.
+        """
+        subscription = dead_letter.subscription
+        delivery = _Delivery(
+            subscription.id, subscription.url, subscription.secret,
+            dead_letter.payload, dead_letter.event_count,
+        )
+        self._submit([delivery])
+
+    def flush(self):
+        """
+        Batch what is queued now and wait until every delivery has been
+        delivered or dead-lettered (retries included).
+        """
+        batched = threading.Event()
+        self._events.put(batched)
+        batched.wait()
+        with self._idle:
+            self._idle.wait_for(lambda: self._outstanding == 0)
+
+    def stop(self):
+        """
+        Batch and attempt what is queued, dead-letter pending retries and
+        stop the threads.
+        """
+        self._events.put(None)
+        self._batcher.join()
+        for worker in self._workers:
+            worker.join()
+        with self._lock:
+            pending = [delivery for _, _, delivery in self._retries]
+            self._retries = []
+        for delivery in pending:
+            delivery.last_error = delivery.last_error or "Dispatcher stopped"
+            self._dead_letter(delivery)
+        close_old_connections()
+
+    def metrics(self):
+        with self._lock:
+            data = dict(self._counters)
+            latencies = sorted(self._latencies)
+            data["retries_pending"] = len(self._retries)
+        data["queue_depth"] = self._work.qsize()
+        data["latency_p50_ms"] = _percentile(latencies, 0.50)
+        data["latency_p99_ms"] = _percentile(latencies, 0.99)
+        return data
+
+    # -----------------------------
+    # Lotes
+    # -----------------------------
+
+    def _run_batcher(self):
+        pending = []
+        deadline = None
+        while True:
+            try:
+                item = self._events.get(timeout=self._next_timeout(deadline))
+            except queue.Empty:
+                item = _WAKE
+            stopping = item is None
+            if isinstance(item, int):
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.batch_window
+
+            flush = stopping or isinstance(item, threading.Event)
+            if pending and (flush or time.monotonic() >= deadline):
+                self._batch(pending)
+                pending, deadline = [], None
+            self._release_due_retries()
+
+            if isinstance(item, threading.Event):
+                item.set()
+            if stopping:
+                for _ in self._workers:
+                    self._work.put(None)
+                return
+
+    def _next_timeout(self, deadline):
+        now = time.monotonic()
+        timeouts = []
+        if deadline is not None:
+            timeouts.append(deadline - now)
+        with self._lock:
+            if self._retries:
+                timeouts.append(self._retries[0][0] - now)
+        return max(min(timeouts), 0) if timeouts else None
+
+    def _batch(self, alert_ids):
+        try:
+            deliveries = self._build_deliveries(alert_ids)
+        except Exception:
+            logger.exception("Could not build webhook deliveries for %d alerts", len(alert_ids))
+            return
+        finally:
+            close_old_connections()
+        self._submit(deliveries)
+
+    def _build_deliveries(self, alert_ids):
+        """
+        One delivery per active subscription of the alerts' owners and
+        ``batch_size`` events, with three queries for the whole batch.
+        """
+        alerts = Alert.objects.filter(id__in=set(alert_ids)).order_by("id")
+        owners = dict(alerts.values_list("id", "node__user_id"))
+        subscriptions = WebhookSubscription.objects.filter(owner_id__in=set(owners.values()), is_active=True)
+        if not subscriptions:
+            return []
+
+        events = {}
+        for alert in ALERT_ROWS.encode_queryset(alerts):
+            events.setdefault(owners[alert["id"]], []).append({"type": ALERT_OPENED, "alert": alert})
+
+        deliveries = []
+        for subscription in subscriptions:
+            owner_events = events.get(subscription.owner_id, [])
+            for start in range(0, len(owner_events), self.batch_size):
+                chunk = owner_events[start:start + self.batch_size]
+                deliveries.append(_Delivery(
+                    subscription.id, subscription.url, subscription.secret, {"events": chunk}, len(chunk)
+                ))
+        return deliveries
+
+    def _submit(self, deliveries):
+        with self._lock:
+            self._outstanding += len(deliveries)
+        for delivery in deliveries:
+            self._work.put(delivery)
+
+    def _release_due_retries(self):
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._retries and self._retries[0][0] <= now:
+                due.append(heapq.heappop(self._retries)[2])
+        for delivery in due:
+            self._work.put(delivery)
+
+    # -----------------------------
+    # Envío
+    # -----------------------------
+
+    def _run_worker(self):
+        client = KeepAliveClient(timeout=self.timeout, allow_private=self.allow_private)
+        try:
+            while True:
+                delivery = self._work.get()
+                if delivery is None:
+                    return
+                opened = client.connections_opened
+                self._attempt(client, delivery)
+                self._count("connections_opened", client.connections_opened - opened)
+        finally:
+            client.close()
+            close_old_connections()
+
+    def _attempt(self, client, delivery):
+        delivery.attempts += 1
+        started = time.monotonic()
+        try:
+            response = client.post(delivery.url, delivery.body, delivery.headers())
+        except Exception as exc:
+            # Sólo el tipo: el mensaje puede exponer detalles de la red interna
+            delivery.last_status, delivery.last_error = None, type(exc).__name__
+            retryable = not isinstance(exc, DisallowedAddress)
+        else:
+            if 200 <= response.status < 300:
+                self._delivered(delivery, time.monotonic() - started)
+                return
+            delivery.last_status, delivery.last_error = response.status, f"HTTP {response.status}"
+            retryable = response.status >= 500 or response.status in RETRYABLE_STATUSES
+
+        self._count("attempts_failed")
+        if retryable and delivery.attempts < self.max_attempts:
+            due = time.monotonic() + self.backoff * 2 ** (delivery.attempts - 1)
+            with self._lock:
+                heapq.heappush(self._retries, (due, delivery.id, delivery))
+                self._counters["retries_scheduled"] += 1
+            # El batcher recalcula cuánto esperar
+            self._events.put(_WAKE)
+            return
+        self._dead_letter(delivery)
+
+    def _delivered(self, delivery, elapsed):
+        with self._idle:
+            self._counters["deliveries_sent"] += 1
+            self._counters["events_delivered"] += delivery.event_count
+            self._latencies.append(elapsed * 1000)
+            self._finish()
+
+    def _dead_letter(self, delivery):
+        logger.warning(
+            "Webhook delivery %s to subscription %s failed after %d attempts: %s",
+            delivery.id, delivery.subscription_id, delivery.attempts, delivery.last_error,
+        )
+        try:
+            WebhookDeadLetter.objects.create(
+                subscription_id=delivery.subscription_id,
+                payload=delivery.payload,
+                event_count=delivery.event_count,
+                attempts=delivery.attempts,
+                last_status=delivery.last_status,
+                last_error=delivery.last_error,
+            )
+        except Exception:
+            logger.exception("Could not store dead letter for webhook delivery %s", delivery.id)
+        finally:
+            close_old_connections()
+        with self._idle:
+            self._counters["dead_lettered"] += 1
+            self._finish()
+
+    def _finish(self):
+        # Con self._idle adquirido
+        self._outstanding -= 1
+        if self._outstanding == 0:
+            self._idle.notify_all()
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] += amount
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    return round(values[min(int(len(values) * fraction), len(values) - 1)], 2)
+
+
+# -----------------------------
+# Dispatcher del proceso
+# -----------------------------
+_lock = threading.Lock()
+_dispatcher = None
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _lock:
+        if _dispatcher is None:
+            _dispatcher = WebhookDispatcher(
+                workers=settings.WEBHOOKS_WORKERS,
+                batch_window=settings.WEBHOOKS_BATCH_WINDOW,
+                batch_size=settings.WEBHOOKS_BATCH_SIZE,
+                max_attempts=settings.WEBHOOKS_MAX_ATTEMPTS,
+                backoff=settings.WEBHOOKS_BACKOFF,
+                timeout=settings.WEBHOOKS_TIMEOUT,
+                allow_private=settings.WEBHOOKS_ALLOW_PRIVATE_ADDRESSES,
+            )
+        return _dispatcher
+
+
+def stop_dispatcher():
+    """
+    Stop the process dispatcher (see ``WebhookDispatcher.stop``); the next
+    use starts a new one.
+    """
+    global _dispatcher
+    with _lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.stop()
+
+
+def dispatcher_metrics():
+    """
+    Metrics of the process dispatcher, or ``None`` if it has not started.
+    """
+    with _lock:
+        dispatcher = _dispatcher
+    return dispatcher.metrics() if dispatcher is not None else None
+
+
+def notify_alerts(alerts):
+    """
+    Queue webhook deliveries for newly opened ``alerts``; returns
+    immediately. No-op unless WEBHOOKS_ENABLED.
+    """
+    if not settings.WEBHOOKS_ENABLED:
+        return
+    get_dispatcher().enqueue(alert.id for alert in alerts)
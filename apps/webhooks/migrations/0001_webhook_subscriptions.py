@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-17 22:45
+
+import apps.webhooks.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookSubscription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, verbose_name='Target URL')),
+                ('secret', models.CharField(default=apps.webhooks.models.generate_secret, editable=False, max_length=64, verbose_name='Signing secret')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Active')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creation date')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='webhook_subscriptions', to=settings.AUTH_USER_MODEL, verbose_name='Owner')),
+            ],
+            options={
+                'verbose_name': 'Webhook subscription',
+                'verbose_name_plural': 'Webhook subscriptions',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WebhookDeadLetter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField(verbose_name='Payload')),
+                ('event_count', models.PositiveIntegerField(verbose_name='Events')),
+                ('attempts', models.PositiveIntegerField(verbose_name='Attempts')),
+                ('last_status', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Last HTTP status')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creation date')),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dead_letters', to='webhooks.webhooksubscription', verbose_name='Subscription')),
+            ],
+            options={
+                'verbose_name': 'Webhook dead letter',
+                'verbose_name_plural': 'Webhook dead letters',
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='webhooksubscription',
+            index=models.Index(fields=['owner', 'is_active'], name='webhook_owner_active_idx'),
+        ),
+    ]
@@ -0,0 +1,103 @@
+import secrets
+
+from django.conf import settings
+from django.db import models
+
+
+def generate_secret():
+    return secrets.token_hex(32)
+
+
+class WebhookSubscription(models.Model):
+    """
+    An owner's endpoint for alert events: every alert opened on one of the
+    owner's nodes is POSTed to ``url`` as JSON, signed with ``secret``.
+    """
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="webhook_subscriptions",
+        verbose_name="Owner"
+    )
+
+    url = models.URLField(
+        max_length=500,
+        verbose_name="Target URL"
+    )
+
+    # Clave HMAC-SHA256 de la cabecera X-Webhook-Signature
+    secret = models.CharField(
+        max_length=64,
+        default=generate_secret,
+        editable=False,
+        verbose_name="Signing secret"
+    )
+
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name="Active"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        editable=False,
+        verbose_name="Creation date"
+    )
+
+    class Meta:
+        verbose_name = "Webhook subscription"
+        verbose_name_plural = "Webhook subscriptions"
+        ordering = ["id"]
+        # Suscripciones activas de los dueños de las alertas de un lote
+        indexes = [
+            models.Index(fields=["owner", "is_active"], name="webhook_owner_active_idx"),
+        ]
+
+    def __str__(self):
+        return f"Webhook #{self.pk} -> {self.url}"
+
+
+class WebhookDeadLetter(models.Model):
+    """
+    A delivery that failed every attempt. Keeps the exact payload so it
+    can be redelivered.
+    """
+
+    subscription = models.ForeignKey(
+        WebhookSubscription,
+        on_delete=models.CASCADE,
+        related_name="dead_letters",
+        verbose_name="Subscription"
+    )
+
+    payload = models.JSONField(verbose_name="Payload")
+
+    event_count = models.PositiveIntegerField(verbose_name="Events")
+
+    attempts = models.PositiveIntegerField(verbose_name="Attempts")
+
+    last_status = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Last HTTP status"
+    )
+
+    last_error = models.TextField(
+        blank=True,
+        verbose_name="Last error"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        editable=False,
+        verbose_name="Creation date"
+    )
+
+    class Meta:
+        verbose_name = "Webhook dead letter"
+        verbose_name_plural = "Webhook dead letters"
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"Dead letter #{self.pk} ({self.subscription_id})"
@@ -0,0 +1,56 @@
+import socket
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from rest_framework import serializers
+from .models import WebhookDeadLetter, WebhookSubscription
+from infrastructure.http import DisallowedAddress, resolve_public_address
+
+
+class WebhookSubscriptionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WebhookSubscription
+        fields = (
+            "id",
+            "owner",
+            "url",
+            "secret",
+            "is_active",
+            "created_at",
+        )
+        read_only_fields = (
+            "id",
+            "owner",
+            "secret",
+            "created_at",
+        )
+
+    def validate_url(self, value):
+        # Se vuelve a comprobar en cada conexión del dispatcher: el DNS
+        # puede cambiar después de guardar
+        parts = urlsplit(value)
+        if parts.scheme not in ("http", "https"):
+            raise serializers.ValidationError("Only http and https URLs are allowed.")
+        try:
+            resolve_public_address(parts.hostname, parts.port or 443, settings.WEBHOOKS_ALLOW_PRIVATE_ADDRESSES)
+        except DisallowedAddress:
+            raise serializers.ValidationError("The URL must point to a public address.")
+        except (socket.gaierror, UnicodeError):
+            raise serializers.ValidationError("The URL host could not be resolved.")
+        return value
+
+
+class WebhookDeadLetterSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WebhookDeadLetter
+        fields = (
+            "id",
+            "subscription",
+            "payload",
+            "event_count",
+            "attempts",
+            "last_status",
+            "last_error",
+            "created_at",
+        )
+        read_only_fields = fields
@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .delivery import notify_alerts
+from apps.alerts.models import Alert
+from apps.alerts.signals import alerts_opened
+
+
+# Como las notificaciones por e-mail: se encola sólo al confirmar la
+# transacción y el ingest nunca espera a los webhooks
+
+@receiver(alerts_opened)
+def deliver_opened_alerts(sender, alerts, **kwargs):
+    transaction.on_commit(lambda: notify_alerts(alerts))
+
+
+@receiver(post_save, sender=Alert)
+def deliver_created_alert(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: notify_alerts([instance]))
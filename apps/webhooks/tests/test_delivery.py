@@ -0,0 +1,135 @@
+# apps/webhooks/tests/test_delivery.py
+# py .\manage.py test apps.webhooks.tests.test_delivery
+
+import hashlib
+import hmac
+
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from datetime import timedelta
+
+from apps.users.models import User
+from apps.nodes.models import Node
+from apps.sensors.models import Sensor
+from apps.readings.models import Reading
+from apps.readings.services import ingest_readings
+from apps.webhooks.delivery import get_dispatcher, stop_dispatcher
+from apps.webhooks.models import WebhookDeadLetter, WebhookSubscription
+from infrastructure.testing import LocalHTTPReceiver
+
+
+@override_settings(
+    WEBHOOKS_ENABLED=True,
+    WEBHOOKS_WORKERS=1,
+    WEBHOOKS_BATCH_WINDOW=60,
+    WEBHOOKS_BATCH_SIZE=2,
+    WEBHOOKS_MAX_ATTEMPTS=3,
+    WEBHOOKS_BACKOFF=0.01,
+    WEBHOOKS_ALLOW_PRIVATE_ADDRESSES=True,
+)
+class WebhookDeliveryTests(TransactionTestCase):
+    """Tests para la entrega de alertas por webhook contra un receptor local"""
+
+    def setUp(self):
+        self.receiver = LocalHTTPReceiver().start()
+        self.addCleanup(self.receiver.stop)
+        self.addCleanup(stop_dispatcher)
+        self.base = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+
+        self.owner = User.objects.create_user(email="owner@test.com", password="pass", role=User.Roles.RESEARCHER)
+        self.other = User.objects.create_user(email="other@test.com", password="pass", role=User.Roles.RESEARCHER)
+        self.sensors = [self.create_sensor(self.owner, n) for n in range(3)]
+        self.other_sensor = self.create_sensor(self.other, 3)
+
+        self.subscription = WebhookSubscription.objects.create(owner=self.owner, url=self.receiver.url("/hooks"))
+        WebhookSubscription.objects.create(owner=self.other, url=self.receiver.url("/inactive"), is_active=False)
+
+    def create_sensor(self, owner, n):
+        node = Node.objects.create(name=f"Node {n}", location="Lab", user=owner)
+        return Sensor.objects.create(node=node, name=f"Sensor {n}", sensor_type=Sensor.SensorTypes.TEMPERATURE,
+                                     model="DHT22", unit="°C")
+
+    def open_incidents(self, sensors):
+        ingest_readings([
+            {"sensor_id": sensor.id, "node_id": sensor.node_id, "value": 50.0,
+             "timestamp": self.base, "validation_status": Reading.ValidationStatus.HIGH}
+            for sensor in sensors
+        ])
+
+    def test_1_events_are_batched_signed_and_sent_over_one_connection(self):
+        """1. Las alertas salen en lotes firmados, sólo al dueño, reutilizando la conexión"""
+        self.open_incidents(self.sensors + [self.other_sensor])
+        get_dispatcher().flush()
+
+        self.assertEqual([r.path for r in self.receiver.requests], ["/hooks", "/hooks"])
+        self.assertEqual(self.receiver.connections, 1)
+        bodies = self.receiver.json()
+        self.assertEqual([len(body["events"]) for body in bodies], [2, 1])
+        events = [event for body in bodies for event in body["events"]]
+        self.assertEqual({event["type"] for event in events}, {"alert.opened"})
+        self.assertEqual(sorted(event["alert"]["sensor"] for event in events), [s.id for s in self.sensors])
+
+        request = self.receiver.requests[0]
+        expected = hmac.new(self.subscription.secret.encode(), request.body, hashlib.sha256).hexdigest()
+        self.assertEqual(request.headers["X-Webhook-Signature"], f"sha256={expected}")
+        self.assertTrue(request.headers["X-Webhook-Delivery"])
+
+        metrics = get_dispatcher().metrics()
+        self.assertEqual(metrics["events_enqueued"], 4)
+        self.assertEqual(metrics["deliveries_sent"], 2)
+        self.assertEqual(metrics["events_delivered"], 3)
+        self.assertEqual(metrics["connections_opened"], 1)
+        self.assertIsNotNone(metrics["latency_p99_ms"])
+
+    def test_2_server_errors_are_retried_with_backoff(self):
+        """2. Los 5xx se reintentan con backoff y la entrega termina llegando"""
+        self.receiver.fail_next(2, status=503)
+        self.open_incidents(self.sensors[:1])
+        get_dispatcher().flush()
+
+        self.assertEqual(len(self.receiver.requests), 1)
+        metrics = get_dispatcher().metrics()
+        self.assertEqual(metrics["attempts_failed"], 2)
+        self.assertEqual(metrics["retries_scheduled"], 2)
+        self.assertEqual(metrics["deliveries_sent"], 1)
+        self.assertFalse(WebhookDeadLetter.objects.exists())
+
+    def test_3_exhausted_or_rejected_deliveries_are_dead_lettered(self):
+        """3. Agotar los intentos o un 4xx deja la entrega en dead letters"""
+        self.receiver.fail_next(3, status=500)
+        with self.assertLogs('apps.webhooks.delivery', level='WARNING'):
+            self.open_incidents(self.sensors[:1])
+            get_dispatcher().flush()
+
+        dead_letter = WebhookDeadLetter.objects.get()
+        self.assertEqual(dead_letter.subscription_id, self.subscription.id)
+        self.assertEqual(dead_letter.attempts, 3)
+        self.assertEqual(dead_letter.last_status, 500)
+        # Sólo el estado: el cuerpo de la respuesta no se guarda
+        self.assertEqual(dead_letter.last_error, "HTTP 500")
+        self.assertEqual(len(dead_letter.payload["events"]), 1)
+
+        self.receiver.fail_next(1, status=400)
+        with self.assertLogs('apps.webhooks.delivery', level='WARNING'):
+            self.open_incidents(self.sensors[1:2])
+            get_dispatcher().flush()
+        self.assertEqual(WebhookDeadLetter.objects.order_by('-id').first().attempts, 1)
+        self.assertEqual(self.receiver.requests, [])
+
+        # Reenviar el dead letter lo entrega con el mismo payload
+        get_dispatcher().redeliver(dead_letter)
+        get_dispatcher().flush()
+        self.assertEqual(self.receiver.json(), [dead_letter.payload])
+
+    @override_settings(WEBHOOKS_ALLOW_PRIVATE_ADDRESSES=False)
+    def test_4_private_addresses_are_not_contacted(self):
+        """4. Una URL que resuelve a una dirección interna va a dead letters sin enviar nada"""
+        with self.assertLogs('apps.webhooks.delivery', level='WARNING'):
+            self.open_incidents(self.sensors[:1])
+            get_dispatcher().flush()
+
+        self.assertEqual(self.receiver.requests, [])
+        dead_letter = WebhookDeadLetter.objects.get()
+        self.assertEqual((dead_letter.attempts, dead_letter.last_status), (1, None))
+        self.assertEqual(dead_letter.last_error, "DisallowedAddress")
+        self.assertEqual(get_dispatcher().metrics()["connections_opened"], 0)
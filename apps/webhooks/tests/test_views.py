@@ -0,0 +1,89 @@
+# apps/webhooks/tests/test_views.py
+# py .\manage.py test apps.webhooks.tests.test_views
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.users.models import User
+from apps.webhooks.delivery import get_dispatcher, stop_dispatcher
+from apps.webhooks.models import WebhookDeadLetter, WebhookSubscription
+from infrastructure.testing import LocalHTTPReceiver
+
+
+# Los receptores locales escuchan en 127.0.0.1
+@override_settings(WEBHOOKS_ALLOW_PRIVATE_ADDRESSES=True)
+class WebhookViewTests(TestCase):
+    """Tests para la API de suscripciones, dead letters y métricas"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(email="admin@test.com", password="pass", role=User.Roles.ADMIN)
+        self.researcher = User.objects.create_user(email="researcher@test.com", password="pass",
+                                                   role=User.Roles.RESEARCHER)
+        self.list_url = reverse('webhook-list-create')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.researcher)
+
+    def test_1_owner_manages_own_subscriptions(self):
+        """1. Cada usuario crea y ve sólo sus suscripciones; el secreto lo genera el servidor"""
+        response = self.client.post(self.list_url, {"url": "https://93.184.215.14/hook", "secret": "mine"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['owner'], self.researcher.id)
+        self.assertEqual(len(response.data['secret']), 64)
+        self.assertNotEqual(response.data['secret'], "mine")
+
+        foreign = WebhookSubscription.objects.create(owner=self.admin, url="https://93.184.215.14/admin")
+        response = self.client.get(self.list_url)
+        self.assertEqual([s['url'] for s in response.data['results']], ["https://93.184.215.14/hook"])
+        self.assertEqual(self.client.get(reverse('webhook-detail', args=[foreign.id])).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+        response = self.client.post(self.list_url, {"url": "not-a-url"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_2_dead_letters_can_be_listed_and_redelivered(self):
+        """2. Los dead letters propios se listan y se reenvían"""
+        receiver = LocalHTTPReceiver().start()
+        self.addCleanup(receiver.stop)
+        self.addCleanup(stop_dispatcher)
+
+        subscription = WebhookSubscription.objects.create(owner=self.researcher, url=receiver.url())
+        payload = {"events": [{"type": "alert.opened", "alert": {"id": 1}}]}
+        dead_letter = WebhookDeadLetter.objects.create(
+            subscription=subscription, payload=payload, event_count=1, attempts=5, last_status=503
+        )
+
+        response = self.client.get(reverse('webhook-dead-letter-list'))
+        self.assertEqual([d['id'] for d in response.data['results']], [dead_letter.id])
+
+        response = self.client.post(reverse('webhook-dead-letter-retry', args=[dead_letter.id]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        get_dispatcher().flush()
+        self.assertEqual(receiver.json(), [payload])
+        self.assertFalse(WebhookDeadLetter.objects.exists())
+
+    def test_3_metrics_are_admin_only(self):
+        """3. Las métricas de entrega sólo las ve un admin"""
+        url = reverse('webhook-metrics')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['dead_letters'], 0)
+
+    @override_settings(WEBHOOKS_ALLOW_PRIVATE_ADDRESSES=False)
+    def test_4_private_addresses_are_rejected(self):
+        """4. No se aceptan URLs hacia direcciones internas ni hosts que no resuelven"""
+        for url in ("http://127.0.0.1:8000/hook", "http://localhost/hook", "http://10.0.0.5/hook",
+                    "http://169.254.169.254/latest/meta-data", "http://[::1]/hook", "http://[::ffff:192.168.1.1]/",
+                    "http://unresolvable.invalid/hook", "ftp://93.184.215.14/hook"):
+            response = self.client.post(self.list_url, {"url": url})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+            self.assertIn('url', response.data)
+        self.assertFalse(WebhookSubscription.objects.exists())
+
+        with self.settings(WEBHOOKS_ALLOW_PRIVATE_ADDRESSES=True):
+            response = self.client.post(self.list_url, {"url": "http://127.0.0.1:8000/hook"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.webhook_list_create, name='webhook-list-create'),
+    path('<int:pk>/', views.webhook_detail, name='webhook-detail'),
+    path('dead-letters/', views.dead_letter_list, name='webhook-dead-letter-list'),
+    path('dead-letters/<int:pk>/retry/', views.dead_letter_retry, name='webhook-dead-letter-retry'),
+    path('metrics/', views.webhook_metrics, name='webhook-metrics'),
+]
@@ -0,0 +1,121 @@
+# apps/webhooks/views.py
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from apps.core.pagination import KeysetPagination
+from apps.core.permissions import IsAdmin
+from .delivery import dispatcher_metrics, get_dispatcher
+from .models import WebhookDeadLetter, WebhookSubscription
+from .serializers import WebhookDeadLetterSerializer, WebhookSubscriptionSerializer
+
+
+# -----------------------------
+# Suscripciones - Listado y creación
+# -----------------------------
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def webhook_list_create(request):
+    """
+    List the user's webhook subscriptions (cursor-paginated) or create one.
+    The signing secret is generated by the server.
+    """
+    if request.method == 'GET':
+        paginator = KeysetPagination(ordering=('id',))
+        subscriptions = WebhookSubscription.objects.filter(owner=request.user)
+        page = paginator.paginate_queryset(subscriptions, request)
+        serializer = WebhookSubscriptionSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    serializer = WebhookSubscriptionSerializer(data=request.data)
+    if serializer.is_valid():
+        serializer.save(owner=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+# -----------------------------
+# Suscripciones - Detalle
+# -----------------------------
+
+@api_view(['GET', 'PATCH', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def webhook_detail(request, pk):
+    """
+    Retrieve, update (url, is_active) or delete one of the user's
+    subscriptions.
+    """
+    try:
+        subscription = WebhookSubscription.objects.get(pk=pk, owner=request.user)
+    except WebhookSubscription.DoesNotExist:
+        return Response({"error": "Webhook subscription not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'GET':
+        return Response(WebhookSubscriptionSerializer(subscription).data)
+
+    if request.method == 'PATCH':
+        serializer = WebhookSubscriptionSerializer(subscription, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    subscription.delete()
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# -----------------------------
+# Dead letters
+# -----------------------------
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dead_letter_list(request):
+    """
+    Failed deliveries of the user's subscriptions, newest first
+    (cursor-paginated).
+    """
+    paginator = KeysetPagination(ordering=('-created_at', '-id'))
+    dead_letters = WebhookDeadLetter.objects.filter(subscription__owner=request.user)
+    page = paginator.paginate_queryset(dead_letters, request)
+    serializer = WebhookDeadLetterSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def dead_letter_retry(request, pk):
+    """
+    Queue a dead letter for delivery again and remove it; if it fails
+    again, a new dead letter is stored.
+    """
+    try:
+        dead_letter = WebhookDeadLetter.objects.select_related('subscription').get(
+            pk=pk, subscription__owner=request.user
+        )
+    except WebhookDeadLetter.DoesNotExist:
+        return Response({"error": "Dead letter not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    get_dispatcher().redeliver(dead_letter)
+    dead_letter.delete()
+    return Response(status=status.HTTP_202_ACCEPTED)
+
+
+# -----------------------------
+# Métricas de entrega
+# -----------------------------
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def webhook_metrics(request):
+    """
+    Delivery counters of this process's dispatcher (``null`` until it has
+    started) and the number of stored dead letters.
+    """
+    return Response({
+        "dispatcher": dispatcher_metrics(),
+        "dead_letters": WebhookDeadLetter.objects.count(),
+    })
@@ -0,0 +1,187 @@
+import asyncio
+import threading
+import uuid
+from collections import deque, namedtuple
+
+
+# Evento publicado: id "<época>-<secuencia>", tipo y datos ya serializables
+Event = namedtuple("Event", ("id", "seq", "type", "data"))
+
+_CLOSED = object()
+
+
+class Broker:
+    """
+    In-process publish/subscribe for server-sent event streams.
+
+    ``publish()`` may be called from any thread; each subscriber is an
+    ``asyncio`` queue fed on its own event loop. Event ids are
+    ``"<epoch>-<seq>"``: ``seq`` grows by one per event and ``epoch`` is
+    random per broker, so ids from before a restart are recognised as
+    unknown. The last ``buffer_size`` events are kept to replay what a
+    reconnecting client missed (``Last-Event-ID``).
+
+    Only subscribers of this process see the events: with several server
+    processes each one streams what it published itself.
+    """
+
+    def __init__(self, buffer_size=1000, max_pending=1000):
+        self.max_pending = max_pending
+        self.epoch = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._events = deque(maxlen=buffer_size)
+        self._subscribers = set()
+
+    @property
+    def last_event_id(self):
+        with self._lock:
+            return self._event_id(self._seq)
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event_type, data):
+        with self._lock:
+            self._seq += 1
+            event = Event(self._event_id(self._seq), self._seq, event_type, data)
+            self._events.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription._offer(event)
+        return event
+
+    def subscribe(self, last_event_id=None, predicate=None):
+        """
+        Register a subscriber on the running event loop. Returns
+        ``(subscription, backlog, resumed)``: the buffered events after
+        ``last_event_id`` that match ``predicate``, and whether the replay
+        is complete. ``resumed`` is ``False`` when the id is unknown, from
+        another epoch, or older than the buffer.
+        """
+        subscription = Subscription(self, asyncio.get_running_loop(), predicate)
+        with self._lock:
+            backlog, resumed = self._since(last_event_id)
+            self._subscribers.add(subscription)
+        if predicate is not None:
+            backlog = [event for event in backlog if predicate(event.data)]
+        return subscription, backlog, resumed
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _event_id(self, seq):
+        return f"{self.epoch}-{seq}"
+
+    def _since(self, last_event_id):
+        # Con self._lock adquirido
+        if last_event_id is None:
+            return [], True
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return [], False
+        seq = int(seq)
+        oldest = self._seq - len(self._events)
+        if not oldest <= seq <= self._seq:
+            return [], False
+        missed = self._seq - seq
+        return (list(self._events)[-missed:] if missed else []), True
+
+
+class Subscription:
+    """
+    One subscriber of a ``Broker``. ``get(timeout)`` returns the next
+    matching event, or ``None`` once the subscription is closed: by
+    ``close()`` or because it fell more than ``max_pending`` events behind
+    (``overflowed``; the client should resume with the last id it got).
+    """
+
+    def __init__(self, broker, loop, predicate):
+        self.overflowed = False
+        self._broker = broker
+        self._loop = loop
+        self._predicate = predicate
+        self._queue = asyncio.Queue()
+        self._closed = False
+
+    async def get(self, timeout=None):
+        """
+        Next event; raises ``asyncio.TimeoutError`` if none arrives in
+        ``timeout`` seconds.
+        """
+        if self._closed and self._queue.empty():
+            return None
+        item = await asyncio.wait_for(self._queue.get(), timeout)
+        return None if item is _CLOSED else item
+
+    def drain(self):
+        """
+        The events already queued, without waiting; if the subscription
+        closed meanwhile, the next ``get()`` returns ``None``.
+        """
+        events = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is _CLOSED:
+                self._queue.put_nowait(_CLOSED)
+                break
+            events.append(item)
+        return events
+
+    def close(self):
+        self._broker._unsubscribe(self)
+        self._closed = True
+
+    # -----------------------------
+    # Llamadas desde los publicadores
+    # -----------------------------
+
+    def _offer(self, event):
+        if self._predicate is not None and not self._predicate(event.data):
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # El loop del suscriptor ya se cerró
+            self._broker._unsubscribe(self)
+
+    def _put(self, event):
+        # En el loop del suscriptor
+        if self._closed:
+            return
+        if self._queue.qsize() >= self._broker.max_pending:
+            self.overflowed = True
+            self.close()
+            self._queue.put_nowait(_CLOSED)
+            return
+        self._queue.put_nowait(event)
+
+
+# -----------------------------
+# Brokers del proceso
+# -----------------------------
+_lock = threading.Lock()
+_brokers = {}
+
+
+def get_broker(name, buffer_size=1000, max_pending=1000):
+    """
+    The process broker for stream ``name``, created on first use.
+    """
+    with _lock:
+        broker = _brokers.get(name)
+        if broker is None:
+            broker = _brokers[name] = Broker(buffer_size=buffer_size, max_pending=max_pending)
+        return broker
+
+
+def reset_brokers():
+    """
+    Forget every process broker (tests); open subscriptions keep the old
+    ones.
+    """
+    with _lock:
+        _brokers.clear()
@@ -0,0 +1,118 @@
+import http.client
+import ipaddress
+import socket
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+
+HttpResponse = namedtuple("HttpResponse", ("status", "body"))
+
+# Errores de una conexión reutilizada que el servidor ya había cerrado
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class DisallowedAddress(ValueError):
+    """
+    The URL's host resolves to an address that may not be contacted.
+    """
+
+
+def resolve_public_address(host, port, allow_private=False):
+    """
+    Resolve ``host`` and return the first of its addresses, raising
+    ``DisallowedAddress`` if any of them is not a public (global unicast)
+    address: loopback, private, link-local, reserved, multicast... unless
+    ``allow_private``. ``socket.gaierror`` if it does not resolve.
+    """
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    addresses = [info[4][0] for info in infos]
+    if not allow_private:
+        for address in addresses:
+            ip = ipaddress.ip_address(address.split("%", 1)[0])
+            # IPv4 mapeada en IPv6 (::ffff:127.0.0.1): se valida la IPv4
+            ip = getattr(ip, "ipv4_mapped", None) or ip
+            if not ip.is_global or ip.is_multicast:
+                raise DisallowedAddress(f"{host!r} resolves to a non-public address")
+    return addresses[0]
+
+
+class KeepAliveClient:
+    """
+    Minimal HTTP/1.1 client that keeps one persistent connection per
+    ``(scheme, host, port)`` and reuses it across requests.
+
+    Not thread-safe: each worker thread owns its client. A request on a
+    reused connection that the server closed meanwhile is retried once on
+    a new connection; any other error closes the connection and is raised.
+
+    Each new connection resolves the host once and connects to that
+    address; unless ``allow_private``, hosts resolving to non-public
+    addresses raise ``DisallowedAddress`` (see ``resolve_public_address``).
+    """
+
+    def __init__(self, timeout=5.0, allow_private=False):
+        self.timeout = timeout
+        self.allow_private = allow_private
+        self.connections_opened = 0
+        self._connections = {}
+
+    def post(self, url, body, headers=None):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url!r}")
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        key = (parts.scheme, parts.hostname, parts.port)
+
+        reused = key in self._connections
+        try:
+            return self._request(key, path, body, headers or {})
+        except _STALE_CONNECTION_ERRORS:
+            self._discard(key)
+            if not reused:
+                raise
+        return self._request(key, path, body, headers or {})
+
+    def close(self):
+        for key in list(self._connections):
+            self._discard(key)
+
+    # -----------------------------
+    # Conexiones
+    # -----------------------------
+
+    def _request(self, key, path, body, headers):
+        connection = self._connection(key)
+        try:
+            connection.request("POST", path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except Exception:
+            self._discard(key)
+            raise
+        if response.will_close:
+            self._discard(key)
+        return HttpResponse(response.status, data)
+
+    def _connection(self, key):
+        connection = self._connections.get(key)
+        if connection is None:
+            scheme, host, port = key
+            port = port or (443 if scheme == "https" else 80)
+            address = resolve_public_address(host, port, self.allow_private)
+            factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            connection = factory(host, port, timeout=self.timeout)
+            # Conecta a la dirección ya validada, no a una nueva resolución
+            # del nombre (DNS rebinding); Host y SNI siguen siendo el nombre
+            connection._create_connection = (
+                lambda _, *args, address=address, port=port: socket.create_connection((address, port), *args)
+            )
+            self._connections[key] = connection
+            self.connections_opened += 1
+        return connection
+
+    def _discard(self, key):
+        connection = self._connections.pop(key, None)
+        if connection is not None:
+            connection.close()
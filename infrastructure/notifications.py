@@ -1,5 +1,15 @@
-from django.core.mail import send_mail
+import logging
+import queue
+import threading
+import time
+
+from django.core.mail import get_connection, send_mail
 from django.conf import settings
+from django.db import close_old_connections
+
+
+logger = logging.getLogger(__name__)
+
 
 def send_email(subject, message, recipient_list):
     """
@@ -12,3 +22,135 @@ def send_email(subject, message, recipient_list):
         recipient_list,
         fail_silently=False,
     )
+
+
+class DigestNotifier:
+    """
+    Asynchronous, batched e-mail notifications.
+
+    Producers ``notify(event)`` without blocking. A worker thread waits
+    ``window`` seconds after the first event of a digest, hands all the
+    events gathered to ``build_messages(events)`` (which returns the
+    ``EmailMessage`` list, e.g. one per recipient, and may query the
+    database) and sends them over a single SMTP connection.
+
+    Messages that fail are retried up to ``max_retries`` times, waiting
+    ``backoff * 2 ** attempt`` seconds in between, each retry on a fresh
+    connection; messages already delivered are never sent again.
+    """
+
+    def __init__(self, build_messages, window=30.0, max_retries=3, backoff=1.0, name="notifier"):
+        self.build_messages = build_messages
+        self.window = window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._queue = queue.Queue()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def notify(self, event):
+        self._queue.put(event)
+
+    def flush(self):
+        """
+        Send what is queued now, without waiting for the window, and return
+        once it has been handed to the mail server (or given up on).
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def stop(self):
+        """
+        Send what is queued and stop the thread.
+        """
+        self._stopping.set()
+        self._queue.put(None)
+        self._thread.join()
+
+    # -----------------------------
+    # Hilo de envío
+    # -----------------------------
+
+    def _run(self):
+        while True:
+            events, waiters, stopping = self._collect()
+            if events:
+                try:
+                    self._deliver(events)
+                except Exception:
+                    logger.exception("Could not build %d notifications", len(events))
+                finally:
+                    close_old_connections()
+            for waiter in waiters:
+                waiter.set()
+            if stopping:
+                return
+
+    def _collect(self):
+        """
+        Block for the first event, then gather more until ``window`` seconds
+        have passed since it arrived, a ``flush()`` or ``stop()``.
+        """
+        events, waiters = [], []
+        deadline = None
+        while True:
+            if deadline is None:
+                item = self._queue.get()
+            else:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    return events, waiters, False
+
+            if item is None:
+                return events, waiters, True
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                return events, waiters, False
+            events.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.window
+
+    def _deliver(self, events):
+        pending = list(self.build_messages(events))
+        attempt = 0
+        while pending:
+            pending = self._send(pending)
+            if not pending:
+                return
+            if attempt == self.max_retries:
+                logger.error("Dropping %d notifications after %d retries", len(pending), attempt)
+                return
+            # La espera se corta si se está parando: se reintenta ya
+            self._stopping.wait(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    def _send(self, messages):
+        """
+        Send ``messages`` over one connection. Returns those not delivered.
+        """
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception:
+            logger.warning("Mail server unavailable", exc_info=True)
+            return messages
+
+        failed = []
+        try:
+            for message in messages:
+                message.connection = connection
+                try:
+                    connection.send_messages([message])
+                except Exception:
+                    logger.warning("Could not send notification to %s", message.to, exc_info=True)
+                    failed.append(message)
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        return failed
@@ -0,0 +1,274 @@
+"""
+On-disk ingest spool.
+
+Every segment file has a single owner at a time: the writer appending to
+its ``.open`` segment, or the drainer that claimed it as ``.drain``. The
+owner holds an exclusive ``flock`` on the segment while it owns it, and the
+kernel drops the lock when the process dies, so ``recover()`` only takes
+over segments whose lock it can acquire. Several processes may share a
+directory (one writer segment each, any number of drainers).
+
+Where ``fcntl`` is not available (Windows) ownership cannot be checked:
+``recover()`` then treats ``.open`` segments idle for ``stale_after``
+seconds and every ``.drain`` segment as abandoned, so it must only run
+while no other process is draining that directory.
+"""
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# Políticas de fsync
+FSYNC_ALWAYS = "always"  # cada append llega al disco antes de confirmarse
+FSYNC_SEAL = "seal"      # sólo al cerrar el segmento; sobrevive a caídas del proceso
+FSYNC_NEVER = "never"    # lo decide el sistema operativo
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_SEAL, FSYNC_NEVER)
+
+# Cada registro: longitud + crc32 del payload JSON
+RECORD_HEADER = struct.Struct("<II")
+
+OPEN_SUFFIX = ".open"
+SEALED_SUFFIX = ".seg"
+CLAIMED_SUFFIX = ".drain"
+
+
+class Spool:
+    """
+    Append-only on-disk queue of JSON records split into segment files.
+
+    Writers append to an ``.open`` segment owned by their process; sealed
+    segments (``.seg``) are claimed by a drainer by renaming them to
+    ``.drain`` and deleted once their records have been consumed. A torn
+    record at the end of a segment (crash mid-write) is ignored. See the
+    module docstring for how segment ownership is enforced.
+    """
+
+    def __init__(self, directory, max_segment_bytes=8 * 1024 * 1024, fsync=FSYNC_ALWAYS):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync!r}")
+        self.directory = Path(directory)
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+        self._path = None
+        # Segmentos reclamados por este proceso: ruta -> archivo con el lock
+        self._claims = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    # -----------------------------
+    # Escritura
+    # -----------------------------
+
+    def append(self, payload):
+        """
+        Append one JSON-serializable record. Returns once the record is in the
+        OS page cache, or on disk with ``fsync="always"``.
+        """
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        record = RECORD_HEADER.pack(len(data), zlib.crc32(data)) + data
+
+        with self._lock:
+            if self._file is None:
+                self._open_segment()
+            self._file.write(record)
+            self._file.flush()
+            if self.fsync == FSYNC_ALWAYS:
+                os.fsync(self._file.fileno())
+            if self._file.tell() >= self.max_segment_bytes:
+                self._seal()
+
+    def seal(self):
+        """
+        Close the active segment so it can be drained.
+        """
+        with self._lock:
+            self._seal()
+
+    def _open_segment(self):
+        name = f"{time.time_ns():020d}-{os.getpid()}{OPEN_SUFFIX}"
+        self._path = self.directory / name
+        self._file = open(self._path, "ab")
+        if fcntl is not None:
+            _try_lock(self._file)
+        if self.fsync == FSYNC_ALWAYS:
+            self._sync_directory()
+
+    def _seal(self):
+        if self._file is None:
+            return
+        if self.fsync != FSYNC_NEVER:
+            os.fsync(self._file.fileno())
+        sealed = self._path.with_suffix(SEALED_SUFFIX)
+        if fcntl is None:
+            # En Windows no se puede renombrar un archivo abierto
+            self._file.close()
+            os.replace(self._path, sealed)
+        else:
+            # Se cierra (y suelta el lock) cuando ya no es .open
+            os.replace(self._path, sealed)
+            self._file.close()
+        if self.fsync != FSYNC_NEVER:
+            self._sync_directory()
+        self._file = None
+        self._path = None
+
+    def _sync_directory(self):
+        # Persiste altas y renombres de segmentos (no disponible en Windows)
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # -----------------------------
+    # Lectura
+    # -----------------------------
+
+    def recover(self, stale_after=60):
+        """
+        Make segments left behind by dead processes drainable again:
+        ``.open`` and ``.drain`` segments whose owner no longer holds their
+        lock. Without ``fcntl``, ``.open`` segments no one has written to
+        for ``stale_after`` seconds and every ``.drain`` segment.
+        """
+        now = time.time()
+        with self._lock:
+            active = self._path
+            claimed = set(self._claims)
+        for path in self.directory.iterdir():
+            if path == active or path in claimed or path.suffix not in (OPEN_SUFFIX, CLAIMED_SUFFIX):
+                continue
+            if fcntl is None:
+                if path.suffix == OPEN_SUFFIX and not self._idle_for(path, now, stale_after):
+                    continue
+                self._rename(path, SEALED_SUFFIX)
+                continue
+            try:
+                segment = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            with segment:
+                # Si el dueño sigue vivo conserva el lock
+                if _try_lock(segment):
+                    self._rename(path, SEALED_SUFFIX)
+
+    @staticmethod
+    def _idle_for(path, now, seconds):
+        try:
+            return now - path.stat().st_mtime >= seconds
+        except FileNotFoundError:
+            return False
+
+    def claim(self):
+        """
+        Sealed segments claimed by this caller, oldest first, each locked
+        until ``release()`` or ``unclaim()``. Concurrent drainers never get
+        the same segment.
+        """
+        claimed = []
+        for path in sorted(self.directory.glob(f"*{SEALED_SUFFIX}")):
+            if fcntl is None:
+                target = self._rename(path, CLAIMED_SUFFIX)
+                if target is not None:
+                    claimed.append(target)
+                continue
+            try:
+                segment = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            # El lock se toma antes de renombrar: nunca hay un .drain sin dueño
+            target = self._rename(path, CLAIMED_SUFFIX) if _try_lock(segment) else None
+            if target is None:
+                segment.close()
+                continue
+            with self._lock:
+                self._claims[target] = segment
+            claimed.append(target)
+        return claimed
+
+    @staticmethod
+    def read(path):
+        """
+        Records of a segment, stopping at the first torn or corrupt one.
+        """
+        with open(path, "rb") as segment:
+            data = segment.read()
+
+        records = []
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            length, checksum = RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            records.append(json.loads(payload))
+            offset = start + length
+        return records
+
+    def unclaim(self, path):
+        """
+        Return a claimed segment to the queue, e.g. after a failed drain.
+        """
+        path = Path(path)
+        self._rename(path, SEALED_SUFFIX)
+        self._drop_claim(path)
+
+    def release(self, path):
+        """
+        Delete a drained segment.
+        """
+        path = Path(path)
+        path.unlink(missing_ok=True)
+        self._drop_claim(path)
+
+    def _drop_claim(self, path):
+        # Después de renombrar o borrar: hasta entonces sigue teniendo dueño
+        with self._lock:
+            segment = self._claims.pop(path, None)
+        if segment is not None:
+            segment.close()
+
+    def pending(self):
+        """
+        Number of segments not yet drained, including the active one.
+        """
+        return sum(
+            1 for path in self.directory.iterdir()
+            if path.suffix in (OPEN_SUFFIX, SEALED_SUFFIX, CLAIMED_SUFFIX)
+        )
+
+    @staticmethod
+    def _rename(path, suffix):
+        target = path.with_suffix(suffix)
+        try:
+            os.replace(path, target)
+        except OSError:
+            # Ya reclamado por otro drenador (o abierto, en Windows)
+            return None
+        return target
+
+
+def _try_lock(segment):
+    """
+    Take the exclusive lock of an open segment without blocking; ``False``
+    if another owner holds it.
+    """
+    try:
+        fcntl.flock(segment.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
@@ -0,0 +1,250 @@
+import json
+import socketserver
+import threading
+from collections import namedtuple
+from email import message_from_bytes, policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# -----------------------------
+# SMTP
+# -----------------------------
+
+# Mensaje recibido: remitente y destinatarios del sobre, y el e-mail parseado
+ReceivedMessage = namedtuple("ReceivedMessage", ("sender", "recipients", "message"))
+
+
+class LocalSMTPServer:
+    """
+    Minimal in-process SMTP server for tests: accepts every message on
+    127.0.0.1 (random port) and records it in ``messages``.
+
+    ``connections`` counts the SMTP sessions opened, and ``fail_next(n)``
+    makes the next ``n`` messages get a transient 451 error, to exercise
+    connection reuse and retries. Use as a context manager or call
+    ``start()``/``stop()``; ``settings()`` returns the overrides that point
+    Django's SMTP backend at it.
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._server = _SMTPServer(("127.0.0.1", 0), _SMTPHandler)
+        self._server.owner = self
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def settings(self):
+        return {
+            "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+            "EMAIL_HOST": "127.0.0.1",
+            "EMAIL_PORT": self.port,
+            "EMAIL_HOST_USER": "",
+            "EMAIL_HOST_PASSWORD": "",
+            "EMAIL_USE_TLS": False,
+            "EMAIL_USE_SSL": False,
+        }
+
+    def fail_next(self, count=1):
+        with self._lock:
+            self._failures += count
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-smtp", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # -----------------------------
+    # Llamadas desde las sesiones
+    # -----------------------------
+
+    def _opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def _accept(self, sender, recipients, data):
+        with self._lock:
+            if self._failures:
+                self._failures -= 1
+                return False
+            self.messages.append(ReceivedMessage(
+                sender, recipients, message_from_bytes(data, policy=policy.default)
+            ))
+            return True
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    The subset of RFC 5321 that ``smtplib`` uses without TLS or AUTH.
+    """
+
+    def reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        owner = self.server.owner
+        owner._opened()
+        self.reply("220 localhost ESMTP test server")
+        sender, recipients = None, []
+
+        for raw in self.rfile:
+            command, _, argument = raw.decode("ascii", "replace").rstrip("\r\n").partition(" ")
+            command = command.upper()
+
+            if command == "EHLO":
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif command == "HELO":
+                self.reply("250 localhost")
+            elif command == "MAIL":
+                sender, recipients = _address(argument), []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                recipients.append(_address(argument))
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                if owner._accept(sender, recipients, self._read_data()):
+                    self.reply("250 OK")
+                else:
+                    self.reply("451 Temporary failure")
+                sender, recipients = None, []
+            elif command == "RSET":
+                sender, recipients = None, []
+                self.reply("250 OK")
+            elif command == "NOOP":
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+    def _read_data(self):
+        lines = []
+        for raw in self.rfile:
+            if raw in (b".\r\n", b".\n"):
+                break
+            # Dot-stuffing (RFC 5321, 4.5.2)
+            lines.append(raw[1:] if raw.startswith(b"..") else raw)
+        return b"".join(lines)
+
+
+def _address(argument):
+    # "FROM:<a@b.c> SIZE=123" -> "a@b.c"
+    _, _, value = argument.partition(":")
+    return value.strip().split(" ")[0].strip("<>")
+
+
+# -----------------------------
+# HTTP (webhooks)
+# -----------------------------
+
+# Petición recibida: ruta, cabeceras y cuerpo sin decodificar
+ReceivedRequest = namedtuple("ReceivedRequest", ("path", "headers", "body"))
+
+
+class LocalHTTPReceiver:
+    """
+    In-process HTTP/1.1 endpoint for tests: answers every POST on
+    127.0.0.1 (random port) with 200, keeping connections alive, and
+    records it in ``requests``.
+
+    ``connections`` counts the TCP connections accepted, and
+    ``fail_next(n, status)`` answers the next ``n`` requests with
+    ``status``. ``url(path)`` builds an address on the receiver.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.connections = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _HTTPHandler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self._thread = None
+
+    def url(self, path="/"):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}{path}"
+
+    def json(self):
+        """Bodies of the requests received, decoded as JSON."""
+        return [json.loads(request.body) for request in self.requests]
+
+    def fail_next(self, count=1, status=503):
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # -----------------------------
+    # Llamadas desde las conexiones
+    # -----------------------------
+
+    def _opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def _receive(self, path, headers, body):
+        with self._lock:
+            if self._failures:
+                return self._failures.pop(0)
+            self.requests.append(ReceivedRequest(path, headers, body))
+            return 200
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.owner._opened()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        status = self.server.owner._receive(self.path, dict(self.headers), body)
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
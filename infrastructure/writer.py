@@ -0,0 +1,181 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+    """
+    Single database writer thread with group commit.
+
+    Request threads ``submit(handler, payload)`` write intents and get a
+    ``Future``. The writer drains the queue every ``max_delay`` seconds or
+    ``max_rows`` rows, calls each handler once with the payloads of
+    consecutive intents that share it, and commits the whole group in one
+    transaction. Futures resolve after the commit with the handler's
+    per-payload result; waiting on them is optional (fire and forget).
+
+    If a group fails, its intents are retried one by one in their own
+    transaction so a single bad write does not fail its neighbours.
+    """
+
+    def __init__(self, max_rows=1000, max_delay=0.005, name="db-writer"):
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, handler, payload, rows=1):
+        """
+        Queue a write intent. ``handler(payloads)`` must return one result per
+        payload and is called inside the writer's transaction. ``rows`` is the
+        intent's weight towards ``max_rows``.
+        """
+        future = Future()
+        self._queue.put((handler, payload, rows, future))
+        return future
+
+    def call(self, function, *args, **kwargs):
+        """
+        Run ``function(*args, **kwargs)`` on the writer thread.
+        """
+        return self.submit(_call_each, (function, args, kwargs))
+
+    def stop(self):
+        """
+        Commit what is queued and stop the thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    # -----------------------------
+    # Hilo escritor
+    # -----------------------------
+
+    def _run(self):
+        while True:
+            intents, stopping = self._collect()
+            if intents:
+                try:
+                    self._commit(intents)
+                finally:
+                    close_old_connections()
+            if stopping:
+                return
+
+    def _collect(self):
+        """
+        Block for the first intent, then gather more until the group is full
+        or ``max_delay`` has passed since the first one arrived.
+        """
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        intents = [first]
+        rows = first[2]
+        deadline = time.monotonic() + self.max_delay
+        while rows < self.max_rows:
+            timeout = deadline - time.monotonic()
+            try:
+                intent = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if intent is None:
+                return intents, True
+            intents.append(intent)
+            rows += intent[2]
+        return intents, False
+
+    def _commit(self, intents):
+        runs = []
+        for intent in intents:
+            if runs and runs[-1][0][0] == intent[0]:
+                runs[-1].append(intent)
+            else:
+                runs.append([intent])
+
+        try:
+            with transaction.atomic():
+                outcomes = [
+                    (run, _apply(run[0][0], [intent[1] for intent in run]))
+                    for run in runs
+                ]
+        except Exception:
+            # El grupo entero se deshizo: cada intent se reintenta por separado
+            self._commit_one_by_one(intents)
+            return
+
+        for run, results in outcomes:
+            for intent, result in zip(run, results):
+                intent[3].set_result(result)
+
+    def _commit_one_by_one(self, intents):
+        for handler, payload, _, future in intents:
+            try:
+                with transaction.atomic():
+                    [result] = _apply(handler, [payload])
+            except Exception as exc:
+                logger.exception("Write intent %r failed", handler)
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+def _apply(handler, payloads):
+    results = handler(payloads)
+    if len(results) != len(payloads):
+        raise RuntimeError(f"{handler!r} returned {len(results)} results for {len(payloads)} payloads")
+    return results
+
+
+def _call_each(payloads):
+    return [function(*args, **kwargs) for function, args, kwargs in payloads]
+
+
+# -----------------------------
+# Escritor del proceso
+# -----------------------------
+_lock = threading.Lock()
+_writer = None
+
+
+def get_writer():
+    global _writer
+    with _lock:
+        if _writer is None:
+            _writer = GroupCommitWriter(
+                max_rows=settings.DB_WRITER_MAX_ROWS,
+                max_delay=settings.DB_WRITER_MAX_DELAY_MS / 1000,
+            )
+        return _writer
+
+
+def stop_writer():
+    """
+    Flush and stop the process writer; the next use starts a new one.
+    """
+    global _writer
+    with _lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop()
+
+
+def run_write(function, *args, **kwargs):
+    """
+    Run a write on the shared writer and wait for it when DB_WRITER_ENABLED,
+    otherwise run it inline in a transaction.
+    """
+    if not settings.DB_WRITER_ENABLED:
+        with transaction.atomic():
+            return function(*args, **kwargs)
+    return get_writer().call(function, *args, **kwargs).result(timeout=settings.DB_WRITER_TIMEOUT)
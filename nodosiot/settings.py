@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,6 +53,7 @@ INSTALLED_APPS = [
     'apps.alerts',
     'apps.analytics',
     'apps.exports',
+    'apps.webhooks',
     'apps.core',
 ]
 
@@ -93,9 +95,26 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Las escrituras toman el lock al empezar la transacción en vez de
+            # fallar con "database is locked" al pasar de lectura a escritura
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Pragmas de cada conexión SQLite (apps.core.signals). WAL deja que los
+# dashboards lean mientras el ingest escribe. Ajustables por entorno.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+    # 'normal' es seguro con WAL: sólo una caída del SO puede perder el último commit
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64000)),  # negativo = KiB (64 MB)
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # ms
+    'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'memory'),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -145,11 +164,94 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Tamaño de página por defecto de KeysetPagination
+API_PAGE_SIZE = 100
+
 AUTH_USER_MODEL = 'users.User'
 
+# Filas que las exportaciones leen de la base de datos y envían por bloque
+EXPORTS_CHUNK_SIZE = 2000
+
+# Export jobs en segundo plano: artefactos en disco y reutilización de un
+# export con el mismo tipo y filtros pedido hace menos de N segundos
+EXPORTS_DIR = BASE_DIR / 'artifacts' / 'exports'
+EXPORTS_REUSE_WINDOW = 10 * 60
+# True: el job se ejecuta dentro de la petición que lo crea (tests, desarrollo)
+EXPORTS_RUN_INLINE = False
+# Segundos que se conservan los reportes PDF cacheados (EXPORTS_DIR/reports)
+EXPORTS_REPORT_CACHE_MAX_AGE = 24 * 60 * 60
+
+# Máximo de lecturas aceptadas en un POST batch
+READINGS_BATCH_MAX_SIZE = 1000
+
+# Segundos que el snapshot de últimas lecturas se sirve desde la caché en proceso
+READINGS_SNAPSHOT_CACHE_TTL = 5
+
+# Segundos máximos que el registro de sensores del ingest (sensor -> nodo)
+# puede ir por detrás de cambios hechos con queryset.update()
+SENSOR_REGISTRY_TTL = 60
+
+# Spool de ingesta: las lecturas se escriben primero a disco y un drenador
+# en segundo plano las inserta en lotes grandes
+READINGS_SPOOL_ENABLED = False
+READINGS_SPOOL_DIR = BASE_DIR / 'spool' / 'readings'
+READINGS_SPOOL_FSYNC = 'always'  # 'always', 'seal' o 'never'
+READINGS_SPOOL_SEGMENT_BYTES = 8 * 1024 * 1024
+# Segundos entre drenados (0 = sólo con `manage.py drain_spool`)
+READINGS_SPOOL_DRAIN_INTERVAL = 1.0
+READINGS_SPOOL_DRAIN_BATCH = 5000
+
+# Long polling de /readings/async/latest/?wait=N (segundos)
+READINGS_LONG_POLL_MAX_WAIT = 30
+READINGS_LONG_POLL_INTERVAL = 0.5
+
+# Tail SSE de lecturas (/readings/stream/): máx. N eventos por segundo y
+# cliente (lo que llega entre medias se agrupa) y N lecturas pendientes
+READINGS_STREAM_MAX_RATE = 4
+READINGS_STREAM_MAX_PENDING = 10000
+
+# Escritor único con group commit (infrastructure.writer): las escrituras de
+# ingest y alertas se encolan y se confirman en grupo cada N ms o N filas
+DB_WRITER_ENABLED = os.environ.get('DB_WRITER_ENABLED', '0') == '1'
+DB_WRITER_MAX_ROWS = 1000
+DB_WRITER_MAX_DELAY_MS = 5
+# Segundos que una petición espera a que su escritura se confirme
+DB_WRITER_TIMEOUT = 10
+
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'no-reply@iotplatform.com'
 
+# Notificaciones de alertas nuevas (apps.alerts.notifications): se encolan y
+# un hilo envía un digest por dueño del nodo cada N segundos, reutilizando
+# una conexión SMTP y reintentando con backoff exponencial
+ALERT_NOTIFICATIONS_ENABLED = os.environ.get('ALERT_NOTIFICATIONS_ENABLED', '0') == '1'
+ALERT_NOTIFICATIONS_WINDOW = 60
+ALERT_NOTIFICATIONS_MAX_RETRIES = 3
+ALERT_NOTIFICATIONS_BACKOFF = 2
+
+# Webhooks de alertas (apps.webhooks.delivery): lotes de hasta N eventos por
+# suscripción cada N segundos, N hilos con conexiones keep-alive, reintentos
+# con backoff exponencial y dead letters tras N intentos
+WEBHOOKS_ENABLED = os.environ.get('WEBHOOKS_ENABLED', '0') == '1'
+WEBHOOKS_WORKERS = 4
+WEBHOOKS_BATCH_WINDOW = 1.0
+WEBHOOKS_BATCH_SIZE = 100
+WEBHOOKS_MAX_ATTEMPTS = 5
+WEBHOOKS_BACKOFF = 1.0
+WEBHOOKS_TIMEOUT = 5
+# Permite URLs que resuelven a direcciones privadas, loopback o link-local
+# (redes internas, tests); por defecto se rechazan al guardar y al enviar
+WEBHOOKS_ALLOW_PRIVATE_ADDRESSES = os.environ.get('WEBHOOKS_ALLOW_PRIVATE_ADDRESSES', '0') == '1'
+
+# Streams SSE (apps.core.sse, p. ej. /alerts/stream/): últimos N eventos para
+# reanudar con Last-Event-ID, máx. N pendientes por cliente, comentario de
+# keepalive cada N segundos y cierre tras N segundos (el cliente reconecta)
+EVENT_STREAM_BUFFER = 1000
+EVENT_STREAM_MAX_PENDING = 1000
+EVENT_STREAM_KEEPALIVE = 15
+EVENT_STREAM_TIMEOUT = 300
+EVENT_STREAM_RETRY_MS = 3000
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -30,6 +30,7 @@ urlpatterns = [
     path('api/v1/alerts/', include('apps.alerts.urls')),
     path('api/v1/analytics/', include('apps.analytics.urls')),
     path('api/v1/exports/', include('apps.exports.urls')),
+    path('api/v1/webhooks/', include('apps.webhooks.urls')),
 
     # Documentación OpenAPI / Swagger / Redoc
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),